@@ -0,0 +1,65 @@
+"""
+Micro-benchmark: per-item convert_amount calls vs. ForexClient.convert_many.
+
+Prices a basket of random amounts in random currencies into one target
+currency, once item by item through the dict-based API and once as a
+single array operation.
+
+Run with:
+    python -m benchmarks.forex
+"""
+
+import argparse
+import random
+import timeit
+
+from src.agents.supporter.forex.mocks import ForexClient
+
+
+def basket(size: int, currencies: list[str], seed: int = 0) -> tuple[list, list]:
+    rng = random.Random(seed)
+    amounts = [round(rng.uniform(1, 1000), 2) for _ in range(size)]
+    codes = [rng.choice(currencies) for _ in range(size)]
+    return amounts, codes
+
+
+def run(sizes: list[int], number: int, target: str) -> None:
+    client = ForexClient()
+    currencies = list(client.snapshot.currencies)
+
+    print(f"{'items':>8} {'per-item ms':>12} {'convert_many ms':>16} {'speedup':>9}")
+    for size in sizes:
+        amounts, codes = basket(size, currencies)
+
+        # Defaults bind this iteration's basket into the timed lambdas
+        per_item = timeit.timeit(
+            lambda amounts=amounts, codes=codes: sum(
+                client.convert_amount(amount, code, target)["converted_amount"]
+                for amount, code in zip(amounts, codes)
+            ),
+            number=number,
+        )
+        vectorized = timeit.timeit(
+            lambda amounts=amounts, codes=codes: client.convert_many(
+                amounts, codes, target
+            ).sum(),
+            number=number,
+        )
+
+        print(
+            f"{size:>8} {per_item / number * 1e3:>12.3f} "
+            f"{vectorized / number * 1e3:>16.3f} {per_item / vectorized:>8.1f}x"
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 100, 1000, 10000])
+    parser.add_argument("--number", type=int, default=20)
+    parser.add_argument("--target", default="EUR")
+    args = parser.parse_args()
+    run(args.sizes, args.number, args.target)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+"""
+Micro-benchmark: LocationIndex lookups as the gazetteer grows.
+
+Pads the bundled gazetteer with synthetic place names and times exact,
+misspelled and free-text lookups. Index build time grows with the
+gazetteer; per-lookup time should stay well under a millisecond.
+
+Run with:
+    python -m benchmarks.locations
+"""
+
+import argparse
+import random
+import string
+import time
+import timeit
+from functools import partial
+
+from src.agents.supporter.weather.locations import (
+    GAZETTEER_PATH,
+    LocationIndex,
+    Place,
+)
+
+QUERIES = {
+    "exact": lambda index: index.lookup("London"),
+    "alias": lambda index: index.lookup("nyc"),
+    "typo": lambda index: index.lookup("Lodnon"),
+    "message": lambda index: index.find("What's the weather in Sidney tomorrow?"),
+}
+
+
+def synthetic_gazetteer(size: int, seed: int = 0) -> list[tuple[Place, list[str]]]:
+    """The bundled places followed by random names up to `size` entries."""
+    entries = [(place, []) for place in LocationIndex.from_file(GAZETTEER_PATH).places]
+    rng = random.Random(seed)
+
+    def word() -> str:
+        return "".join(rng.choices(string.ascii_lowercase, k=rng.randint(4, 10)))
+
+    while len(entries) < size:
+        name = f"{word()} {word()}" if rng.random() < 0.3 else word()
+        entries.append((Place(name.title(), "ZZ"), []))
+    return entries
+
+
+def run(sizes: list[int], number: int) -> None:
+    header = "".join(f"{name + ' us':>12}" for name in QUERIES)
+    print(f"{'places':>8} {'build ms':>10}{header}")
+    for size in sizes:
+        entries = synthetic_gazetteer(size)
+        started = time.perf_counter()
+        index = LocationIndex(entries)
+        build = time.perf_counter() - started
+
+        seconds = [
+            timeit.timeit(partial(query, index), number=number) / number
+            for query in QUERIES.values()
+        ]
+        timings = "".join(f"{value * 1e6:>12.1f}" for value in seconds)
+        print(f"{size:>8} {build * 1e3:>10.1f}{timings}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[500, 5000, 50000])
+    parser.add_argument("--number", type=int, default=500)
+    args = parser.parse_args()
+    run(args.sizes, args.number)
+
+
+if __name__ == "__main__":
+    main()
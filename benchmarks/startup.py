@@ -0,0 +1,107 @@
+"""
+Startup benchmark: per-module import cost and cold start of the agents.
+
+Runs each scenario in a fresh interpreter with `python -X importtime`,
+reports the process wall time and the cumulative import time of the
+scenario's modules, then lists the modules with the highest self time.
+Heavy dependencies such as the openai SDK or numpy should only appear once
+an agent actually needs them.
+
+Run with:
+    python -m benchmarks.startup
+"""
+
+import argparse
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+SCENARIOS = {
+    "import Supporter": "import src.agents.supporter.orchestrator.agent",
+    "import SimpleChat": "import src.agents.chat.agent",
+    "build Supporter": (
+        "from src.agents.supporter.orchestrator.agent import Supporter\n"
+        "from src.clients.openai import OpenAIClient, OpenAIConfig\n"
+        "Supporter(OpenAIClient(OpenAIConfig(api_key='x', model='m')))"
+    ),
+    "first weather query": (
+        "from src.agents.supporter.orchestrator.agent import Supporter\n"
+        "from src.clients.openai import OpenAIClient, OpenAIConfig\n"
+        "supporter = Supporter(OpenAIClient(OpenAIConfig(api_key='x', model='m')))\n"
+        "supporter.weather_agent.get_weather('London')"
+    ),
+}
+
+
+ImportRow = tuple[str, int, int, int]
+
+
+def parse_importtime(stderr: str) -> list[ImportRow]:
+    """Parse `-X importtime` output into (module, self us, cumulative us, depth)."""
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, module = line[len("import time:") :].split("|")
+        # One space after the bar, then two more per nesting level
+        depth = (len(module) - len(module.lstrip()) - 1) // 2
+        rows.append((module.strip(), int(self_us), int(cumulative_us), depth))
+    return rows
+
+
+def run_scenario(code: str) -> tuple[float, list[ImportRow]]:
+    started = time.perf_counter()
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    wall = time.perf_counter() - started
+    return wall, parse_importtime(result.stderr)
+
+
+def run(scenarios: list[str], repeat: int, top: int) -> None:
+    print(f"{'scenario':<22} {'wall ms':>9} {'imports ms':>11} {'modules':>8}")
+    slowest = {}
+    for name in scenarios:
+        walls, totals = [], []
+        for _ in range(repeat):
+            wall, rows = run_scenario(SCENARIOS[name])
+            walls.append(wall)
+            # Top-level cumulative times already include everything nested
+            totals.append(sum(row[2] for row in rows if row[3] == 0))
+        slowest[name] = rows
+        print(
+            f"{name:<22} {statistics.median(walls) * 1e3:>9.1f} "
+            f"{statistics.median(totals) / 1e3:>11.1f} {len(rows):>8}"
+        )
+
+    for name in scenarios:
+        print(f"\nTop {top} modules by self time, {name}:")
+        for module, self_us, cumulative_us, _ in sorted(
+            slowest[name], key=lambda row: row[1], reverse=True
+        )[:top]:
+            print(
+                f"  {self_us / 1e3:>8.1f} ms  {cumulative_us / 1e3:>8.1f} ms  {module}"
+            )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument(
+        "--scenarios", nargs="+", choices=list(SCENARIOS), default=list(SCENARIOS)
+    )
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--top", type=int, default=10)
+    args = parser.parse_args()
+    run(args.scenarios, args.repeat, args.top)
+
+
+if __name__ == "__main__":
+    main()
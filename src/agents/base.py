@@ -1,8 +1,24 @@
+import functools
+import inspect
 from abc import ABC, abstractmethod
+from collections.abc import Callable, Iterator
+from typing import Any
 
 from src.domain.agent import Agent
-from src.domain.entities import ChatRequest, ChatResponse
+from src.domain.entities import ChatRequest, ChatResponse, Message
 from src.infra.logger import get_logger
+from src.infra.profiling import get_profiler
+from src.infra.tracing import (
+    current_span,
+    get_tracer,
+    new_trace_id,
+    set_span_attributes,
+    span,
+    trace_iterator,
+)
+
+# Entry points that get a span, and can be profiled, in every agent subclass
+TRACED_METHODS = ("chat", "achat", "chat_stream")
 
 
 class BaseAgent(Agent, ABC):
@@ -12,10 +28,22 @@ class BaseAgent(Agent, ABC):
 
     NAME = "base"
 
+    def __init_subclass__(cls, **kwargs: Any):
+        super().__init_subclass__(**kwargs)
+        for name in TRACED_METHODS:
+            if name in cls.__dict__:
+                method = _profile_entry_point(cls.__dict__[name])
+                setattr(cls, name, _trace_entry_point(method))
+
     def __init__(self):
         self.logger = get_logger(self.__class__.__module__)
         self.logger.info(f"Initialized {self.__class__.__name__}")
 
+    def _check_deadline(self, request: ChatRequest, stage: str) -> None:
+        """Abandon the request if its deadline passed or it was cancelled."""
+        if request.deadline:
+            request.deadline.check(f"{self.NAME} {stage}")
+
     @abstractmethod
     def chat(self, request: ChatRequest) -> ChatResponse:
         """
@@ -28,3 +56,161 @@ class BaseAgent(Agent, ABC):
             ChatResponse with the conversation including the new response
         """
         pass
+
+    @abstractmethod
+    async def achat(self, request: ChatRequest) -> ChatResponse:
+        """
+        Asynchronously process a chat request and return a response.
+
+        Args:
+            request: The chat request containing messages
+
+        Returns:
+            ChatResponse with the conversation including the new response
+        """
+
+    def chat_stream(self, request: ChatRequest) -> Iterator[Message]:
+        """
+        Stream the assistant reply as it is generated.
+
+        Each yielded message carries a text delta; concatenating the texts
+        gives the full reply. The default implementation yields the new
+        messages produced by `chat` in one go.
+
+        Args:
+            request: The chat request containing messages
+
+        Returns:
+            Iterator over assistant message chunks
+        """
+        response = self.chat(request)
+        yield from response.messages[len(request.messages) :]
+
+
+def _trace_entry_point(method: Callable) -> Callable:
+    """Wrap chat, achat or chat_stream in a span on the request's trace."""
+    suffix = method.__name__
+
+    def start(agent: BaseAgent, request: ChatRequest) -> tuple[str, dict]:
+        # Later agents and the caller see the trace this request belongs to
+        if request.trace_id is None:
+            parent = current_span()
+            request.trace_id = parent.trace_id if parent else new_trace_id()
+        attributes = {"agent": agent.NAME, "messages": len(request.messages)}
+        return f"{agent.NAME}.{suffix}", attributes
+
+    if inspect.iscoroutinefunction(method):
+
+        @functools.wraps(method)
+        async def async_wrapper(
+            self: BaseAgent, request: ChatRequest, *args: Any, **kwargs: Any
+        ) -> ChatResponse:
+            if not get_tracer().enabled:
+                return await method(self, request, *args, **kwargs)
+            name, attributes = start(self, request)
+            with span(name, request.trace_id, **attributes):
+                return await method(self, request, *args, **kwargs)
+
+        return async_wrapper
+
+    if inspect.isgeneratorfunction(method):
+
+        @functools.wraps(method)
+        def generator_wrapper(
+            self: BaseAgent, request: ChatRequest, *args: Any, **kwargs: Any
+        ) -> Iterator[Message]:
+            if not get_tracer().enabled:
+                return method(self, request, *args, **kwargs)
+            name, attributes = start(self, request)
+            return trace_iterator(
+                name,
+                method(self, request, *args, **kwargs),
+                request.trace_id,
+                **attributes,
+            )
+
+        return generator_wrapper
+
+    @functools.wraps(method)
+    def wrapper(
+        self: BaseAgent, request: ChatRequest, *args: Any, **kwargs: Any
+    ) -> ChatResponse:
+        if not get_tracer().enabled:
+            return method(self, request, *args, **kwargs)
+        name, attributes = start(self, request)
+        with span(name, request.trace_id, **attributes):
+            return method(self, request, *args, **kwargs)
+
+    return wrapper
+
+
+def _profile_entry_point(method: Callable) -> Callable:
+    """Wrap chat, achat or chat_stream in a sampling profile when one is wanted."""
+    suffix = method.__name__
+
+    def finish(session: Any) -> None:
+        path = get_profiler().finish(session)
+        if path:
+            set_span_attributes(profile=str(path))
+
+    if inspect.iscoroutinefunction(method):
+
+        @functools.wraps(method)
+        async def async_wrapper(
+            self: BaseAgent, request: ChatRequest, *args: Any, **kwargs: Any
+        ) -> ChatResponse:
+            profiler = get_profiler()
+            if not profiler.wants(request.profile):
+                return await method(self, request, *args, **kwargs)
+            session = profiler.start(f"{self.NAME}.{suffix}", request.trace_id)
+            session.resume()
+            try:
+                return await method(self, request, *args, **kwargs)
+            finally:
+                finish(session)
+
+        return async_wrapper
+
+    if inspect.isgeneratorfunction(method):
+
+        @functools.wraps(method)
+        def generator_wrapper(
+            self: BaseAgent, request: ChatRequest, *args: Any, **kwargs: Any
+        ) -> Iterator[Message]:
+            profiler = get_profiler()
+            if not profiler.wants(request.profile):
+                return (yield from method(self, request, *args, **kwargs))
+            session = profiler.start(f"{self.NAME}.{suffix}", request.trace_id)
+            iterator = method(self, request, *args, **kwargs)
+            try:
+                while True:
+                    # Only time spent producing chunks is sampled
+                    session.resume()
+                    try:
+                        message = next(iterator)
+                    except StopIteration:
+                        return
+                    finally:
+                        session.pause()
+                    yield message
+            finally:
+                iterator.close()
+                finish(session)
+
+        return generator_wrapper
+
+    @functools.wraps(method)
+    def wrapper(
+        self: BaseAgent, request: ChatRequest, *args: Any, **kwargs: Any
+    ) -> ChatResponse:
+        profiler = get_profiler()
+        if not profiler.wants(request.profile):
+            return method(self, request, *args, **kwargs)
+        session = profiler.start(f"{self.NAME}.{suffix}", request.trace_id)
+        session.resume()
+        try:
+            return method(self, request, *args, **kwargs)
+        finally:
+            finish(session)
+
+    return wrapper
@@ -0,0 +1,133 @@
+import re
+from collections.abc import Iterator
+from dataclasses import replace
+from typing import TYPE_CHECKING, ClassVar
+
+from src.agents.base import BaseAgent
+from src.agents.supporter.extraction import EntityType, get_entity_extractor
+from src.domain.entities import ChatRequest, ChatResponse, Message, Role
+
+if TYPE_CHECKING:
+    # Pulls in numpy, which callers without a semantic cache never need
+    from src.infra.cache.semantic import SemanticCache
+
+# Words that only restate a currency lookup: "USD to EUR?", "dollar euro
+# rate" and "exchange USD for EUR" all ask for the pair in the guard
+FOREX_LOOKUP_WORDS = re.compile(
+    r"\b(?:exchange|rates?|convert|conversion)\b", re.IGNORECASE
+)
+
+
+class SemanticCacheAgent(BaseAgent):
+    """
+    Wraps an agent and answers paraphrased questions from a semantic cache.
+
+    Only opening questions are cached: a follow-up depends on the dialog
+    before it. Currencies, amounts and cities found in the question must
+    match exactly, so "100 USD to EUR" never serves "200 USD to EUR".
+    """
+
+    # Reply TTLs in seconds by the agent that produced them; 0 disables caching
+    DEFAULT_AGENT_TTLS: ClassVar[dict[str, float]] = {"forex": 60.0, "weather": 600.0}
+
+    def __init__(
+        self,
+        agent: BaseAgent,
+        cache: "SemanticCache",
+        namespace: str | None = None,
+        agent_ttls: dict[str, float] | None = None,
+    ):
+        super().__init__()
+        self.agent = agent
+        self.NAME = agent.NAME
+        self.cache = cache
+        self.namespace = namespace or agent.__class__.__name__
+        self.agent_ttls = self.DEFAULT_AGENT_TTLS if agent_ttls is None else agent_ttls
+        self.extractor = get_entity_extractor()
+
+    def chat(self, request: ChatRequest) -> ChatResponse:
+        key = self._cache_key(request)
+        cached = self._lookup(key)
+        if cached:
+            return ChatResponse(messages=request.messages + [cached])
+
+        response = self.agent.chat(request)
+        self._store(key, response.messages[-1])
+        return response
+
+    async def achat(self, request: ChatRequest) -> ChatResponse:
+        key = self._cache_key(request)
+        cached = self._lookup(key)
+        if cached:
+            return ChatResponse(messages=request.messages + [cached])
+
+        response = await self.agent.achat(request)
+        self._store(key, response.messages[-1])
+        return response
+
+    def chat_stream(self, request: ChatRequest) -> Iterator[Message]:
+        key = self._cache_key(request)
+        cached = self._lookup(key)
+        if cached:
+            yield cached
+            return
+
+        chunks = []
+        for chunk in self.agent.chat_stream(request):
+            chunks.append(chunk)
+            yield chunk
+
+        if chunks:
+            self._store(
+                key,
+                Message(
+                    role=Role.ASSISTANT,
+                    text="".join(chunk.text for chunk in chunks),
+                    agent=chunks[-1].agent,
+                ),
+            )
+
+    def _cache_key(self, request: ChatRequest) -> tuple[str, tuple] | None:
+        """Return the canonical question and its exact-match guard, or None."""
+        if len(request.messages) != 1 or request.messages[0].role != Role.USER:
+            return None
+
+        text = request.messages[0].text
+        entities = self.extractor.extract(text)
+
+        # Spell entities one way so "dollars" and "USD" embed alike
+        parts = []
+        last = 0
+        for entity in entities:
+            parts.append(text[last : entity.start])
+            parts.append(str(entity.value))
+            last = entity.end
+        parts.append(text[last:])
+        question = "".join(parts)
+
+        if any(entity.type == EntityType.CURRENCY for entity in entities):
+            question = FOREX_LOOKUP_WORDS.sub(" ", question)
+
+        guard = tuple((entity.type, entity.value) for entity in entities)
+        return question, guard
+
+    def _lookup(self, key: tuple[str, tuple] | None) -> Message | None:
+        if key is None:
+            return None
+
+        cached = self.cache.get(self.namespace, key[0], guard=key[1])
+        if cached is None:
+            return None
+
+        self.logger.info(f"Serving {self.namespace} reply from semantic cache")
+        # Copy so callers never share a message instance between dialogs
+        return replace(cached)
+
+    def _store(self, key: tuple[str, tuple] | None, message: Message) -> None:
+        if key is None or message.role != Role.ASSISTANT:
+            return
+
+        ttl = self.agent_ttls.get(message.agent)
+        if ttl == 0:
+            return
+        self.cache.set(self.namespace, key[0], message, guard=key[1], ttl=ttl)
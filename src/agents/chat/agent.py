@@ -1,46 +1,123 @@
+from collections.abc import Iterator
+
 from src.agents.base import BaseAgent
-from src.clients.openai import OpenAIClient, OpenAIMessage, OpenAIRequest
+from src.agents.context import ContextBuilder, ContextWindow
+from src.clients.openai import (
+    OpenAIClient,
+    OpenAIMessage,
+    OpenAIRequest,
+    OpenAIResponse,
+)
 from src.domain.entities import ChatRequest, ChatResponse, Message, Role
 
 
 class SimpleChat(BaseAgent):
-    def __init__(self, openai_client: OpenAIClient):
+    def __init__(
+        self,
+        openai_client: OpenAIClient,
+        context_builder: ContextBuilder | None = None,
+    ):
         super().__init__()
         self.openai_client = openai_client
+        self.context_builder = context_builder or ContextBuilder(
+            max_tokens=openai_client.config.context_max_tokens
+        )
 
     def chat(self, request: ChatRequest) -> ChatResponse:
         self.logger.info(f"Received chat request with {len(request.messages)} messages")
 
+        context = self.context_builder.build(request.messages)
+        openai_request = self._build_openai_request(request, context)
+
+        # Get response from OpenAI
+        try:
+            openai_response = self.openai_client.chat_completion(openai_request)
+            self._log_openai_response(openai_response)
+            self.context_builder.record_usage(context.tokens, openai_response.usage)
+        except Exception as e:
+            self.logger.error(f"Error getting response from OpenAI: {e}")
+            raise
+
+        return self._build_chat_response(request, openai_response)
+
+    async def achat(self, request: ChatRequest) -> ChatResponse:
+        self.logger.info(
+            f"Received async chat request with {len(request.messages)} messages"
+        )
+
+        context = self.context_builder.build(request.messages)
+        openai_request = self._build_openai_request(request, context)
+
+        # Get response from OpenAI
+        try:
+            openai_response = await self.openai_client.achat_completion(openai_request)
+            self._log_openai_response(openai_response)
+            self.context_builder.record_usage(context.tokens, openai_response.usage)
+        except Exception as e:
+            self.logger.error(f"Error getting response from OpenAI: {e}")
+            raise
+
+        return self._build_chat_response(request, openai_response)
+
+    def chat_stream(self, request: ChatRequest) -> Iterator[Message]:
+        self.logger.info(
+            f"Received streaming chat request with {len(request.messages)} messages"
+        )
+
+        context = self.context_builder.build(request.messages)
+        openai_request = self._build_openai_request(request, context)
+
+        try:
+            for chunk in self.openai_client.chat_completion_stream(openai_request):
+                if chunk.content:
+                    yield Message(
+                        role=Role.ASSISTANT, text=chunk.content, agent=self.NAME
+                    )
+        except Exception as e:
+            self.logger.error(f"Error streaming response from OpenAI: {e}")
+            raise
+
+        self.logger.info("Streamed assistant response")
+
+    def _build_openai_request(
+        self, request: ChatRequest, context: ContextWindow
+    ) -> OpenAIRequest:
+        if context.dropped:
+            self.logger.info(
+                f"Dropped {context.dropped} oldest messages "
+                f"to fit {context.tokens} tokens"
+            )
+
         # Convert domain messages to OpenAI format
         openai_messages = []
-        for msg in request.messages:
+        for msg in context.messages:
             openai_messages.append(OpenAIMessage(role=msg.role, content=msg.text))
 
         # Create OpenAI request
         openai_request = OpenAIRequest(
-            model=self.openai_client.config.model,
+            model=self.openai_client.config.model_for("general"),
             messages=openai_messages,
             temperature=self.openai_client.config.temperature,
             max_tokens=self.openai_client.config.max_tokens,
+            deadline=request.deadline,
         )
 
         self.logger.info(
             f"Sending request to OpenAI with model: {openai_request.model}"
         )
+        return openai_request
 
-        # Get response from OpenAI
-        try:
-            openai_response = self.openai_client.chat_completion(openai_request)
-            self.logger.info(
-                f"Received response from OpenAI model: {openai_response.model}"
-            )
+    def _log_openai_response(self, openai_response: OpenAIResponse) -> None:
+        self.logger.info(
+            f"Received response from OpenAI model: {openai_response.model}"
+        )
 
-            if openai_response.usage:
-                self.logger.info(f"Token usage: {openai_response.usage}")
-        except Exception as e:
-            self.logger.error(f"Error getting response from OpenAI: {e}")
-            raise
+        if openai_response.usage:
+            self.logger.info(f"Token usage: {openai_response.usage}")
 
+    def _build_chat_response(
+        self, request: ChatRequest, openai_response: OpenAIResponse
+    ) -> ChatResponse:
         # Convert back to domain format
         assistant_message = Message(
             role=Role.ASSISTANT, text=openai_response.content, agent=self.NAME
@@ -0,0 +1,108 @@
+import threading
+from dataclasses import dataclass
+
+from src.domain.entities import Message, Role
+
+# Tokens the chat format adds around every message
+MESSAGE_OVERHEAD_TOKENS = 4
+
+
+def estimate_tokens(text: str) -> int:
+    """Estimate the token count of a text (~4 characters per token)."""
+    return max(1, round(len(text) / 4))
+
+
+@dataclass
+class ContextWindow:
+    messages: list[Message]
+    tokens: int
+    dropped: int
+
+
+class ContextBuilder:
+    """
+    Fits a conversation into a token budget.
+
+    System messages and the most recent turns are kept; older turns are
+    dropped first. Per-message token counts are computed once and cached on
+    the message, so each turn only pays for the new messages. Estimates are
+    calibrated against the prompt token usage reported by the API.
+    """
+
+    def __init__(self, max_tokens: int = 8000, min_recent_messages: int = 1):
+        self.max_tokens = max_tokens
+        self.min_recent_messages = min_recent_messages
+        self._lock = threading.Lock()
+
+        # Ratio of actual to estimated prompt tokens, learned from usage
+        self.calibration = 1.0
+        self.prompt_tokens = 0
+        self.completion_tokens = 0
+        self.requests = 0
+
+    def count(self, message: Message) -> int:
+        """Return the estimated token count of a message, memoized on it."""
+        if message.token_count is None:
+            message.token_count = (
+                estimate_tokens(message.text) + MESSAGE_OVERHEAD_TOKENS
+            )
+        return message.token_count
+
+    def build(self, messages: list[Message]) -> ContextWindow:
+        """
+        Select the messages to send, preserving their order.
+
+        Args:
+            messages: Full conversation history, oldest first
+
+        Returns:
+            ContextWindow with the kept messages and their estimated tokens
+        """
+        budget = self.max_tokens / self.calibration
+
+        system_messages = [m for m in messages if m.role == Role.SYSTEM]
+        used = sum(self.count(m) for m in system_messages)
+
+        kept = []
+        for message in reversed(messages):
+            if message.role == Role.SYSTEM:
+                continue
+            tokens = self.count(message)
+            # The latest turns are always sent, even if they alone exceed the budget
+            if used + tokens > budget and len(kept) >= self.min_recent_messages:
+                break
+            kept.append(message)
+            used += tokens
+
+        kept_ids = {id(m) for m in kept} | {id(m) for m in system_messages}
+        selected = [m for m in messages if id(m) in kept_ids]
+
+        return ContextWindow(
+            messages=selected,
+            tokens=round(used * self.calibration),
+            dropped=len(messages) - len(selected),
+        )
+
+    def record_usage(self, estimated_tokens: int, usage: dict) -> None:
+        """Track reported token usage and recalibrate the estimates."""
+        prompt_tokens = usage.get("prompt_tokens")
+        if not prompt_tokens:
+            return
+
+        with self._lock:
+            self.requests += 1
+            self.prompt_tokens += prompt_tokens
+            self.completion_tokens += usage.get("completion_tokens", 0)
+
+            if estimated_tokens:
+                observed = prompt_tokens / (estimated_tokens / self.calibration)
+                # Exponential moving average keeps one odd prompt from dominating
+                self.calibration = 0.8 * self.calibration + 0.2 * observed
+
+    def stats(self) -> dict:
+        return {
+            "requests": self.requests,
+            "prompt_tokens": self.prompt_tokens,
+            "completion_tokens": self.completion_tokens,
+            "calibration": self.calibration,
+        }
@@ -27,3 +27,7 @@ class DummyAgent(BaseAgent):
 
         self.logger.info("Generated dummy response")
         return ChatResponse(messages=request.messages + [response])
+
+    async def achat(self, request: ChatRequest) -> ChatResponse:
+        # Echoing is pure CPU work, so the sync implementation never blocks the loop
+        return self.chat(request)
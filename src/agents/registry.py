@@ -0,0 +1,82 @@
+import importlib
+import threading
+import time
+from collections.abc import Callable
+from typing import Any
+
+from src.agents.base import BaseAgent
+from src.infra.logger import get_logger
+
+AgentFactory = str | Callable[..., BaseAgent]
+
+
+class AgentRegistry:
+    """
+    Named agents that are only imported and built when first used.
+
+    A factory is either a callable or an import path such as
+    "src.agents.chat.agent:SimpleChat". Import paths keep the agent's
+    module, and everything it imports, out of process startup.
+    """
+
+    def __init__(self, wrap: Callable[[BaseAgent], BaseAgent] | None = None):
+        # Applied to every agent once it is built, e.g. to add a cache layer
+        self.wrap = wrap
+        self.logger = get_logger(__name__)
+        self._factories: dict[str, tuple[AgentFactory, tuple, dict]] = {}
+        self._agents: dict[str, BaseAgent] = {}
+        self._lock = threading.Lock()
+
+    def register(
+        self, name: str, factory: AgentFactory, *args: Any, **kwargs: Any
+    ) -> None:
+        """
+        Register an agent without building it.
+
+        Args:
+            name: Name the agent is looked up by
+            factory: Agent class or callable, or its "module:attribute" path
+            *args: Positional arguments for the factory
+            **kwargs: Keyword arguments for the factory
+        """
+        with self._lock:
+            self._factories[name] = (factory, args, kwargs)
+            self._agents.pop(name, None)
+
+    def get(self, name: str) -> BaseAgent:
+        """Return the named agent, building it on first use."""
+        agent = self._agents.get(name)
+        if agent is not None:
+            return agent
+
+        with self._lock:
+            if name not in self._agents:
+                if name not in self._factories:
+                    raise KeyError(f"Unknown agent: {name}")
+                self._agents[name] = self._build(name)
+            return self._agents[name]
+
+    def names(self) -> list[str]:
+        """Registered agent names, in registration order."""
+        return list(self._factories)
+
+    def is_loaded(self, name: str) -> bool:
+        return name in self._agents
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._factories
+
+    def _build(self, name: str) -> BaseAgent:
+        factory, args, kwargs = self._factories[name]
+        started = time.perf_counter()
+
+        if isinstance(factory, str):
+            module_name, _, attribute = factory.partition(":")
+            factory = getattr(importlib.import_module(module_name), attribute)
+        agent = factory(*args, **kwargs)
+        if self.wrap:
+            agent = self.wrap(agent)
+
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        self.logger.info(f"Loaded agent {name} in {elapsed_ms:.1f} ms")
+        return agent
@@ -0,0 +1,189 @@
+"""
+Shared entity extraction for the Supporter sub-agents.
+
+The vocabularies are compiled once into a phrase table. Extraction is a
+single tokenizing pass over the text with hash lookups per token window,
+so its cost depends on the text length and not on how many currencies or
+cities are known. Matching is on whole words: "rub" does not fire inside
+"rubber" and neither does "eur" inside "europe".
+"""
+
+import re
+import threading
+from collections.abc import Iterable
+from dataclasses import dataclass
+from typing import Any
+
+# Currency names and codes
+CURRENCY_ALIASES = {
+    "usd": "USD",
+    "dollar": "USD",
+    "dollars": "USD",
+    "eur": "EUR",
+    "euro": "EUR",
+    "euros": "EUR",
+    "gbp": "GBP",
+    "pound": "GBP",
+    "pounds": "GBP",
+    "jpy": "JPY",
+    "yen": "JPY",
+    "cad": "CAD",
+    "canadian": "CAD",
+    "aud": "AUD",
+    "australian": "AUD",
+    "chf": "CHF",
+    "franc": "CHF",
+    "swiss": "CHF",
+    "cny": "CNY",
+    "yuan": "CNY",
+    "chinese": "CNY",
+    "rub": "RUB",
+    "ruble": "RUB",
+    "russian": "RUB",
+    # Matched as one phrase, so "canadian dollars" isn't CAD followed by USD
+    "canadian dollar": "CAD",
+    "canadian dollars": "CAD",
+    "australian dollar": "AUD",
+    "australian dollars": "AUD",
+    "swiss franc": "CHF",
+    "swiss francs": "CHF",
+    "chinese yuan": "CNY",
+    "russian ruble": "RUB",
+    "russian rubles": "RUB",
+}
+
+# Aliases that are also plain adjectives ("Canadian teachers"), so they
+# don't make a message a currency query on their own
+NATIONALITY_WORDS = {"canadian", "australian", "swiss", "chinese", "russian"}
+
+# Simple location list - in a real implementation, you might use NLP
+KNOWN_CITIES = ["new york", "london", "tokyo", "sydney", "paris", "berlin", "moscow"]
+
+# Amounts may group thousands with commas: "1,000" and "12,500.75"
+TOKEN_PATTERN = re.compile(
+    r"(?P<amount>\d{1,3}(?:,\d{3})+(?:\.\d+)?|\d+(?:\.\d+)?)|(?P<word>[^\W\d_]+)"
+)
+
+
+class EntityType:
+    CURRENCY = "currency"
+    AMOUNT = "amount"
+    LOCATION = "location"
+
+
+@dataclass(frozen=True)
+class Entity:
+    """A typed match in the source text; `value` is normalized, `text` is verbatim."""
+
+    type: str
+    value: Any
+    text: str
+    start: int
+    end: int
+
+
+class EntityExtractor:
+    """
+    Single-pass extractor for currencies, amounts and locations.
+
+    Multi-word phrases such as "new york" are matched longest-first on
+    consecutive tokens.
+    """
+
+    def __init__(
+        self,
+        currencies: dict[str, str] | None = None,
+        locations: Iterable[str] | None = None,
+    ):
+        self._phrases: dict[str, tuple[str, Any]] = {}
+        # Longest phrase length per first word, so most tokens cost one lookup
+        self._first_words: dict[str, int] = {}
+        for alias, code in (currencies or CURRENCY_ALIASES).items():
+            self._add(alias, EntityType.CURRENCY, code)
+        for city in locations or KNOWN_CITIES:
+            self._add(city, EntityType.LOCATION, city.lower())
+
+    def extract(self, text: str) -> list[Entity]:
+        """Return every entity in the text, in order of appearance."""
+        matches = list(TOKEN_PATTERN.finditer(text))
+        words = [match.group().lower() for match in matches]
+
+        entities = []
+        i = 0
+        while i < len(matches):
+            match = matches[i]
+            if match.lastgroup == "amount":
+                entities.append(
+                    Entity(
+                        EntityType.AMOUNT,
+                        float(words[i].replace(",", "")),
+                        match.group(),
+                        match.start(),
+                        match.end(),
+                    )
+                )
+                i += 1
+                continue
+
+            max_width = self._first_words.get(words[i])
+            if max_width is None:
+                i += 1
+                continue
+
+            # Longest match first, so "new york" wins over a bare "new"
+            for width in range(min(max_width, len(matches) - i), 0, -1):
+                phrase = " ".join(words[i : i + width])
+                if phrase in self._phrases:
+                    start, end = match.start(), matches[i + width - 1].end()
+                    entity_type, value = self._phrases[phrase]
+                    entities.append(
+                        Entity(entity_type, value, text[start:end], start, end)
+                    )
+                    i += width
+                    break
+            else:
+                i += 1
+
+        return entities
+
+    def currencies(self, text: str) -> list[str]:
+        """Distinct currency codes in order of appearance."""
+        codes = []
+        for entity in self.extract(text):
+            if entity.type == EntityType.CURRENCY and entity.value not in codes:
+                codes.append(entity.value)
+        return codes
+
+    def amount(self, text: str) -> float | None:
+        """First number in the text."""
+        for entity in self.extract(text):
+            if entity.type == EntityType.AMOUNT:
+                return entity.value
+        return None
+
+    def location(self, text: str) -> str | None:
+        """First known location in the text."""
+        for entity in self.extract(text):
+            if entity.type == EntityType.LOCATION:
+                return entity.value
+        return None
+
+    def _add(self, phrase: str, entity_type: str, value: Any) -> None:
+        words = [match.group().lower() for match in TOKEN_PATTERN.finditer(phrase)]
+        self._phrases[" ".join(words)] = (entity_type, value)
+        self._first_words[words[0]] = max(
+            len(words), self._first_words.get(words[0], 0)
+        )
+
+
+_extractor: EntityExtractor | None = None
+_extractor_lock = threading.Lock()
+
+
+def get_entity_extractor() -> EntityExtractor:
+    """Return the process-wide extractor built from the default vocabularies."""
+    global _extractor
+    with _extractor_lock:
+        if _extractor is None:
+            _extractor = EntityExtractor()
+        return _extractor
@@ -1,12 +1,15 @@
-import re
 from typing import Optional
 
 from src.agents.base import BaseAgent
-from src.agents.supporter.forex.mocks import ForexClient
+from src.agents.supporter.extraction import get_entity_extractor
+from src.agents.supporter.forex.mocks import CACHE_POLICIES, ForexClient
 from src.agents.supporter.forex.prompt import SYSTEM_PROMPT
 from src.agents.supporter.forex.tools import FUNCTIONS
 from src.clients.openai import OpenAIClient
+from src.domain.deadline import Deadline
 from src.domain.entities import ChatRequest, ChatResponse, Message, Role
+from src.infra.cache.provider import CachedProvider
+from src.infra.tracing import traced
 
 
 class ForexAgent(BaseAgent):
@@ -18,7 +21,11 @@ class ForexAgent(BaseAgent):
 
     def __init__(self, openai_client: OpenAIClient):
         super().__init__()
-        self.forex_client = ForexClient()
+        client = ForexClient()
+        self.forex_client = CachedProvider(client, CACHE_POLICIES)
+        # New quotes replace cached rates, including pairs cached as unknown
+        client.on_update(self.forex_client.invalidate)
+        self.extractor = get_entity_extractor()
         self.openai_client = openai_client
         self.functions = FUNCTIONS
         self.system_prompt = SYSTEM_PROMPT
@@ -28,6 +35,8 @@ class ForexAgent(BaseAgent):
             f"Received forex request with {len(request.messages)} messages (context optimized)"
         )
 
+        self._check_deadline(request, "lookup")
+
         # Get the last user message
         last_message = request.messages[-1].text
 
@@ -49,6 +58,43 @@ class ForexAgent(BaseAgent):
         self.logger.info("Generated forex response")
         return ChatResponse(messages=request.messages + [assistant_message])
 
+    async def achat(self, request: ChatRequest) -> ChatResponse:
+        # The mock client is in-memory, so the sync path never blocks the loop
+        return self.chat(request)
+
+    @traced("forex.get_forex")
+    def get_forex(
+        self,
+        action: str,
+        from_currency: str,
+        to_currency: str,
+        amount: float | None = None,
+        deadline: Deadline | None = None,
+    ) -> Message:
+        """
+        Answer a forex query from structured parameters.
+
+        Args:
+            action: "convert" or "rate"
+            from_currency: Source currency code
+            to_currency: Target currency code
+            amount: Amount to convert, required for conversions
+            deadline: Deadline of the request this lookup serves, if any
+
+        Returns:
+            The assistant message with the formatted conversion or rate
+        """
+        if deadline:
+            deadline.check("lookup")
+
+        if action == "convert" and amount:
+            response_text = self._format_conversion(amount, from_currency, to_currency)
+        else:
+            response_text = self._format_rate(from_currency, to_currency)
+
+        self.logger.info("Generated forex response")
+        return Message(role=Role.ASSISTANT, text=response_text, agent=self.NAME)
+
     def _handle_conversion_query(self, message: str) -> str:
         """Handle currency conversion queries."""
         # Extract amount and currencies (simplified extraction)
@@ -56,12 +102,26 @@ class ForexAgent(BaseAgent):
         currencies = self._extract_currencies(message)
 
         if len(currencies) >= 2 and amount:
-            from_currency, to_currency = currencies[0], currencies[1]
-            conversion = self.forex_client.convert_amount(
-                amount, from_currency, to_currency
+            return self._format_conversion(amount, currencies[0], currencies[1])
+        else:
+            return (
+                "I couldn't understand the conversion request. Please specify an "
+                "amount and two currencies (e.g., 'convert 100 USD to EUR')."
+            )
+
+    def _format_conversion(
+        self, amount: float, from_currency: str, to_currency: str
+    ) -> str:
+        """Convert the amount and format the result."""
+        # Every amount shares the cached rate of its pair
+        rate_info = self.forex_client.get_exchange_rate(from_currency, to_currency)
+        conversion = ForexClient.apply_rate(amount, rate_info)
+        if conversion["exchange_rate"] is None:
+            return self._format_unknown_pair(
+                conversion["original_currency"], conversion["target_currency"]
             )
 
-            return f"""💱 Currency Conversion:
+        return f"""💱 Currency Conversion:
 
 💰 {conversion["original_amount"]} {conversion["original_currency"]} = {conversion["converted_amount"]} {conversion["target_currency"]}
 
@@ -70,26 +130,40 @@ class ForexAgent(BaseAgent):
 ⏰ Last Updated: {conversion["timestamp"]}
 
 This is mock data for demonstration purposes."""
-        else:
-            return "I couldn't understand the conversion request. Please specify an amount and two currencies (e.g., 'convert 100 USD to EUR')."
 
     def _handle_rate_query(self, message: str) -> str:
         """Handle exchange rate queries."""
         currencies = self._extract_currencies(message)
 
         if len(currencies) >= 2:
-            from_currency, to_currency = currencies[0], currencies[1]
-            rate_info = self.forex_client.get_exchange_rate(from_currency, to_currency)
+            return self._format_rate(currencies[0], currencies[1])
+        else:
+            return (
+                "Please specify two currencies to get the exchange rate "
+                "(e.g., 'USD to EUR rate')."
+            )
+
+    def _format_rate(self, from_currency: str, to_currency: str) -> str:
+        """Look up the exchange rate and format it."""
+        rate_info = self.forex_client.get_exchange_rate(from_currency, to_currency)
+        if rate_info["rate"] is None:
+            return self._format_unknown_pair(
+                rate_info["from_currency"], rate_info["to_currency"]
+            )
 
-            return f"""📈 Exchange Rate:
+        return f"""📈 Exchange Rate:
 
 💱 {rate_info["from_currency"]} to {rate_info["to_currency"]}: {rate_info["rate"]}
 
 ⏰ Last Updated: {rate_info["timestamp"]}
 
 This is mock data for demonstration purposes."""
-        else:
-            return "Please specify two currencies to get the exchange rate (e.g., 'USD to EUR rate')."
+
+    def _format_unknown_pair(self, from_currency: str, to_currency: str) -> str:
+        return (
+            "Sorry, I don't have an exchange rate "
+            f"from {from_currency} to {to_currency}."
+        )
 
     def _handle_general_forex_query(self, message: str) -> str:
         """Handle general forex queries."""
@@ -106,45 +180,8 @@ This is mock data for demonstration purposes."""
 
     def _extract_amount(self, message: str) -> Optional[float]:
         """Extract amount from message."""
-        numbers = re.findall(r"\d+(?:\.\d+)?", message)
-        if numbers:
-            return float(numbers[0])
-        return None
+        return self.extractor.amount(message)
 
     def _extract_currencies(self, message: str) -> list[str]:
-        """Extract currency codes from message."""
-        currency_patterns = {
-            "usd": "USD",
-            "dollar": "USD",
-            "dollars": "USD",
-            "eur": "EUR",
-            "euro": "EUR",
-            "euros": "EUR",
-            "gbp": "GBP",
-            "pound": "GBP",
-            "pounds": "GBP",
-            "jpy": "JPY",
-            "yen": "JPY",
-            "cad": "CAD",
-            "canadian": "CAD",
-            "aud": "AUD",
-            "australian": "AUD",
-            "chf": "CHF",
-            "franc": "CHF",
-            "swiss": "CHF",
-            "cny": "CNY",
-            "yuan": "CNY",
-            "chinese": "CNY",
-            "rub": "RUB",
-            "ruble": "RUB",
-            "russian": "RUB",
-        }
-
-        message_lower = message.lower()
-        currencies = []
-
-        for pattern, code in currency_patterns.items():
-            if pattern in message_lower and code not in currencies:
-                currencies.append(code)
-
-        return currencies
+        """Extract currency codes from message, in order of appearance."""
+        return self.extractor.currencies(message)
@@ -1,5 +1,103 @@
+from collections.abc import Callable, Sequence
+from dataclasses import dataclass
 from datetime import datetime
-from typing import Any, Dict
+from typing import Any
+
+import numpy as np
+from numpy.typing import ArrayLike
+
+from src.infra.cache.provider import CachePolicy
+
+
+@dataclass(frozen=True)
+class RateSnapshot:
+    """
+    Immutable N x N exchange rate matrix.
+
+    `matrix[i, j]` converts one unit of `currencies[i]` into
+    `currencies[j]`; pairs without a quote are NaN.
+    """
+
+    currencies: tuple[str, ...]
+    index: dict[str, int]
+    matrix: np.ndarray
+    timestamp: str
+
+    @classmethod
+    def build(
+        cls,
+        quotes: dict[str, dict[str, float]],
+        timestamp: str,
+        pivots: Sequence[str] = (),
+    ) -> "RateSnapshot":
+        """
+        Build a full matrix from direct quotes.
+
+        Quoted rates are used as given. A missing pair is filled from the
+        inverse quote if there is one, and otherwise triangulated through
+        the first pivot currency with both legs known.
+        """
+        currencies = sorted(
+            set(quotes) | {code for rates in quotes.values() for code in rates}
+        )
+        index = {code: i for i, code in enumerate(currencies)}
+
+        matrix = np.full((len(currencies), len(currencies)), np.nan)
+        for from_curr, rates in quotes.items():
+            for to_curr, rate in rates.items():
+                matrix[index[from_curr], index[to_curr]] = rate
+        np.fill_diagonal(matrix, 1.0)
+
+        inverse = 1.0 / matrix.T
+        matrix = np.where(np.isnan(matrix), inverse, matrix)
+
+        for pivot in pivots:
+            if pivot not in index:
+                continue
+            p = index[pivot]
+            via_pivot = np.outer(matrix[:, p], matrix[p, :])
+            matrix = np.where(np.isnan(matrix), via_pivot, matrix)
+
+        matrix.setflags(write=False)
+        return cls(tuple(currencies), index, matrix, timestamp)
+
+    def rate(self, from_currency: str, to_currency: str) -> float | None:
+        i = self.index.get(from_currency)
+        j = self.index.get(to_currency)
+        if i is None or j is None or np.isnan(self.matrix[i, j]):
+            return None
+        return float(self.matrix[i, j])
+
+    def pairs(self, currency: str) -> list[str]:
+        """Currencies that `currency` can be converted into."""
+        i = self.index.get(currency)
+        if i is None:
+            return []
+        return [
+            code
+            for code, rate in zip(self.currencies, self.matrix[i])
+            if code != currency and not np.isnan(rate)
+        ]
+
+    def indices(self, currencies: str | Sequence[str]) -> np.ndarray | int:
+        """Matrix indices for one code or an array of codes."""
+        if isinstance(currencies, str):
+            codes = np.array([currencies])
+        else:
+            codes = np.asarray(currencies, dtype=str)
+
+        # Look up each distinct code once, then broadcast back
+        unique, inverse = np.unique(codes, return_inverse=True)
+        unique = [code.upper() for code in unique]
+        unknown = sorted({code for code in unique if code not in self.index})
+        if unknown:
+            raise ValueError(f"Unknown currencies: {', '.join(unknown)}")
+        positions = np.array([self.index[code] for code in unique], dtype=np.intp)
+        positions = positions[inverse]
+
+        if isinstance(currencies, str):
+            return int(positions[0])
+        return positions.reshape(codes.shape)
 
 
 class ForexClient:
@@ -63,29 +161,57 @@ class ForexClient:
             "RUB": "Russian Ruble",
         }
 
-    def get_exchange_rate(self, from_currency: str, to_currency: str) -> Dict[str, Any]:
-        """Get exchange rate between two currencies."""
+        # Missing pairs are priced through these currencies, in order
+        self.pivots = ("USD", "EUR")
+        # Called after each rate update, e.g. to drop cached rates
+        self._update_listeners: list[Callable[[], None]] = []
+        self.update_rates(self.mock_rates)
+
+    def update_rates(
+        self, quotes: dict[str, dict[str, float]], timestamp: str | None = None
+    ) -> None:
+        """
+        Replace the quoted rates with a new set.
+
+        The rate matrix is rebuilt off to the side and swapped in with one
+        assignment, so concurrent lookups see either the old or the new
+        rates, never a mix of both. Listeners added with `on_update` run
+        after the swap.
+
+        Args:
+            quotes: Direct quotes as {from_currency: {to_currency: rate}}
+            timestamp: When the quotes were taken, defaults to now
+        """
+        snapshot = RateSnapshot.build(
+            quotes, timestamp or datetime.now().isoformat(), self.pivots
+        )
+        self.mock_rates = quotes
+        self._snapshot = snapshot
+        for listener in self._update_listeners:
+            listener()
+
+    def on_update(self, listener: Callable[[], None]) -> None:
+        """Call `listener` after every rate update."""
+        self._update_listeners.append(listener)
+
+    @property
+    def snapshot(self) -> "RateSnapshot":
+        return self._snapshot
+
+    def get_exchange_rate(self, from_currency: str, to_currency: str) -> dict[str, Any]:
+        """Get exchange rate between two currencies; rate is None if unknown."""
         from_curr = from_currency.upper()
         to_curr = to_currency.upper()
-
-        # Check if we have direct rate
-        if from_curr in self.mock_rates and to_curr in self.mock_rates[from_curr]:
-            rate = self.mock_rates[from_curr][to_curr]
-        elif to_curr in self.mock_rates and from_curr in self.mock_rates[to_curr]:
-            # Calculate inverse rate
-            rate = 1 / self.mock_rates[to_curr][from_curr]
-        else:
-            # Default rate for unknown pairs
-            rate = 1.0
+        snapshot = self._snapshot
 
         return {
             "from_currency": from_curr,
             "to_currency": to_curr,
-            "rate": rate,
-            "timestamp": datetime.now().isoformat(),
+            "rate": snapshot.rate(from_curr, to_curr),
+            "timestamp": snapshot.timestamp,
         }
 
-    def get_currency_info(self, currency: str) -> Dict[str, Any]:
+    def get_currency_info(self, currency: str) -> dict[str, Any]:
         """Get information about a currency."""
         currency_upper = currency.upper()
 
@@ -93,7 +219,7 @@ class ForexClient:
             return {
                 "code": currency_upper,
                 "name": self.currency_names[currency_upper],
-                "available_pairs": list(self.mock_rates.get(currency_upper, {}).keys()),
+                "available_pairs": self._snapshot.pairs(currency_upper),
             }
 
         return {
@@ -104,16 +230,66 @@ class ForexClient:
 
     def convert_amount(
         self, amount: float, from_currency: str, to_currency: str
-    ) -> Dict[str, Any]:
+    ) -> dict[str, Any]:
         """Convert an amount from one currency to another."""
-        rate_info = self.get_exchange_rate(from_currency, to_currency)
-        converted_amount = amount * rate_info["rate"]
+        return self.apply_rate(
+            amount, self.get_exchange_rate(from_currency, to_currency)
+        )
+
+    @staticmethod
+    def apply_rate(amount: float, rate_info: dict[str, Any]) -> dict[str, Any]:
+        """Convert an amount with a rate from `get_exchange_rate`."""
+        rate = rate_info["rate"]
 
         return {
             "original_amount": amount,
-            "original_currency": from_currency.upper(),
-            "converted_amount": round(converted_amount, 2),
-            "target_currency": to_currency.upper(),
-            "exchange_rate": rate_info["rate"],
+            "original_currency": rate_info["from_currency"],
+            "converted_amount": None if rate is None else round(amount * rate, 2),
+            "target_currency": rate_info["to_currency"],
+            "exchange_rate": rate,
             "timestamp": rate_info["timestamp"],
         }
+
+    def convert_many(
+        self,
+        amounts: ArrayLike,
+        from_currencies: str | Sequence[str],
+        to_currencies: str | Sequence[str],
+    ) -> np.ndarray:
+        """
+        Convert many amounts in one array operation.
+
+        Currencies are either a single code applied to every amount or one
+        code per amount, e.g. a basket priced in several currencies
+        converted to EUR. All amounts use the same rate snapshot.
+
+        Args:
+            amounts: Amounts to convert
+            from_currencies: Source currency code(s)
+            to_currencies: Target currency code(s)
+
+        Returns:
+            Unrounded converted amounts; NaN where no rate is known
+
+        Raises:
+            ValueError: If a currency code is not in the rate table
+        """
+        snapshot = self._snapshot
+        amounts = np.asarray(amounts, dtype=np.float64)
+        rows = snapshot.indices(from_currencies)
+        columns = snapshot.indices(to_currencies)
+        return amounts * snapshot.matrix[rows, columns]
+
+
+# Rates move constantly, so they are only briefly reused; unknown pairs
+# are stable and can be remembered for longer. Conversions are not cached
+# per amount: they apply the cached rate of their pair (see `apply_rate`).
+CACHE_POLICIES = {
+    "get_exchange_rate": CachePolicy(
+        ttl=30,
+        stale_ttl=30,
+        negative_ttl=300,
+        is_negative=lambda rate_info: rate_info["rate"] is None,
+    ),
+    "get_currency_info": CachePolicy(ttl=3600),
+}
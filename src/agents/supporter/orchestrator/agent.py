@@ -1,13 +1,35 @@
-import json
-from typing import Any, Dict
+import asyncio
+from collections.abc import Iterator
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING, Any
 
 from src.agents.base import BaseAgent
-from src.agents.supporter.forex.agent import ForexAgent
-from src.agents.supporter.orchestrator.prompt import SYSTEM_PROMPT
-from src.agents.supporter.orchestrator.tools import FUNCTIONS
-from src.agents.supporter.weather.agent import WeatherAgent
-from src.clients.openai import OpenAIClient, OpenAIMessage, OpenAIRequest
+from src.agents.context import ContextBuilder, ContextWindow
+from src.agents.registry import AgentRegistry
+from src.agents.supporter.orchestrator.arguments import (
+    ArgumentParseError,
+    ArgumentParser,
+)
+from src.agents.supporter.orchestrator.cascade import RoutingCascade
+from src.agents.supporter.orchestrator.prompt import (
+    GENERAL_SYSTEM_PROMPT,
+    SYSTEM_PROMPT,
+)
+from src.agents.supporter.orchestrator.router import IntentRouter
+from src.agents.supporter.orchestrator.speculation import Speculation, Speculator
+from src.agents.supporter.orchestrator.tools import FUNCTIONS, TOOLS
+from src.clients.openai import (
+    OpenAIClient,
+    OpenAIMessage,
+    OpenAIRequest,
+    OpenAIResponse,
+)
 from src.domain.entities import ChatRequest, ChatResponse, Message, Role
+from src.infra.tracing import bind_context, span, traced
+
+if TYPE_CHECKING:
+    from src.agents.supporter.forex.agent import ForexAgent
+    from src.agents.supporter.weather.agent import WeatherAgent
 
 
 class Supporter(BaseAgent):
@@ -16,15 +38,56 @@ class Supporter(BaseAgent):
     """
 
     NAME = "supporter"
-
-    def __init__(self, openai_client: OpenAIClient):
+    # Upper bound on sub-agent calls running at once for one compound query
+    MAX_PARALLEL_TOOLS = 4
+
+    def __init__(
+        self,
+        openai_client: OpenAIClient,
+        context_builder: ContextBuilder | None = None,
+        router: IntentRouter | None = None,
+        speculative: bool = False,
+    ):
         super().__init__()
         self.openai_client = openai_client
-        self.weather_agent = WeatherAgent(openai_client)
-        self.forex_agent = ForexAgent(openai_client)
+        # Sub-agents and their data clients are built on their first query
+        self.sub_agents = AgentRegistry()
+        self.sub_agents.register(
+            "weather", "src.agents.supporter.weather.agent:WeatherAgent", openai_client
+        )
+        self.sub_agents.register(
+            "forex", "src.agents.supporter.forex.agent:ForexAgent", openai_client
+        )
+        self.context_builder = context_builder or ContextBuilder(
+            max_tokens=openai_client.config.context_max_tokens
+        )
+        self.router = router or IntentRouter()
+        self.argument_parser = ArgumentParser(FUNCTIONS)
+        # Only used when config.routing_cascade is on
+        self.cascade = RoutingCascade(self.argument_parser, self.router)
+        # Run the router's guess while the routing call is in flight
+        self.speculative = speculative
+        self.speculator = Speculator()
 
         self.functions = FUNCTIONS
+        self.tools = TOOLS
+        self.tool_executor = ThreadPoolExecutor(
+            max_workers=self.MAX_PARALLEL_TOOLS, thread_name_prefix="supporter-tools"
+        )
         self.system_prompt = SYSTEM_PROMPT
+        # Kept as messages so their token counts are only computed once
+        self.routing_system_message = Message(role=Role.SYSTEM, text=SYSTEM_PROMPT)
+        self.general_system_message = Message(
+            role=Role.SYSTEM, text=GENERAL_SYSTEM_PROMPT
+        )
+
+    @property
+    def weather_agent(self) -> "WeatherAgent":
+        return self.sub_agents.get("weather")
+
+    @property
+    def forex_agent(self) -> "ForexAgent":
+        return self.sub_agents.get("forex")
 
     def chat(self, request: ChatRequest) -> ChatResponse:
         self.logger.info(
@@ -34,185 +97,543 @@ class Supporter(BaseAgent):
         # Use function calling to determine the appropriate action
         return self._process_with_function_calling(request)
 
+    async def achat(self, request: ChatRequest) -> ChatResponse:
+        self.logger.info(
+            f"Received async supporter request with {len(request.messages)} messages"
+        )
+
+        return await self._aprocess_with_function_calling(request)
+
+    def chat_stream(self, request: ChatRequest) -> Iterator[Message]:
+        self.logger.info(
+            "Received streaming supporter request with "
+            f"{len(request.messages)} messages"
+        )
+
+        function_call = self._route_locally(request)
+        if function_call:
+            yield from self._stream_function_call(function_call, request)
+            return
+
+        if self._routes_separately():
+            yield from self._stream_routed_answer(request)
+            return
+
+        openai_request = self._build_routing_request(request)
+
+        try:
+            for chunk in self.openai_client.chat_completion_stream(openai_request):
+                if chunk.content:
+                    # General answers stream straight from the routing call
+                    yield Message(
+                        role=Role.ASSISTANT, text=chunk.content, agent=self.NAME
+                    )
+
+                tool_calls = self._resolve_tool_calls(chunk.tool_calls, request)
+                if tool_calls:
+                    yield from self._stream_tool_calls(tool_calls, request)
+        except Exception as e:
+            self.logger.error(f"Error streaming response from OpenAI: {e}")
+            raise
+
     def _process_with_function_calling(self, request: ChatRequest) -> ChatResponse:
         """Process the request using OpenAI function calling for intelligent routing."""
+        function_call = self._route_locally(request)
+        if function_call:
+            return self._handle_function_call(function_call, request)
 
-        # Convert domain messages to OpenAI format
-        openai_messages = []
+        speculation = self._start_speculation(request)
 
-        # Add system message
-        openai_messages.append(
-            OpenAIMessage(role=Role.SYSTEM, content=self.system_prompt)
+        # Get response from OpenAI with function calling
+        try:
+            openai_response, model = self._route_with_llm(request)
+
+            tool_calls = self._resolve_tool_calls(openai_response.tool_calls, request)
+            reply = self._commit_speculation(speculation, tool_calls)
+            if reply is not None:
+                return ChatResponse(messages=request.messages + [reply])
+            if tool_calls:
+                return self._handle_tool_calls(tool_calls, request)
+
+            if not self._answers_in_routing(model):
+                return self._process_general_question(request)
+            return self._build_assistant_response(request, openai_response.content)
+
+        except Exception as e:
+            self.logger.error(f"Error getting response from OpenAI: {e}")
+            if speculation:
+                speculation.future.cancel()
+            raise
+
+    async def _aprocess_with_function_calling(
+        self, request: ChatRequest
+    ) -> ChatResponse:
+        """Async variant of `_process_with_function_calling`."""
+        function_call = self._route_locally(request)
+        if function_call:
+            return await self._ahandle_function_call(function_call, request)
+
+        speculation = self._astart_speculation(request)
+
+        try:
+            openai_response, model = await self._aroute_with_llm(request)
+
+            tool_calls = self._resolve_tool_calls(openai_response.tool_calls, request)
+            reply = await self._acommit_speculation(speculation, tool_calls)
+            if reply is not None:
+                return ChatResponse(messages=request.messages + [reply])
+            if tool_calls:
+                return await self._ahandle_tool_calls(tool_calls, request)
+
+            if not self._answers_in_routing(model):
+                return await self._aprocess_general_question(request)
+            return self._build_assistant_response(request, openai_response.content)
+
+        except Exception as e:
+            self.logger.error(f"Error getting response from OpenAI: {e}")
+            if speculation:
+                speculation.future.cancel()
+            raise
+
+    def _route_locally(self, request: ChatRequest) -> dict[str, Any] | None:
+        """Return the function call for an unambiguous tool query, skipping the LLM."""
+        user_messages = [msg for msg in request.messages if msg.role == Role.USER]
+        if not user_messages:
+            return None
+
+        with span("supporter.route_locally") as route_span:
+            decision = self.router.route(user_messages[-1].text)
+            route_span.set_attribute("fast_path", decision is not None)
+        if decision is None:
+            return None
+
+        self.logger.info(
+            f"Fast path: {decision.function_call['name']} without a routing call"
+        )
+        return decision.function_call
+
+    def _predict_call(self, request: ChatRequest) -> tuple[str, dict[str, Any]] | None:
+        """Return the router's guess at the tool call, if it is worth speculating on."""
+        if not self.speculative:
+            return None
+        user_messages = [msg for msg in request.messages if msg.role == Role.USER]
+        if not user_messages:
+            return None
+
+        decision = self.router.score(user_messages[-1].text)
+        if not self.speculator.should_start(decision):
+            return None
+        function_name = decision.function_call["name"]
+        parsed = self.argument_parser.peek(
+            function_name, decision.function_call["arguments"]
         )
+        if parsed is None:
+            return None
 
-        # Add user messages
-        for msg in request.messages:
-            if msg.role == Role.USER:
-                openai_messages.append(OpenAIMessage(role=msg.role, content=msg.text))
+        self.speculator.record("started")
+        self.logger.info(
+            f"Speculatively calling {function_name} "
+            f"(confidence {decision.confidence:.2f}, {decision.reason})"
+        )
+        return function_name, parsed.arguments
+
+    def _start_speculation(self, request: ChatRequest) -> Speculation | None:
+        """Start the predicted tool call on the tool pool, if there is one."""
+        predicted = self._predict_call(request)
+        if predicted is None:
+            return None
+        function_name, parameters = predicted
+        future = self.tool_executor.submit(
+            bind_context(self._call_tool), function_name, parameters, request
+        )
+        return Speculation(function_name, parameters, future)
+
+    def _astart_speculation(self, request: ChatRequest) -> Speculation | None:
+        """Async variant of `_start_speculation`, running as a task on the loop."""
+        predicted = self._predict_call(request)
+        if predicted is None:
+            return None
+        function_name, parameters = predicted
+        task = asyncio.ensure_future(
+            self._acall_tool(function_name, parameters, request)
+        )
+        return Speculation(function_name, parameters, task)
+
+    def _commit_speculation(
+        self, speculation: Speculation | None, tool_calls: list[dict[str, Any]]
+    ) -> Message | None:
+        """Return the speculative reply if routing asked for the same call."""
+        if not self._keep_speculation(speculation, tool_calls):
+            return None
+        try:
+            reply = speculation.future.result()
+        except Exception as e:
+            # Run the call again the regular way, so it fails or succeeds as usual
+            self.logger.warning(
+                f"Speculative {speculation.function_name} failed: {e}", exc_info=True
+            )
+            self.speculator.record("failed")
+            return None
+
+        self.speculator.record("hit")
+        return reply
+
+    async def _acommit_speculation(
+        self, speculation: Speculation | None, tool_calls: list[dict[str, Any]]
+    ) -> Message | None:
+        """Async variant of `_commit_speculation`."""
+        if not self._keep_speculation(speculation, tool_calls):
+            return None
+        try:
+            reply = await speculation.future
+        except Exception as e:
+            self.logger.warning(
+                f"Speculative {speculation.function_name} failed: {e}", exc_info=True
+            )
+            self.speculator.record("failed")
+            return None
+
+        self.speculator.record("hit")
+        return reply
+
+    def _keep_speculation(
+        self, speculation: Speculation | None, tool_calls: list[dict[str, Any]]
+    ) -> bool:
+        """Check a speculation against the routing answer, cancelling it on a miss."""
+        if speculation is None:
+            return False
+
+        routed_calls = []
+        for tool_call in tool_calls:
+            parsed = self.argument_parser.peek(
+                tool_call["name"], tool_call["arguments"]
+            )
+            if parsed is None:
+                routed_calls = []
+                break
+            routed_calls.append((tool_call["name"], parsed.arguments))
+        # Several weather calls compare as the one batched call they become
+        routed_calls = self._batch_weather_calls(routed_calls)
+
+        predicted = self._call_signature(
+            speculation.function_name, speculation.parameters
+        )
+        if [self._call_signature(*call) for call in routed_calls] == [predicted]:
+            return True
+
+        speculation.future.cancel()
+        self.speculator.record("miss")
+        return False
+
+    def _call_signature(self, function_name: str, parameters: dict[str, Any]) -> tuple:
+        """The arguments a tool call is answered from, with the handlers' defaults."""
+        if function_name == "get_weather":
+            locations = parameters.get("locations") or [
+                parameters.get("location", "new york")
+            ]
+            return (
+                function_name,
+                tuple(str(location).strip().lower() for location in locations),
+                parameters.get("query_type", "current"),
+            )
+
+        amount = parameters.get("amount")
+        return (
+            function_name,
+            parameters.get("action", "rate"),
+            str(parameters.get("from_currency", "USD")).upper(),
+            str(parameters.get("to_currency", "EUR")).upper(),
+            float(amount) if amount is not None else None,
+        )
+
+    @traced("supporter.route")
+    def _route_with_llm(self, request: ChatRequest) -> tuple[OpenAIResponse, str]:
+        """Route with the routing model, escalating failed answers to the main model."""
+        openai_request = self._build_routing_request(request)
+        openai_response = self.openai_client.chat_completion(openai_request)
+
+        escalated_request = self._build_escalated_request(
+            request, openai_request, openai_response
+        )
+        if escalated_request is None:
+            return openai_response, openai_request.model
+        return (
+            self.openai_client.chat_completion(escalated_request),
+            escalated_request.model,
+        )
+
+    @traced("supporter.route")
+    async def _aroute_with_llm(
+        self, request: ChatRequest
+    ) -> tuple[OpenAIResponse, str]:
+        """Async variant of `_route_with_llm`."""
+        openai_request = self._build_routing_request(request)
+        openai_response = await self.openai_client.achat_completion(openai_request)
+
+        escalated_request = self._build_escalated_request(
+            request, openai_request, openai_response
+        )
+        if escalated_request is None:
+            return openai_response, openai_request.model
+        return (
+            await self.openai_client.achat_completion(escalated_request),
+            escalated_request.model,
+        )
 
-        # Create OpenAI request with function calling
+    def _stream_routed_answer(self, request: ChatRequest) -> Iterator[Message]:
+        """Streaming path for split or cascaded routing, which isn't streamed."""
+        openai_response, model = self._route_with_llm(request)
+
+        tool_calls = self._resolve_tool_calls(openai_response.tool_calls, request)
+        if tool_calls:
+            yield from self._stream_tool_calls(tool_calls, request)
+        elif not self._answers_in_routing(model):
+            yield from self._stream_general_question(request)
+        else:
+            yield Message(
+                role=Role.ASSISTANT, text=openai_response.content, agent=self.NAME
+            )
+
+    def _build_escalated_request(
+        self,
+        request: ChatRequest,
+        openai_request: OpenAIRequest,
+        openai_response: OpenAIResponse,
+    ) -> OpenAIRequest | None:
+        """Return a routing request for the main model if the answer fails checks."""
+        config = self.openai_client.config
+        if not config.routing_cascade or openai_request.model == config.model:
+            return None
+
+        last_user_message = request.messages[-1].text if request.messages else ""
+        reason = self.cascade.check(
+            last_user_message, openai_response.tool_calls, openai_response.content
+        )
+        if reason is None:
+            return None
+        return self._build_routing_request(request, model=config.model)
+
+    def _routes_separately(self) -> bool:
+        """Whether routing is a separate step from writing a general answer."""
+        config = self.openai_client.config
+        return config.routing_cascade or not self._answers_in_routing(
+            config.model_for("routing")
+        )
+
+    def _answers_in_routing(self, model: str) -> bool:
+        """Whether a prose routing answer from `model` can be shown as is."""
+        return model == self.openai_client.config.model_for("general")
+
+    def _build_routing_request(
+        self, request: ChatRequest, model: str | None = None
+    ) -> OpenAIRequest:
+        """Build the function calling request used to route the user query."""
+        context = self._build_user_context(request, self.routing_system_message)
+
+        # Convert domain messages to OpenAI format
+        openai_messages = [
+            OpenAIMessage(role=msg.role, content=msg.text) for msg in context.messages
+        ]
+
+        model = model or self.openai_client.config.model_for("routing")
+        # A routing call that only picks tools runs at temperature 0, which
+        # also makes it cacheable. One whose prose answer may be shown to the
+        # user is sampled like any general answer and isn't cached.
+        temperature = (
+            self.openai_client.config.temperature
+            if self._answers_in_routing(model)
+            else 0.0
+        )
+
+        # Create OpenAI request with parallel tool calling
         openai_request = OpenAIRequest(
-            model=self.openai_client.config.model,
+            model=model,
             messages=openai_messages,
-            temperature=self.openai_client.config.temperature,
+            temperature=temperature,
             max_tokens=self.openai_client.config.max_tokens,
-            functions=self.functions,
-            function_call="auto",  # Let OpenAI decide when to call functions
+            deadline=request.deadline,
+            tools=self.tools,
+            tool_choice="auto",  # Let OpenAI decide when to call tools
+            parallel_tool_calls=True,  # Compound questions get all tools at once
         )
 
         self.logger.info(
             f"Sending request to OpenAI with function calling, model: {openai_request.model}"
         )
+        return openai_request
+
+    def _resolve_tool_calls(
+        self, tool_calls: list[dict[str, Any]] | None, request: ChatRequest
+    ) -> list[dict[str, Any]]:
+        """Return the tool calls to execute, or an empty list for a regular response."""
+        # Check if OpenAI wants to call any tools
+        if not tool_calls:
+            return []
+
+        last_user_message = (
+            request.messages[-1].text if request.messages else "No message"
+        )
+        function_names = [tool_call["name"] for tool_call in tool_calls]
+
+        # Fallback check: if it's clearly a forex query but OpenAI called
+        # weather, force forex.
+        # Compound queries legitimately mix both, so only single calls are corrected.
+        if function_names == ["get_weather"] and self.router.is_forex_query(
+            last_user_message
+        ):
+            self.logger.warning(
+                "OpenAI incorrectly called get_weather for forex query: "
+                f"'{last_user_message}', forcing get_forex"
+            )
+            # Create a manual forex function call
+            forex_params = self.router.extract_forex_params(last_user_message)
+            if forex_params:
+                return [{"name": "get_forex", "arguments": forex_params}]
 
-        # Get response from OpenAI with function calling
-        try:
-            openai_response = self.openai_client.chat_completion(openai_request)
+        self.logger.info(
+            f"OpenAI requested tool calls: {function_names} "
+            f"for user query: '{last_user_message}'"
+        )
+        return tool_calls
 
-            # Check if OpenAI wants to call a function
-            if openai_response.function_call:
-                last_user_message = (
-                    request.messages[-1].text if request.messages else "No message"
-                )
-                function_name = openai_response.function_call["name"]
-
-                # Fallback check: if it's clearly a forex query but OpenAI called weather, force forex
-                if function_name == "get_weather" and self._is_clearly_forex_query(
-                    last_user_message
-                ):
-                    self.logger.warning(
-                        f"OpenAI incorrectly called get_weather for forex query: '{last_user_message}', forcing get_forex"
-                    )
-                    # Create a manual forex function call
-                    forex_params = self._extract_forex_params_from_text(
-                        last_user_message
-                    )
-                    if forex_params:
-                        manual_function_call = {
-                            "name": "get_forex",
-                            "arguments": forex_params,
-                        }
-                        return self._handle_function_call(manual_function_call, request)
-
-                self.logger.info(
-                    f"OpenAI requested function call: {function_name} for user query: '{last_user_message}'"
-                )
-                return self._handle_function_call(
-                    openai_response.function_call, request
-                )
-            else:
-                # Regular response
-                assistant_message = Message(
-                    role=Role.ASSISTANT, text=openai_response.content, agent=self.NAME
-                )
-                self.logger.info("Generated assistant response")
-                return ChatResponse(messages=request.messages + [assistant_message])
+    def _handle_tool_calls(
+        self, tool_calls: list[dict[str, Any]], request: ChatRequest
+    ) -> ChatResponse:
+        """Run the requested tools concurrently and merge their replies."""
+        if len(tool_calls) == 1:
+            return self._handle_function_call(tool_calls[0], request)
 
-        except Exception as e:
-            self.logger.error(f"Error getting response from OpenAI: {e}")
-            raise
+        self._check_deadline(request, "tool calls")
 
-    def _is_clearly_forex_query(self, text: str) -> bool:
-        """Check if the text is clearly a forex query."""
-        text_lower = text.lower()
-
-        # Currency codes
-        currency_codes = ["usd", "eur", "gbp", "jpy", "cad", "aud", "chf", "cny", "rub"]
-        has_currency = any(code in text_lower for code in currency_codes)
-
-        # Forex keywords
-        forex_keywords = [
-            "rate",
-            "convert",
-            "exchange",
-            "currency",
-            "dollar",
-            "euro",
-            "pound",
-            "yen",
-            "franc",
-            "yuan",
-            "ruble",
+        parsed = self._batch_weather_calls(self._parse_tool_calls(tool_calls))
+        if not parsed:
+            return self._process_general_question(request)
+
+        # Total latency is the slowest tool instead of the sum of all of them
+        futures = [
+            self.tool_executor.submit(
+                bind_context(self._call_tool), name, parameters, request
+            )
+            for name, parameters in parsed
         ]
-        has_forex_keywords = any(keyword in text_lower for keyword in forex_keywords)
-
-        return has_currency or has_forex_keywords
-
-    def _extract_forex_params_from_text(self, text: str) -> Dict[str, Any]:
-        """Extract forex parameters from text as fallback."""
-        import re
-
-        text_lower = text.lower()
-
-        # Currency patterns
-        currency_patterns = {
-            "usd": "USD",
-            "dollar": "USD",
-            "dollars": "USD",
-            "eur": "EUR",
-            "euro": "EUR",
-            "euros": "EUR",
-            "gbp": "GBP",
-            "pound": "GBP",
-            "pounds": "GBP",
-            "jpy": "JPY",
-            "yen": "JPY",
-            "cad": "CAD",
-            "canadian": "CAD",
-            "aud": "AUD",
-            "australian": "AUD",
-            "chf": "CHF",
-            "franc": "CHF",
-            "swiss": "CHF",
-            "cny": "CNY",
-            "yuan": "CNY",
-            "chinese": "CNY",
-            "rub": "RUB",
-            "ruble": "RUB",
-            "russian": "RUB",
-        }
-
-        # Extract currencies
-        currencies = []
-        for pattern, code in currency_patterns.items():
-            if pattern in text_lower and code not in currencies:
-                currencies.append(code)
-
-        if len(currencies) >= 2:
-            # Extract amount
-            numbers = re.findall(r"\d+(?:\.\d+)?", text)
-            amount = float(numbers[0]) if numbers else None
-
-            # Determine action
-            action = "convert" if "convert" in text_lower or amount else "rate"
-
-            return {
-                "action": action,
-                "from_currency": currencies[0],
-                "to_currency": currencies[1],
-                "amount": amount,
-            }
-
-        return {}
+        replies = [future.result() for future in futures]
 
-    def _handle_function_call(
-        self, function_call: Dict[str, Any], request: ChatRequest
+        return ChatResponse(
+            messages=request.messages + [self._merge_tool_replies(replies)]
+        )
+
+    async def _ahandle_tool_calls(
+        self, tool_calls: list[dict[str, Any]], request: ChatRequest
     ) -> ChatResponse:
-        """Handle the detected function call."""
-        function_name = function_call["name"]
-        parameters = function_call["arguments"]
+        """Async variant of `_handle_tool_calls`."""
+        if len(tool_calls) == 1:
+            return await self._ahandle_function_call(tool_calls[0], request)
 
-        # Parse the arguments if they're a string
-        if isinstance(parameters, str):
-            try:
-                parameters = json.loads(parameters)
-            except json.JSONDecodeError:
-                self.logger.error(f"Failed to parse function arguments: {parameters}")
-                return self._process_general_question(request)
+        self._check_deadline(request, "tool calls")
 
-        self.logger.info(
-            f"Handling function call: {function_name} with parameters: {parameters}"
+        parsed = self._batch_weather_calls(self._parse_tool_calls(tool_calls))
+        if not parsed:
+            return await self._aprocess_general_question(request)
+
+        replies = await asyncio.gather(
+            *(
+                self._acall_tool(name, parameters, request)
+                for name, parameters in parsed
+            )
+        )
+
+        return ChatResponse(
+            messages=request.messages + [self._merge_tool_replies(list(replies))]
         )
 
+    def _stream_tool_calls(
+        self, tool_calls: list[dict[str, Any]], request: ChatRequest
+    ) -> Iterator[Message]:
+        """Streaming variant of `_handle_tool_calls`."""
+        if len(tool_calls) == 1:
+            yield from self._stream_function_call(tool_calls[0], request)
+            return
+
+        # Sub-agent replies are merged, so compound answers arrive as one chunk
+        yield self._handle_tool_calls(tool_calls, request).messages[-1]
+
+    def _parse_tool_calls(
+        self, tool_calls: list[dict[str, Any]]
+    ) -> list[tuple[str, dict[str, Any]]]:
+        """Parse every tool call, dropping unparseable and unknown ones."""
+        parsed_calls = []
+        for tool_call in tool_calls:
+            parsed = self._parse_function_call(tool_call)
+            if parsed is None:
+                continue
+            if parsed[0] not in ("get_weather", "get_forex"):
+                self.logger.warning(f"Ignoring unknown tool call: {parsed[0]}")
+                continue
+            parsed_calls.append(parsed)
+        return parsed_calls
+
+    def _batch_weather_calls(
+        self, parsed_calls: list[tuple[str, dict[str, Any]]]
+    ) -> list[tuple[str, dict[str, Any]]]:
+        """Fold weather calls of the same query type into one multi-location call."""
+        batched_calls = []
+        batches: dict[str, dict[str, Any]] = {}
+        for function_name, parameters in parsed_calls:
+            if function_name != "get_weather":
+                batched_calls.append((function_name, parameters))
+                continue
+
+            query_type = parameters.get("query_type", "current")
+            if query_type not in batches:
+                batches[query_type] = {"locations": [], "query_type": query_type}
+                batched_calls.append((function_name, batches[query_type]))
+            batches[query_type]["locations"].append(
+                parameters.get("location", "new york")
+            )
+        return batched_calls
+
+    def _call_tool(
+        self, function_name: str, parameters: dict[str, Any], request: ChatRequest
+    ) -> Message:
+        """Run one sub-agent and return its reply."""
+        if function_name == "get_weather":
+            return self._handle_weather_function(parameters, request).messages[-1]
+        return self._handle_forex_function(parameters, request).messages[-1]
+
+    async def _acall_tool(
+        self, function_name: str, parameters: dict[str, Any], request: ChatRequest
+    ) -> Message:
+        """Async variant of `_call_tool`, run on the tool pool to keep the loop free."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self.tool_executor,
+            bind_context(self._call_tool),
+            function_name,
+            parameters,
+            request,
+        )
+
+    def _merge_tool_replies(self, replies: list[Message]) -> Message:
+        """Combine sub-agent replies into one assistant message."""
+        agents = {reply.agent for reply in replies}
+        return Message(
+            role=Role.ASSISTANT,
+            text="\n\n".join(reply.text for reply in replies),
+            agent=agents.pop() if len(agents) == 1 else self.NAME,
+        )
+
+    def _handle_function_call(
+        self, function_call: dict[str, Any], request: ChatRequest
+    ) -> ChatResponse:
+        """Handle the detected function call."""
+        # Don't start sub-agent work for a client that has already gone
+        self._check_deadline(request, "function call")
+
+        parsed = self._parse_function_call(function_call)
+        if parsed is None:
+            return self._process_general_question(request)
+
+        function_name, parameters = parsed
         if function_name == "get_weather":
             return self._handle_weather_function(parameters, request)
         elif function_name == "get_forex":
@@ -221,26 +642,105 @@ class Supporter(BaseAgent):
             # Fallback to general response
             return self._process_general_question(request)
 
+    async def _ahandle_function_call(
+        self, function_call: dict[str, Any], request: ChatRequest
+    ) -> ChatResponse:
+        """Async variant of `_handle_function_call`."""
+        self._check_deadline(request, "function call")
+
+        parsed = self._parse_function_call(function_call)
+        if parsed is None:
+            return await self._aprocess_general_question(request)
+
+        function_name, parameters = parsed
+        if function_name not in ("get_weather", "get_forex"):
+            return await self._aprocess_general_question(request)
+
+        reply = await self._acall_tool(function_name, parameters, request)
+        return ChatResponse(messages=request.messages + [reply])
+
+    def _stream_function_call(
+        self, function_call: dict[str, Any], request: ChatRequest
+    ) -> Iterator[Message]:
+        """Stream the reply for a function call, streaming the general fallback."""
+        self._check_deadline(request, "function call")
+
+        parsed = self._parse_function_call(function_call)
+        if parsed is None:
+            yield from self._stream_general_question(request)
+            return
+
+        # Sub-agents reply in a single chunk
+        function_name, parameters = parsed
+        if function_name == "get_weather":
+            yield self._handle_weather_function(parameters, request).messages[-1]
+        elif function_name == "get_forex":
+            yield self._handle_forex_function(parameters, request).messages[-1]
+        else:
+            yield from self._stream_general_question(request)
+
+    def _parse_function_call(
+        self, function_call: dict[str, Any]
+    ) -> tuple[str, dict[str, Any]] | None:
+        """Return the function name and parsed arguments, or None if unparseable."""
+        function_name = function_call["name"]
+
+        # Broken arguments are repaired locally; only hopeless ones cost
+        # another model call through the general-question fallback
+        with span("supporter.parse_arguments", function=function_name) as parse_span:
+            try:
+                parsed = self.argument_parser.parse(
+                    function_name, function_call["arguments"]
+                )
+            except ArgumentParseError as e:
+                self.logger.error(f"Failed to parse function arguments: {e}")
+                parse_span.record_error(e)
+                return None
+            parse_span.set_attributes(
+                repaired=parsed.repaired, fixes=",".join(parsed.fixes)
+            )
+
+        parameters = parsed.arguments
+        if parsed.repaired:
+            self.logger.warning(
+                f"Repaired {function_name} arguments ({', '.join(parsed.fixes)}): "
+                f"{function_call['arguments']!r}"
+            )
+
+        self.logger.info(
+            f"Handling function call: {function_name} with parameters: {parameters}"
+        )
+        return function_name, parameters
+
+    @traced("supporter.weather")
     def _handle_weather_function(
-        self, parameters: Dict[str, Any], request: ChatRequest
+        self, parameters: dict[str, Any], request: ChatRequest
     ) -> ChatResponse:
         """Handle weather function call."""
-        location = parameters.get("location", "new york")
+        locations = parameters.get("locations") or [
+            parameters.get("location", "new york")
+        ]
         query_type = parameters.get("query_type", "current")
 
-        # Create a request with the extracted parameters
-        weather_query = f"What's the {query_type} weather in {location}?"
-        weather_message = Message(role=Role.USER, text=weather_query, agent=self.NAME)
-        weather_request = ChatRequest(messages=[weather_message])
-
-        self.logger.info(f"Calling WeatherAgent for {query_type} weather in {location}")
-        sub_response = self.weather_agent.chat(weather_request)
+        # Pass the parsed arguments straight through instead of rephrasing them
+        self.logger.info(
+            f"Calling WeatherAgent for {query_type} weather in {', '.join(locations)}"
+        )
+        if len(locations) > 1:
+            reply = self.weather_agent.get_weather_many(
+                locations, query_type, deadline=request.deadline
+            )
+        else:
+            reply = self.weather_agent.get_weather(
+                locations[0], query_type, deadline=request.deadline
+            )
 
         # Return the full conversation context with the assistant's response
-        return ChatResponse(messages=request.messages + [sub_response.messages[-1]])
+        return ChatResponse(messages=request.messages + [reply])
 
+    @traced("supporter.forex")
     def _handle_forex_function(
-        self, parameters: Dict[str, Any], request: ChatRequest
+        self, parameters: dict[str, Any], request: ChatRequest
     ) -> ChatResponse:
         """Handle forex function call."""
         action = parameters.get("action", "rate")
@@ -248,67 +748,111 @@ class Supporter(BaseAgent):
         to_currency = parameters.get("to_currency", "EUR")
         amount = parameters.get("amount")
 
-        if action == "convert" and amount:
-            forex_query = f"Convert {amount} {from_currency} to {to_currency}"
-        else:
-            forex_query = f"What's the {from_currency} to {to_currency} rate?"
-
-        forex_message = Message(role=Role.USER, text=forex_query, agent=self.NAME)
-        forex_request = ChatRequest(messages=[forex_message])
-
         self.logger.info(
             f"Calling ForexAgent for {action}: {from_currency} to {to_currency}"
         )
-        sub_response = self.forex_agent.chat(forex_request)
+        reply = self.forex_agent.get_forex(
+            action, from_currency, to_currency, amount, deadline=request.deadline
+        )
 
         # Return the full conversation context with the assistant's response
-        return ChatResponse(messages=request.messages + [sub_response.messages[-1]])
+        return ChatResponse(messages=request.messages + [reply])
 
+    @traced("supporter.general")
     def _process_general_question(self, request: ChatRequest) -> ChatResponse:
         """Process general questions using the main assistant."""
-        # Convert domain messages to OpenAI format
-        openai_messages = []
+        context = self._build_user_context(request, self.general_system_message)
+        openai_request = self._build_general_request(request, context)
 
-        # Add system message
-        system_message = """You are a helpful personal assistant that can help with any question.
-        You can provide information, answer questions, and help with various tasks.
-        Be friendly, informative, and helpful in your responses."""
-        openai_messages.append(OpenAIMessage(role=Role.SYSTEM, content=system_message))
+        # Get response from OpenAI
+        try:
+            openai_response = self.openai_client.chat_completion(openai_request)
+            self._log_openai_response(openai_response)
+            self.context_builder.record_usage(context.tokens, openai_response.usage)
+        except Exception as e:
+            self.logger.error(f"Error getting response from OpenAI: {e}")
+            raise
 
-        # Add user messages
-        for msg in request.messages:
-            if msg.role == Role.USER:
-                openai_messages.append(OpenAIMessage(role=msg.role, content=msg.text))
+        return self._build_assistant_response(request, openai_response.content)
+
+    @traced("supporter.general")
+    async def _aprocess_general_question(self, request: ChatRequest) -> ChatResponse:
+        """Async variant of `_process_general_question`."""
+        context = self._build_user_context(request, self.general_system_message)
+        openai_request = self._build_general_request(request, context)
+
+        try:
+            openai_response = await self.openai_client.achat_completion(openai_request)
+            self._log_openai_response(openai_response)
+            self.context_builder.record_usage(context.tokens, openai_response.usage)
+        except Exception as e:
+            self.logger.error(f"Error getting response from OpenAI: {e}")
+            raise
+
+        return self._build_assistant_response(request, openai_response.content)
+
+    @traced("supporter.general")
+    def _stream_general_question(self, request: ChatRequest) -> Iterator[Message]:
+        """Streaming variant of `_process_general_question`."""
+        context = self._build_user_context(request, self.general_system_message)
+        openai_request = self._build_general_request(request, context)
+
+        for chunk in self.openai_client.chat_completion_stream(openai_request):
+            if chunk.content:
+                yield Message(role=Role.ASSISTANT, text=chunk.content, agent=self.NAME)
+
+        self.logger.info("Streamed assistant response")
+
+    def _build_general_request(
+        self, request: ChatRequest, context: ContextWindow
+    ) -> OpenAIRequest:
+        """Build the request used to answer general questions."""
+        # Convert domain messages to OpenAI format
+        openai_messages = [
+            OpenAIMessage(role=msg.role, content=msg.text) for msg in context.messages
+        ]
 
         # Create OpenAI request
         openai_request = OpenAIRequest(
-            model=self.openai_client.config.model,
+            model=self.openai_client.config.model_for("general"),
             messages=openai_messages,
             temperature=self.openai_client.config.temperature,
             max_tokens=self.openai_client.config.max_tokens,
+            deadline=request.deadline,
         )
 
         self.logger.info(
             f"Sending general question to OpenAI with model: {openai_request.model}"
         )
-
-        # Get response from OpenAI
-        try:
-            openai_response = self.openai_client.chat_completion(openai_request)
+        return openai_request
+
+    def _build_user_context(
+        self, request: ChatRequest, system_message: Message
+    ) -> ContextWindow:
+        """Fit the system prompt and the user messages into the token budget."""
+        user_messages = [msg for msg in request.messages if msg.role == Role.USER]
+        context = self.context_builder.build([system_message] + user_messages)
+        if context.dropped:
             self.logger.info(
-                f"Received response from OpenAI model: {openai_response.model}"
+                f"Dropped {context.dropped} oldest messages "
+                f"to fit {context.tokens} tokens"
             )
+        return context
 
-            if openai_response.usage:
-                self.logger.info(f"Token usage: {openai_response.usage}")
-        except Exception as e:
-            self.logger.error(f"Error getting response from OpenAI: {e}")
-            raise
+    def _log_openai_response(self, openai_response: OpenAIResponse) -> None:
+        self.logger.info(
+            f"Received response from OpenAI model: {openai_response.model}"
+        )
 
+        if openai_response.usage:
+            self.logger.info(f"Token usage: {openai_response.usage}")
+
+    def _build_assistant_response(
+        self, request: ChatRequest, content: str
+    ) -> ChatResponse:
+        """Append the assistant answer to the conversation."""
         # Convert back to domain format
-        assistant_message = Message(
-            role=Role.ASSISTANT, text=openai_response.content, agent=self.NAME
-        )
+        assistant_message = Message(role=Role.ASSISTANT, text=content, agent=self.NAME)
 
         self.logger.info("Generated assistant response")
         return ChatResponse(messages=request.messages + [assistant_message])
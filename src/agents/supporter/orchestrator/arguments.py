@@ -0,0 +1,393 @@
+"""
+Tolerant parsing of function-call arguments produced by the model.
+
+Arguments that are not valid JSON are repaired locally: code fences and
+surrounding prose are stripped, keys are quoted, trailing commas dropped
+and truncated output is closed. The result is then checked against the
+function's JSON schema, compiled once from `FUNCTIONS`, and values are
+coerced to the declared types ("100 USD" -> 100.0, "Forecast" ->
+"forecast"). Only arguments that still fail fall back to another model
+call.
+"""
+
+import json
+import math
+import re
+import threading
+from dataclasses import dataclass, field
+from typing import Any
+
+from src.agents.supporter.orchestrator.tools import FUNCTIONS
+from src.agents.supporter.text import edit_distance
+
+NUMBER_PATTERN = re.compile(r"-?\d+(?:\.\d+)?(?:[eE][-+]?\d+)?")
+UNQUOTED_KEY_PATTERN = re.compile(r"([{,]\s*)([A-Za-z_]\w*)(\s*:)")
+TRAILING_COMMA_PATTERN = re.compile(r",\s*([}\]])")
+
+# Lowercased alternative spellings of enum values that models produce
+ENUM_ALIASES = {
+    "conversion": "convert",
+    "exchange rate": "rate",
+    "exchange_rate": "rate",
+    "now": "current",
+    "today": "current",
+}
+
+
+@dataclass(frozen=True)
+class PropertySchema:
+    type: str | None
+    # Lowercased enum value -> canonical value
+    enum: dict[str, Any] | None = None
+
+
+@dataclass(frozen=True)
+class FunctionSchema:
+    name: str
+    properties: dict[str, PropertySchema]
+    required: frozenset[str]
+
+    @classmethod
+    def compile(cls, function: dict[str, Any]) -> "FunctionSchema":
+        parameters = function.get("parameters", {})
+        properties = {}
+        for name, spec in parameters.get("properties", {}).items():
+            enum = spec.get("enum")
+            properties[name] = PropertySchema(
+                type=spec.get("type"),
+                enum={str(value).lower(): value for value in enum} if enum else None,
+            )
+        return cls(
+            name=function["name"],
+            properties=properties,
+            required=frozenset(parameters.get("required", [])),
+        )
+
+
+@dataclass
+class ParsedArguments:
+    arguments: dict[str, Any]
+    # Whether anything had to be fixed to get here
+    repaired: bool = False
+    fixes: list[str] = field(default_factory=list)
+
+
+class ArgumentParseError(ValueError):
+    """Arguments could not be repaired into a valid call."""
+
+
+class ArgumentParser:
+    """
+    Parses and validates function-call arguments against compiled schemas.
+
+    Counters show how many calls parsed cleanly, how many were repaired
+    locally (each one a model call saved) and how many still failed.
+    """
+
+    def __init__(self, functions: list[dict[str, Any]] | None = None):
+        self.schemas = {
+            function["name"]: FunctionSchema.compile(function)
+            for function in (functions or FUNCTIONS)
+        }
+        self._lock = threading.Lock()
+        self.valid = 0
+        self.repaired = 0
+        self.failed = 0
+        self.fixes: dict[str, int] = {}
+
+    def parse(
+        self, function_name: str, arguments: str | dict[str, Any]
+    ) -> ParsedArguments:
+        """
+        Parse, repair and validate the arguments of one function call.
+
+        Args:
+            function_name: Name of the called function
+            arguments: JSON text from the model, or an already parsed dict
+
+        Returns:
+            The validated arguments and the fixes that were applied
+
+        Raises:
+            ArgumentParseError: If the arguments cannot be repaired
+        """
+        schema = self.schemas.get(function_name)
+        if schema is None:
+            # Not a parsing problem, so it isn't counted as a failed repair
+            raise ArgumentParseError(f"Unknown function: {function_name}")
+
+        try:
+            parsed = self._parse(schema, arguments)
+        except ArgumentParseError:
+            with self._lock:
+                self.failed += 1
+            raise
+
+        with self._lock:
+            if parsed.repaired:
+                self.repaired += 1
+                for fix in parsed.fixes:
+                    self.fixes[fix] = self.fixes.get(fix, 0) + 1
+            else:
+                self.valid += 1
+        return parsed
+
+    def validate(
+        self, function_name: str, arguments: str | dict[str, Any]
+    ) -> str | None:
+        """Return why the arguments can't be used, or None; the call isn't counted."""
+        schema = self.schemas.get(function_name)
+        if schema is None:
+            return f"Unknown function: {function_name}"
+        try:
+            self._parse(schema, arguments)
+        except ArgumentParseError as e:
+            return str(e)
+        return None
+
+    def peek(
+        self, function_name: str, arguments: str | dict[str, Any]
+    ) -> ParsedArguments | None:
+        """Parse the arguments without counting the call, or return None if unusable."""
+        schema = self.schemas.get(function_name)
+        if schema is None:
+            return None
+        try:
+            return self._parse(schema, arguments)
+        except ArgumentParseError:
+            return None
+
+    def stats(self) -> dict:
+        """Return parse counters and the share of broken calls repaired locally."""
+        with self._lock:
+            broken = self.repaired + self.failed
+            return {
+                "valid": self.valid,
+                "repaired": self.repaired,
+                "failed": self.failed,
+                "repair_rate": self.repaired / broken if broken else 0.0,
+                "fixes": dict(self.fixes),
+            }
+
+    def _parse(
+        self, schema: FunctionSchema, arguments: str | dict[str, Any]
+    ) -> ParsedArguments:
+        fixes: list[str] = []
+        if isinstance(arguments, str):
+            arguments = self._loads(arguments, fixes)
+        if not isinstance(arguments, dict):
+            raise ArgumentParseError(f"Arguments are not an object: {arguments!r}")
+
+        validated = self._validate(schema, arguments, fixes)
+        return ParsedArguments(validated, repaired=bool(fixes), fixes=fixes)
+
+    def _loads(self, text: str, fixes: list[str]) -> Any:
+        try:
+            return json.loads(text)
+        except json.JSONDecodeError:
+            pass
+
+        # Drop code fences and any prose around the object
+        start = text.find("{")
+        if start == -1:
+            raise ArgumentParseError(f"No JSON object in arguments: {text!r}")
+        repaired = text[start:]
+        end = repaired.rfind("}")
+        if end != -1 and repaired[end + 1 :].strip():
+            repaired = repaired[: end + 1]
+        if repaired != text.strip():
+            fixes.append("extracted")
+
+        if "'" in repaired:
+            requoted = requote_single_quoted(repaired)
+            if requoted != repaired:
+                repaired = requoted
+                fixes.append("single_quotes")
+
+        quoted = UNQUOTED_KEY_PATTERN.sub(r'\1"\2"\3', repaired)
+        if quoted != repaired:
+            repaired = quoted
+            fixes.append("unquoted_keys")
+
+        closed = close_truncated_json(repaired)
+        if closed != repaired:
+            repaired = closed
+            fixes.append("truncated")
+
+        without_commas = TRAILING_COMMA_PATTERN.sub(r"\1", repaired)
+        if without_commas != repaired:
+            repaired = without_commas
+            fixes.append("trailing_comma")
+
+        try:
+            return json.loads(repaired)
+        except json.JSONDecodeError as e:
+            raise ArgumentParseError(f"Could not repair arguments: {text!r}") from e
+
+    def _validate(
+        self, schema: FunctionSchema, arguments: dict[str, Any], fixes: list[str]
+    ) -> dict[str, Any]:
+        validated = dict(arguments)
+        for name, value in arguments.items():
+            spec = schema.properties.get(name)
+            if spec is None or value is None:
+                continue
+
+            coerced = coerce(value, spec)
+            if coerced is None:
+                # An optional value we can't make sense of is dropped
+                if name in schema.required:
+                    raise ArgumentParseError(
+                        f"Invalid {name} for {schema.name}: {value!r}"
+                    )
+                del validated[name]
+                fixes.append("dropped_invalid")
+            elif coerced != value or type(coerced) is not type(value):
+                validated[name] = coerced
+                fixes.append("matched_enum" if spec.enum else f"coerced_{spec.type}")
+
+        missing = [name for name in schema.required if validated.get(name) is None]
+        if missing:
+            raise ArgumentParseError(
+                f"Missing {', '.join(sorted(missing))} for {schema.name}"
+            )
+        return validated
+
+
+def coerce(value: Any, spec: PropertySchema) -> Any:
+    """Coerce a value to its schema type, or return None if impossible."""
+    if spec.type in ("number", "integer"):
+        if isinstance(value, bool):
+            return None
+        if isinstance(value, (int, float)):
+            number = value
+            if spec.type == "number":
+                return value
+        else:
+            text = str(value).replace(",", "").strip()
+            try:
+                number = float(text)
+            except ValueError:
+                # "$100" and "100 USD" still carry a usable number
+                match = NUMBER_PATTERN.search(text)
+                if not match:
+                    return None
+                number = float(match.group())
+        if not math.isfinite(number):
+            return None
+        return int(number) if spec.type == "integer" else float(number)
+
+    if spec.type == "string":
+        if isinstance(value, (dict, list)):
+            return None
+        value = str(value).strip()
+        if spec.enum is None:
+            return value or None
+        return match_enum(value, spec.enum)
+
+    return value
+
+
+def match_enum(value: str, enum: dict[str, Any]) -> Any:
+    """
+    Match case-insensitively, then by a known alias ("conversion"), then by
+    a typo of one whole value ("forcast").
+
+    Single letters and phrases ("current weather") never match, because
+    they may mean something else.
+    """
+    lowered = value.lower()
+    if lowered in enum:
+        return enum[lowered]
+
+    alias = ENUM_ALIASES.get(lowered)
+    if alias in enum:
+        return enum[alias]
+
+    if len(lowered) < 3 or not lowered.isalpha():
+        return None
+    candidates = [
+        canonical
+        for key, canonical in enum.items()
+        if edit_distance(lowered, key) <= max(1, len(key) // 4)
+    ]
+    return candidates[0] if len(candidates) == 1 else None
+
+
+def requote_single_quoted(text: str) -> str:
+    """
+    Rewrite 'single-quoted' strings as JSON strings.
+
+    Double-quoted strings are copied as they are, so an apostrophe inside
+    one ("St. John's") is kept.
+    """
+    chars: list[str] = []
+    quote = None
+    escaped = False
+    for char in text:
+        if quote is None:
+            if char in "'\"":
+                quote = char
+                char = '"'
+        elif escaped:
+            escaped = False
+            if char == "'" and quote == "'":
+                # \' is not a JSON escape
+                chars.pop()
+        elif char == "\\":
+            escaped = True
+        elif char == quote:
+            quote = None
+            char = '"'
+        elif char == '"':
+            char = '\\"'
+        chars.append(char)
+    return "".join(chars)
+
+
+def close_truncated_json(text: str) -> str:
+    """
+    Close a JSON object that was cut off mid-stream.
+
+    Everything after the last complete member is dropped, because a value
+    cut short ("EU" for "EUR", 10 for 100) is worse than a missing one, and
+    the open brackets are closed in order.
+    """
+    stack: list[str] = []
+    # End of the last complete member, with the brackets open at that point
+    safe_end, safe_stack = None, []
+    in_string = escaped = expecting_key = is_key = False
+
+    for i, char in enumerate(text):
+        if in_string:
+            if escaped:
+                escaped = False
+            elif char == "\\":
+                escaped = True
+            elif char == '"':
+                in_string = False
+                if not is_key:
+                    safe_end, safe_stack = i + 1, list(stack)
+        elif char == '"':
+            in_string = True
+            is_key = expecting_key
+        elif char in "{[":
+            stack.append("}" if char == "{" else "]")
+            expecting_key = char == "{"
+            safe_end, safe_stack = i + 1, list(stack)
+        elif char in "}]":
+            if stack:
+                stack.pop()
+            safe_end, safe_stack = i + 1, list(stack)
+        elif char == ",":
+            # A scalar before the comma is complete
+            safe_end, safe_stack = i, list(stack)
+            expecting_key = bool(stack) and stack[-1] == "}"
+        elif char == ":":
+            expecting_key = False
+
+    if not stack and not in_string:
+        return text
+    if safe_end is None:
+        return text
+    return text[:safe_end] + "".join(reversed(safe_stack))
@@ -0,0 +1,100 @@
+"""
+Escalation rules for routing with a small model.
+
+The routing call only has to pick between get_weather, get_forex and a
+plain answer, which a small model does well. Its answer is checked before
+it is used, and only answers that fail are retried with the large model,
+so most turns pay the small model's latency and price.
+"""
+
+import threading
+from typing import Any
+
+from src.agents.supporter.orchestrator.arguments import ArgumentParser
+from src.agents.supporter.orchestrator.router import IntentRouter
+from src.infra.logger import get_logger
+from src.infra.tracing import set_span_attributes
+
+
+class RoutingCascade:
+    """
+    Checks routing answers and counts how often they are escalated.
+
+    A routing answer fails when a tool call has arguments that can't be
+    repaired, when it names an unknown tool, when it is empty, or when the
+    model answers in prose although the local router sees tool vocabulary
+    with at least `min_tool_score` confidence.
+    """
+
+    def __init__(
+        self,
+        argument_parser: ArgumentParser,
+        router: IntentRouter,
+        min_tool_score: float = 0.6,
+    ):
+        self.argument_parser = argument_parser
+        self.router = router
+        self.min_tool_score = min_tool_score
+        self.logger = get_logger(__name__)
+
+        self._lock = threading.Lock()
+        self.checked = 0
+        self.escalated = 0
+        self.by_reason: dict[str, int] = {}
+
+    def check(
+        self, text: str, tool_calls: list[dict[str, Any]] | None, content: str
+    ) -> str | None:
+        """
+        Check one routing answer from the small model.
+
+        Args:
+            text: Last user message
+            tool_calls: Tool calls in the answer, if any
+            content: Text of the answer
+
+        Returns:
+            Why the answer should be escalated, or None to accept it
+        """
+        reason = self._failure(text, tool_calls, content)
+
+        with self._lock:
+            self.checked += 1
+            if reason:
+                self.escalated += 1
+                self.by_reason[reason] = self.by_reason.get(reason, 0) + 1
+
+        if reason:
+            set_span_attributes(escalation=reason)
+            self.logger.warning(f"Escalating routing answer: {reason}")
+        return reason
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "checked": self.checked,
+                "escalated": self.escalated,
+                "escalation_rate": (
+                    self.escalated / self.checked if self.checked else 0.0
+                ),
+                "by_reason": dict(self.by_reason),
+            }
+
+    def _failure(
+        self, text: str, tool_calls: list[dict[str, Any]] | None, content: str
+    ) -> str | None:
+        for tool_call in tool_calls or []:
+            if tool_call["name"] not in self.argument_parser.schemas:
+                return "unknown tool"
+            if self.argument_parser.validate(tool_call["name"], tool_call["arguments"]):
+                return "bad arguments"
+
+        if tool_calls:
+            return None
+        if not content.strip():
+            return "empty answer"
+
+        decision = self.router.score(text)
+        if decision.confidence >= self.min_tool_score:
+            return f"prose answer to a tool query ({decision.reason})"
+        return None
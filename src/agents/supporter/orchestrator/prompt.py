@@ -11,6 +11,7 @@ CRITICAL RULES:
 2. ANY mention of "rate", "convert", "exchange", "currency" → use get_forex
 3. ANY mention of weather, temperature, forecast → use get_weather
 4. For all other questions, respond directly as a helpful assistant.
+5. If a query asks for several things, call every needed function in the same turn.
 
 Available functions:
 - get_weather: For weather queries (current weather or forecasts)
@@ -24,6 +25,11 @@ Examples:
 - "usd to gbp" → use get_forex
 - "weather in London" → use get_weather
 - "temperature in Tokyo" → use get_weather
+- "weather in Paris and convert 100 USD to EUR" → use get_weather and get_forex
 
 If the user's query doesn't clearly match weather or forex, respond as a general assistant.
 """
+
+GENERAL_SYSTEM_PROMPT = """You are a helpful personal assistant that can help with any question.
+        You can provide information, answer questions, and help with various tasks.
+        Be friendly, informative, and helpful in your responses."""
@@ -0,0 +1,280 @@
+import itertools
+import re
+import threading
+from dataclasses import dataclass
+from typing import Any
+
+from src.agents.supporter.extraction import (
+    NATIONALITY_WORDS,
+    Entity,
+    EntityExtractor,
+    EntityType,
+    get_entity_extractor,
+)
+from src.infra.logger import get_logger
+
+# Forex keywords
+FOREX_KEYWORDS = {
+    "rate",
+    "convert",
+    "exchange",
+    "currency",
+    "dollar",
+    "euro",
+    "pound",
+    "yen",
+    "franc",
+    "yuan",
+    "ruble",
+}
+
+# Words that say the user wants a lookup rather than a discussion
+FOREX_INTENT_WORDS = {"rate", "rates", "convert", "conversion", "exchange"}
+
+# Words that make a message about the weather on their own
+WEATHER_KEYWORDS = {"weather", "forecast", "temperature"}
+
+# Conditions that also appear in ordinary phrases ("hot dog", "cold brew"),
+# so they only count inside a weather phrase
+WEATHER_CONDITIONS = {
+    "rain",
+    "raining",
+    "rainy",
+    "sunny",
+    "snow",
+    "snowing",
+    "humidity",
+    "humid",
+    "wind",
+    "windy",
+    "hot",
+    "cold",
+    "warm",
+}
+
+# "is it raining in Paris", "will it be cold in Tokyo", "how hot is it in Sydney"
+WEATHER_PHRASE_PATTERN = re.compile(
+    r"\b(?:(?:is|will) it (?:be )?(?:{0})|how (?:{0}) (?:is|will) it)\b".format(
+        "|".join(sorted(WEATHER_CONDITIONS))
+    )
+)
+
+# Open-ended questions need the LLM even when they mention a tool's vocabulary
+GENERAL_MARKERS = {
+    "why",
+    "explain",
+    "history",
+    "historical",
+    "news",
+    "predict",
+    "prediction",
+    "should",
+    "was",
+    "were",
+}
+
+# Words that ask about the coming days rather than right now
+FORECAST_WORDS = {"forecast", "tomorrow", "week", "weekend"}
+
+# Words joining a currency pair: "USD to EUR", "euros in dollars", "GBP/JPY"
+PAIR_CONNECTORS = {"", "to", "into", "in", "vs", "/"}
+
+WORD_PATTERN = re.compile(r"[a-z]+")
+
+
+@dataclass
+class RouteDecision:
+    """Outcome of local routing: the function call to make and how sure we are."""
+
+    # Below `min_confidence` this is only a best guess, or None without one
+    function_call: dict[str, Any] | None
+    confidence: float
+    reason: str
+
+
+class IntentRouter:
+    """
+    Deterministic keyword router for the Supporter tools.
+
+    Scores the last user message and returns a `get_weather` or `get_forex`
+    call when it is unambiguous. Anything below `min_confidence` is left to
+    the routing LLM call.
+    """
+
+    def __init__(
+        self, min_confidence: float = 0.8, extractor: EntityExtractor | None = None
+    ):
+        self.min_confidence = min_confidence
+        self.extractor = extractor or get_entity_extractor()
+        self.logger = get_logger(__name__)
+
+        self._lock = threading.Lock()
+        self.routed = 0
+        self.fast_path = 0
+        self.by_function: dict[str, int] = {}
+
+    def route(self, text: str) -> RouteDecision | None:
+        """
+        Route a user message locally.
+
+        Args:
+            text: Last user message
+
+        Returns:
+            The decision when its confidence reaches `min_confidence`,
+            otherwise None so the caller falls back to the LLM
+        """
+        decision = self.score(text)
+        accepted = (
+            decision.function_call is not None
+            and decision.confidence >= self.min_confidence
+        )
+
+        with self._lock:
+            self.routed += 1
+            if accepted:
+                self.fast_path += 1
+                name = decision.function_call["name"]
+                self.by_function[name] = self.by_function.get(name, 0) + 1
+
+        self.logger.info(
+            f"Local routing confidence {decision.confidence:.2f} ({decision.reason}), "
+            f"{'fast path' if accepted else 'deferring to LLM'}"
+        )
+        return decision if accepted else None
+
+    def score(self, text: str) -> RouteDecision:
+        """Score a user message without recording it in the stats."""
+        words = set(WORD_PATTERN.findall(text.lower()))
+        entities = self.extractor.extract(text)
+
+        general = bool(words & GENERAL_MARKERS)
+        explicit_weather = bool(words & WEATHER_KEYWORDS) or bool(
+            WEATHER_PHRASE_PATTERN.search(text.lower())
+        )
+        weather_words = words & (WEATHER_KEYWORDS | WEATHER_CONDITIONS)
+        currencies = self._distinct(entities, EntityType.CURRENCY)
+        # "Canadian teachers" names no currency; codes, nouns and symbols do
+        named_currencies = {
+            entity.value
+            for entity in entities
+            if entity.type == EntityType.CURRENCY
+            and entity.text.lower() not in NATIONALITY_WORDS
+        }
+
+        if weather_words and named_currencies:
+            return RouteDecision(None, 0.0, "mixes weather and currency terms")
+
+        if len(currencies) >= 2:
+            params = self._forex_params(text, entities)
+            function_call = {"name": "get_forex", "arguments": params}
+            has_intent = (
+                bool(words & FOREX_INTENT_WORDS)
+                or params["amount"] is not None
+                or self._has_currency_pair(text, entities)
+            )
+            if general:
+                return RouteDecision(function_call, 0.3, "open-ended currency question")
+            if not set(currencies[:2]) <= named_currencies:
+                return RouteDecision(
+                    function_call, 0.5, "currencies named by nationality"
+                )
+            if not has_intent:
+                return RouteDecision(
+                    function_call, 0.6, "currencies without a lookup cue"
+                )
+            if self._has_unparsed_digits(text, entities):
+                # "1,00 USD" or "1.000,50 EUR": the amount read may be wrong
+                return RouteDecision(None, 0.5, "amount in an unknown number format")
+            return RouteDecision(function_call, 0.95, "currency pair")
+
+        if named_currencies:
+            return RouteDecision(None, 0.3, "single currency")
+
+        if weather_words:
+            locations = self._distinct(entities, EntityType.LOCATION)
+            function_call = None
+            if locations:
+                query_type = "forecast" if words & FORECAST_WORDS else "current"
+                arguments = {"location": locations[0], "query_type": query_type}
+                if len(locations) > 1:
+                    # Answered with one batched lookup instead of one call per city
+                    arguments["locations"] = locations
+                function_call = {"name": "get_weather", "arguments": arguments}
+            if general:
+                return RouteDecision(function_call, 0.3, "open-ended weather question")
+            if function_call is None:
+                return RouteDecision(None, 0.5, "weather without a known city")
+            if not explicit_weather:
+                return RouteDecision(
+                    function_call, 0.5, "weather condition outside a weather phrase"
+                )
+            return RouteDecision(function_call, 0.9, "weather in a known city")
+
+        return RouteDecision(None, 0.0, "no tool vocabulary")
+
+    def is_forex_query(self, text: str) -> bool:
+        """Check if the text is clearly a forex query."""
+        words = set(WORD_PATTERN.findall(text.lower()))
+        return bool(words & FOREX_KEYWORDS) or bool(self.extractor.currencies(text))
+
+    def extract_forex_params(self, text: str) -> dict[str, Any]:
+        """Extract forex parameters, or an empty dict if under two currencies."""
+        entities = self.extractor.extract(text)
+        if len(self._distinct(entities, EntityType.CURRENCY)) < 2:
+            return {}
+        return self._forex_params(text, entities)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "routed": self.routed,
+                "fast_path": self.fast_path,
+                "fast_path_rate": self.fast_path / self.routed if self.routed else 0.0,
+                "by_function": dict(self.by_function),
+            }
+
+    def _forex_params(self, text: str, entities: list[Entity]) -> dict[str, Any]:
+        currencies = self._distinct(entities, EntityType.CURRENCY)
+        amounts = self._distinct(entities, EntityType.AMOUNT)
+        amount = amounts[0] if amounts else None
+
+        # Determine action
+        action = "convert" if "convert" in text.lower() or amount else "rate"
+
+        return {
+            "action": action,
+            "from_currency": currencies[0],
+            "to_currency": currencies[1],
+            "amount": amount,
+        }
+
+    def _has_currency_pair(self, text: str, entities: list[Entity]) -> bool:
+        currencies = [e for e in entities if e.type == EntityType.CURRENCY]
+        return any(
+            left.value != right.value
+            and text[left.end : right.start].strip().lower() in PAIR_CONNECTORS
+            for left, right in itertools.pairwise(currencies)
+        )
+
+    def _has_unparsed_digits(self, text: str, entities: list[Entity]) -> bool:
+        """Whether an amount touches digits or separators it wasn't read with."""
+        for entity in entities:
+            if entity.type != EntityType.AMOUNT:
+                continue
+            before = text[max(entity.start - 2, 0) : entity.start]
+            after = text[entity.end : entity.end + 2]
+            if before[-1:].isdigit() or after[:1].isdigit():
+                return True
+            if before[-1:] in (",", ".") and before[:1].isdigit():
+                return True
+            if after[:1] in (",", ".") and after[1:].isdigit():
+                return True
+        return False
+
+    def _distinct(self, entities: list[Entity], entity_type: str) -> list[Any]:
+        values = []
+        for entity in entities:
+            if entity.type == entity_type and entity.value not in values:
+                values.append(entity.value)
+        return values
@@ -0,0 +1,80 @@
+"""
+Speculative tool execution for Supporter.
+
+When the local router has a guess for a message it is not sure enough to
+act on, the guessed sub-agent call starts while the routing call is in
+flight. Sub-agents only read provider data, so a wrong guess is simply
+thrown away, and a right one makes a tool query cost max(route, tool)
+instead of route + tool.
+"""
+
+import threading
+from dataclasses import dataclass
+from typing import Any
+
+from src.agents.supporter.orchestrator.router import RouteDecision
+from src.infra.logger import get_logger
+from src.infra.tracing import set_span_attributes
+
+
+@dataclass
+class Speculation:
+    """A sub-agent call started before the routing answer arrived."""
+
+    function_name: str
+    parameters: dict[str, Any]
+    # The running call: a concurrent.futures.Future or an asyncio.Task
+    future: Any
+
+
+class Speculator:
+    """
+    Decides when to speculate and counts how the guesses turn out.
+
+    A speculation is a hit when the routing model asks for exactly the
+    guessed call, a miss when it asks for anything else (or answers in
+    prose), and failed when the guessed call raised although it was right.
+    """
+
+    def __init__(self, min_confidence: float = 0.3):
+        self.min_confidence = min_confidence
+        self.logger = get_logger(__name__)
+
+        self._lock = threading.Lock()
+        self.started = 0
+        self.hits = 0
+        self.misses = 0
+        self.failed = 0
+
+    def should_start(self, decision: RouteDecision) -> bool:
+        """Whether the router's guess is worth running before routing is known."""
+        return (
+            decision.function_call is not None
+            and decision.confidence >= self.min_confidence
+        )
+
+    def record(self, outcome: str) -> None:
+        """Count a "started", "hit", "miss" or "failed" speculation."""
+        with self._lock:
+            if outcome == "started":
+                self.started += 1
+            elif outcome == "hit":
+                self.hits += 1
+            elif outcome == "miss":
+                self.misses += 1
+            else:
+                self.failed += 1
+        set_span_attributes(speculation=outcome)
+        if outcome != "started":
+            self.logger.info(f"Speculative tool call: {outcome}")
+
+    def stats(self) -> dict:
+        with self._lock:
+            settled = self.hits + self.misses + self.failed
+            return {
+                "started": self.started,
+                "hits": self.hits,
+                "misses": self.misses,
+                "failed": self.failed,
+                "hit_rate": self.hits / settled if settled else 0.0,
+            }
@@ -46,3 +46,6 @@ FUNCTIONS = [
         },
     },
 ]
+
+# Same functions in the tools format, which allows parallel calls
+TOOLS = [{"type": "function", "function": function} for function in FUNCTIONS]
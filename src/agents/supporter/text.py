@@ -0,0 +1,24 @@
+"""
+String helpers shared by the Supporter's parsers.
+
+Kept free of heavy imports, so the orchestrator can use them without
+loading the gazetteer or numpy.
+"""
+
+
+def edit_distance(a: str, b: str) -> int:
+    """Levenshtein distance where swapping two adjacent characters is one edit."""
+    before_previous: list[int] = []
+    previous = list(range(len(b) + 1))
+    for i in range(1, len(a) + 1):
+        current = [i] + [0] * len(b)
+        for j in range(1, len(b) + 1):
+            current[j] = min(
+                previous[j] + 1,
+                current[j - 1] + 1,
+                previous[j - 1] + (a[i - 1] != b[j - 1]),
+            )
+            if i > 1 and j > 1 and a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1]:
+                current[j] = min(current[j], before_previous[j - 2] + 1)
+        before_previous, previous = previous, current
+    return previous[-1]
@@ -1,11 +1,16 @@
 from typing import Any, Dict
 
 from src.agents.base import BaseAgent
-from src.agents.supporter.weather.mocks import WeatherClient
+from src.agents.supporter.extraction import EntityType, get_entity_extractor
+from src.agents.supporter.weather.locations import get_location_index
+from src.agents.supporter.weather.mocks import CACHE_POLICIES, WeatherClient
 from src.agents.supporter.weather.prompt import SYSTEM_PROMPT
 from src.agents.supporter.weather.tools import FUNCTIONS
 from src.clients.openai import OpenAIClient
+from src.domain.deadline import Deadline
 from src.domain.entities import ChatRequest, ChatResponse, Message, Role
+from src.infra.cache.provider import CachedProvider
+from src.infra.tracing import traced
 
 
 class WeatherAgent(BaseAgent):
@@ -17,7 +22,9 @@ class WeatherAgent(BaseAgent):
 
     def __init__(self, openai_client: OpenAIClient):
         super().__init__()
-        self.weather_client = WeatherClient()
+        self.weather_client = CachedProvider(WeatherClient(), CACHE_POLICIES)
+        self.extractor = get_entity_extractor()
+        self.locations = get_location_index()
         self.openai_client = openai_client
         self.functions = FUNCTIONS
         self.system_prompt = SYSTEM_PROMPT
@@ -27,48 +34,122 @@ class WeatherAgent(BaseAgent):
             f"Received weather request with {len(request.messages)} messages (context optimized)"
         )
 
+        self._check_deadline(request, "lookup")
+
         # Get the last user message
         last_message = request.messages[-1].text
 
         # Extract location and type of weather info needed
-        location = self._extract_location(last_message)
-        is_forecast = "forecast" in last_message.lower()
+        locations = self._extract_locations(last_message)
+        query_type = "forecast" if "forecast" in last_message.lower() else "current"
+
+        if not locations:
+            assistant_message = Message(
+                role=Role.ASSISTANT,
+                text="Which city would you like the weather for?",
+                agent=self.NAME,
+            )
+            return ChatResponse(messages=request.messages + [assistant_message])
+
+        if len(locations) > 1:
+            assistant_message = self.get_weather_many(locations, query_type)
+        else:
+            assistant_message = self.get_weather(locations[0], query_type)
+        return ChatResponse(messages=request.messages + [assistant_message])
 
-        if is_forecast:
+    @traced("weather.get_weather")
+    def get_weather(
+        self,
+        location: str,
+        query_type: str = "current",
+        deadline: Deadline | None = None,
+    ) -> Message:
+        """
+        Answer a weather query from structured parameters.
+
+        Args:
+            location: City to look up
+            query_type: "current" or "forecast"
+            deadline: Deadline of the request this lookup serves, if any
+
+        Returns:
+            The assistant message with the formatted weather
+        """
+        if deadline:
+            deadline.check("lookup")
+
+        if query_type == "forecast":
             weather_data = self.weather_client.get_forecast(location)
             response_text = self._format_forecast_response(weather_data)
         else:
             weather_data = self.weather_client.get_current_weather(location)
             response_text = self._format_current_weather_response(weather_data)
 
-        # Create assistant message
-        assistant_message = Message(
-            role=Role.ASSISTANT, text=response_text, agent=self.NAME
-        )
-
         self.logger.info("Generated weather response")
-        return ChatResponse(messages=request.messages + [assistant_message])
+        return Message(role=Role.ASSISTANT, text=response_text, agent=self.NAME)
+
+    @traced("weather.get_weather_many")
+    def get_weather_many(
+        self,
+        locations: list[str],
+        query_type: str = "current",
+        deadline: Deadline | None = None,
+    ) -> Message:
+        """
+        Answer a weather query for several locations with one batched lookup.
+
+        Args:
+            locations: Cities to look up; repeats and spellings of the same
+                place are answered once
+            query_type: "current" or "forecast"
+            deadline: Deadline of the request this lookup serves, if any
+
+        Returns:
+            One assistant message with a section per place, in the order given
+        """
+        if deadline:
+            deadline.check("lookup")
+
+        if query_type == "forecast":
+            results = self.weather_client.get_forecast_many(locations)
+            format_response = self._format_forecast_response
+        else:
+            results = self.weather_client.get_current_weather_many(locations)
+            format_response = self._format_current_weather_response
+
+        # "London" and "Londn" resolve to the same place, which is shown once
+        sections = {}
+        for weather_data in results:
+            if weather_data["location"] not in sections:
+                sections[weather_data["location"]] = format_response(weather_data)
+
+        self.logger.info(f"Generated weather response for {len(sections)} locations")
+        return Message(
+            role=Role.ASSISTANT, text="\n\n".join(sections.values()), agent=self.NAME
+        )
 
-    def _extract_location(self, message: str) -> str:
-        """Extract location from the message."""
-        # Simple location extraction - in a real implementation, you might use NLP
-        common_cities = [
-            "new york",
-            "london",
-            "tokyo",
-            "sydney",
-            "paris",
-            "berlin",
-            "moscow",
-        ]
-
-        message_lower = message.lower()
-        for city in common_cities:
-            if city in message_lower:
-                return city
-
-        # Default to a common city if no specific location found
-        return "new york"
+    async def achat(self, request: ChatRequest) -> ChatResponse:
+        # The mock client is in-memory, so the sync path never blocks the loop
+        return self.chat(request)
+
+    def _extract_locations(self, message: str) -> list[str]:
+        """Extract the locations in the message, in order; empty if it names none."""
+        locations = []
+        for entity in self.extractor.extract(message):
+            if entity.type == EntityType.LOCATION and entity.value not in locations:
+                locations.append(entity.value)
+        if locations:
+            return locations
+
+        # Fall back to the full gazetteer, which also tolerates typos
+        match = self.locations.find(message)
+        if match:
+            self.logger.info(
+                f"Resolved location {match.text!r} to {match.place.name} "
+                f"(confidence {match.confidence})"
+            )
+            return [match.place.name]
+        return []
 
     def _format_current_weather_response(self, weather_data: Dict[str, Any]) -> str:
         """Format current weather data into a readable response."""
@@ -0,0 +1,282 @@
+"""
+Location index over the bundled gazetteer.
+
+Names and aliases are normalized (lowercase, no accents or punctuation)
+into one hash table for exact matches. Every name is also split into
+character trigrams, and a precomputed inverted index from trigram to place
+ids narrows typo-tolerant lookups to a handful of candidates, so lookups
+stay fast however large the gazetteer grows.
+"""
+
+import re
+import threading
+import unicodedata
+from collections import defaultdict
+from collections.abc import Iterable
+from dataclasses import dataclass
+from pathlib import Path
+
+import numpy as np
+
+from src.agents.supporter.text import edit_distance
+
+GAZETTEER_PATH = Path(__file__).with_name("gazetteer.tsv")
+
+NON_ALPHANUMERIC_PATTERN = re.compile(r"[^a-z0-9]+")
+
+# A place name usually follows one of these in a weather question
+LOCATION_PREPOSITIONS = frozenset({"in", "for", "at", "near", "around"})
+
+# Words that are never places on their own, even if a place is named so
+STOP_WORDS = frozenset(
+    {
+        "a",
+        "an",
+        "the",
+        "is",
+        "are",
+        "was",
+        "will",
+        "be",
+        "it",
+        "its",
+        "what",
+        "whats",
+        "how",
+        "today",
+        "tomorrow",
+        "now",
+        "weather",
+        "forecast",
+        "current",
+        "currently",
+        "like",
+        "and",
+        "or",
+        "me",
+        "my",
+        "of",
+        "to",
+        "in",
+        "for",
+        "at",
+        "near",
+        "around",
+        "this",
+        "next",
+        "week",
+        "weekend",
+        "day",
+        "days",
+        "please",
+        "tell",
+        "show",
+        "give",
+    }
+)
+
+
+@dataclass(frozen=True)
+class Place:
+    name: str
+    country: str
+
+
+@dataclass(frozen=True)
+class LocationMatch:
+    place: Place
+    # 1.0 for an exact name or alias, 1 - edits / length for fuzzy matches
+    confidence: float
+    # Normalized text that produced the match
+    text: str
+
+
+def normalize(text: str) -> str:
+    """Lowercase, strip accents and collapse punctuation to single spaces."""
+    decomposed = unicodedata.normalize("NFKD", text.lower())
+    ascii_text = decomposed.encode("ascii", "ignore").decode("ascii")
+    return NON_ALPHANUMERIC_PATTERN.sub(" ", ascii_text).strip()
+
+
+def trigrams(text: str) -> set[str]:
+    padded = f"  {text} "
+    return {padded[i : i + 3] for i in range(len(padded) - 2)}
+
+
+class LocationIndex:
+    """
+    Exact and fuzzy place lookup.
+
+    Exact names and aliases are resolved with one dict lookup. Otherwise
+    the trigram index ranks names by shared trigrams, and the best few are
+    scored by edit distance: confidence is 1 - edits / length, so one typo
+    in a six-letter name gives 0.83.
+    """
+
+    def __init__(
+        self,
+        places: Iterable[tuple[Place, Iterable[str]]],
+        max_candidates: int = 5,
+    ):
+        self.max_candidates = max_candidates
+        self.places: list[Place] = []
+        # Normalized name or alias -> place id; the first place keeps a name
+        self._exact: dict[str, int] = {}
+        # Every indexed name, with the place it points to
+        self._names: list[str] = []
+        self._name_places: list[int] = []
+        self._max_words = 1
+
+        postings: dict[str, list[int]] = defaultdict(list)
+        for place, aliases in places:
+            place_id = len(self.places)
+            self.places.append(place)
+            for name in (place.name, *aliases):
+                key = normalize(name)
+                if not key or key in self._exact:
+                    continue
+                self._exact[key] = place_id
+                self._max_words = max(self._max_words, len(key.split()))
+
+                name_id = len(self._names)
+                self._names.append(key)
+                self._name_places.append(place_id)
+                for gram in trigrams(key):
+                    postings[gram].append(name_id)
+
+        self._postings = {
+            gram: np.array(ids, dtype=np.int32) for gram, ids in postings.items()
+        }
+        self._gram_counts = np.array(
+            [len(trigrams(name)) for name in self._names], dtype=np.int32
+        )
+
+    @classmethod
+    def from_file(cls, path: Path = GAZETTEER_PATH) -> "LocationIndex":
+        """Load a gazetteer with name, country and comma-separated aliases per row."""
+        entries = []
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                if not line.strip() or line.startswith("#"):
+                    continue
+                name, country, aliases = (line.rstrip("\n").split("\t") + [""])[:3]
+                entries.append(
+                    (Place(name, country), [a for a in aliases.split(",") if a])
+                )
+        return cls(entries)
+
+    def __len__(self) -> int:
+        return len(self.places)
+
+    def lookup(self, text: str, min_confidence: float = 0.8) -> LocationMatch | None:
+        """
+        Resolve a place name such as "London", "nyc", "Londn" or "Paris, FR".
+
+        Args:
+            text: The place name on its own
+            min_confidence: Lowest fuzzy similarity accepted
+
+        Returns:
+            The best match, or None if nothing is similar enough
+        """
+        key = normalize(text)
+        if not key:
+            return None
+
+        exact = self._exact_match(key)
+        if exact:
+            return exact
+
+        # "Paris, France" -> "Paris"
+        head = normalize(text.split(",")[0])
+        if head != key:
+            exact = self._exact_match(head)
+            if exact:
+                return exact
+
+        return self._fuzzy_match(head, min_confidence)
+
+    def find(self, message: str, min_confidence: float = 0.8) -> LocationMatch | None:
+        """
+        Find the first place mentioned in a free-text message.
+
+        Exact names are matched anywhere, longest first. Misspelled names
+        are only looked for right after a preposition ("weather in Lodnon"),
+        where a place is expected, to keep ordinary words from matching.
+        """
+        words = normalize(message).split()
+
+        for i in range(len(words)):
+            if words[i] in STOP_WORDS:
+                continue
+            for width in range(min(self._max_words, len(words) - i), 0, -1):
+                match = self._exact_match(" ".join(words[i : i + width]))
+                if match:
+                    return match
+
+        best = None
+        for i, word in enumerate(words[:-1]):
+            if word not in LOCATION_PREPOSITIONS:
+                continue
+            candidate_words = []
+            for next_word in words[i + 1 : i + 1 + self._max_words]:
+                if next_word in STOP_WORDS:
+                    break
+                candidate_words.append(next_word)
+                match = self._fuzzy_match(" ".join(candidate_words), min_confidence)
+                if match and (best is None or match.confidence > best.confidence):
+                    best = match
+        return best
+
+    def _exact_match(self, key: str) -> LocationMatch | None:
+        place_id = self._exact.get(key)
+        if place_id is None:
+            return None
+        return LocationMatch(self.places[place_id], 1.0, key)
+
+    def _fuzzy_match(self, key: str, min_confidence: float) -> LocationMatch | None:
+        # Very short strings share too few trigrams to match reliably
+        if len(key) < 4:
+            return None
+
+        key_grams = trigrams(key)
+        grams = [self._postings[gram] for gram in key_grams if gram in self._postings]
+        if not grams:
+            return None
+
+        # Only names sharing a trigram are scored, however large the index is
+        name_ids, shared = np.unique(np.concatenate(grams), return_counts=True)
+        # Dice coefficient on trigram sets ranks candidates cheaply
+        dice = 2 * shared / (self._gram_counts[name_ids] + len(key_grams))
+        count = min(self.max_candidates, len(name_ids))
+        top = np.argpartition(dice, -count)[-count:]
+        candidates = name_ids[top[np.argsort(dice[top])[::-1]]]
+
+        best_id, best_score = None, min_confidence
+        for name_id in candidates:
+            name = self._names[name_id]
+            longest = max(len(key), len(name))
+            # Each extra character costs at least one edit
+            if 1 - abs(len(key) - len(name)) / longest < best_score:
+                continue
+            score = 1 - edit_distance(key, name) / longest
+            if score >= best_score:
+                best_id, best_score = int(name_id), score
+
+        if best_id is None:
+            return None
+        place = self.places[self._name_places[best_id]]
+        return LocationMatch(place, round(best_score, 3), key)
+
+
+_index: LocationIndex | None = None
+_index_lock = threading.Lock()
+
+
+def get_location_index() -> LocationIndex:
+    """Return the process-wide index, loading the gazetteer on first use."""
+    global _index
+    with _index_lock:
+        if _index is None:
+            _index = LocationIndex.from_file()
+        return _index
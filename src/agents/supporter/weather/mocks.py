@@ -1,4 +1,12 @@
-from typing import Any, Dict
+from collections.abc import Callable
+from typing import Any
+
+from src.agents.supporter.weather.locations import (
+    LocationIndex,
+    get_location_index,
+    normalize,
+)
+from src.infra.cache.provider import CachePolicy
 
 
 class WeatherClient:
@@ -6,7 +14,8 @@ class WeatherClient:
     Mock weather client that provides weather information.
     """
 
-    def __init__(self):
+    def __init__(self, locations: LocationIndex | None = None):
+        self.locations = locations or get_location_index()
         self.mock_data = {
             "new york": {
                 "temperature": 22,
@@ -38,36 +47,81 @@ class WeatherClient:
             },
         }
 
-    def get_current_weather(self, location: str) -> Dict[str, Any]:
+    def get_current_weather(self, location: str) -> dict[str, Any]:
         """Get current weather for a location."""
-        location_lower = location.lower()
-
-        # Try to find exact match or partial match
-        for city, data in self.mock_data.items():
-            if location_lower in city or city in location_lower:
-                return {
-                    "location": city.title(),
-                    "temperature": data["temperature"],
-                    "condition": data["condition"],
-                    "humidity": data["humidity"],
-                    "wind_speed": data["wind_speed"],
-                }
+        name, data = self._resolve(location)
+
+        if data:
+            return {
+                "location": name,
+                "temperature": data["temperature"],
+                "condition": data["condition"],
+                "humidity": data["humidity"],
+                "wind_speed": data["wind_speed"],
+            }
 
         # Default response for unknown locations
         return {
-            "location": location.title(),
+            "location": name,
             "temperature": 20,
             "condition": "unknown",
             "humidity": 50,
             "wind_speed": 10,
         }
 
-    def get_forecast(self, location: str, days: int = 5) -> Dict[str, Any]:
+    def get_forecast(self, location: str, days: int = 5) -> dict[str, Any]:
         """Get weather forecast for a location."""
-        location_lower = location.lower()
+        name, data = self._resolve(location)
+
+        if data:
+            return {"location": name, "forecast": data["forecast"][:days]}
+
+        return {"location": name, "forecast": ["unknown"] * days}
+
+    def get_current_weather_many(self, locations: list[str]) -> list[dict[str, Any]]:
+        """Get current weather for many locations, in the order given."""
+        return self._many(self.get_current_weather, locations)
+
+    def get_forecast_many(
+        self, locations: list[str], days: int = 5
+    ) -> list[dict[str, Any]]:
+        """Get forecasts for many locations, in the order given."""
+        return self._many(lambda location: self.get_forecast(location, days), locations)
+
+    def _many(
+        self, lookup: Callable[[str], dict[str, Any]], locations: list[str]
+    ) -> list[dict[str, Any]]:
+        # Repeated locations are looked up once and share the result
+        results: dict[str, dict[str, Any]] = {}
+        for location in locations:
+            key = normalize(location)
+            if key not in results:
+                results[key] = lookup(location)
+        return [results[normalize(location)] for location in locations]
+
+    def _resolve(self, location: str) -> tuple[str, dict[str, Any] | None]:
+        """Canonical place name and its mock data, via the gazetteer."""
+        match = self.locations.lookup(location)
+        if match is None:
+            return location.title(), None
+        return match.place.name, self.mock_data.get(match.place.name.lower())
 
-        for city, data in self.mock_data.items():
-            if location_lower in city or city in location_lower:
-                return {"location": city.title(), "forecast": data["forecast"][:days]}
 
-        return {"location": location.title(), "forecast": ["unknown"] * days}
+# Weather changes slowly: serve stale readings while refreshing, and
+# remember unknown locations briefly so typos don't hit the provider
+CACHE_POLICIES = {
+    "get_current_weather": CachePolicy(
+        ttl=300,
+        stale_ttl=600,
+        negative_ttl=60,
+        is_negative=lambda data: data["condition"] == "unknown",
+    ),
+    "get_forecast": CachePolicy(
+        ttl=1800,
+        stale_ttl=3600,
+        negative_ttl=60,
+        is_negative=lambda data: set(data["forecast"]) == {"unknown"},
+    ),
+    "get_current_weather_many": CachePolicy(batch_of="get_current_weather"),
+    "get_forecast_many": CachePolicy(batch_of="get_forecast"),
+}
@@ -0,0 +1,135 @@
+import threading
+import time
+from collections import deque
+
+
+class CircuitState:
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+
+class CircuitOpenError(Exception):
+    """Raised when a call is rejected because its circuit is open."""
+
+
+class CircuitBreaker:
+    """
+    Error-rate circuit breaker.
+
+    Tracks the outcome of the last `window_size` calls. Once at least
+    `min_requests` outcomes are known and the failure rate reaches
+    `failure_threshold`, the circuit opens and rejects calls for
+    `recovery_timeout` seconds. It then half-opens and lets up to
+    `half_open_max_calls` probes through: a successful probe closes the
+    circuit, a failed one opens it again.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        failure_threshold: float = 0.5,
+        window_size: int = 20,
+        min_requests: int = 5,
+        recovery_timeout: float = 30.0,
+        half_open_max_calls: int = 1,
+    ):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.min_requests = min_requests
+        self.recovery_timeout = recovery_timeout
+        self.half_open_max_calls = half_open_max_calls
+
+        self._outcomes: deque[bool] = deque(maxlen=window_size)
+        self._state = CircuitState.CLOSED
+        self._opened_at = 0.0
+        self._probes_in_flight = 0
+        self._probe_started_at = 0.0
+        self._lock = threading.Lock()
+
+        self.rejected = 0
+        self.times_opened = 0
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            self._maybe_half_open()
+            return self._state
+
+    def allow_request(self) -> bool:
+        """Check whether a call may go through, reserving a probe slot if half-open."""
+        with self._lock:
+            self._maybe_half_open()
+
+            if self._state == CircuitState.CLOSED:
+                return True
+            if self._state == CircuitState.HALF_OPEN:
+                now = time.monotonic()
+                # A probe that never reported back must not wedge the circuit
+                if now - self._probe_started_at >= self.recovery_timeout:
+                    self._probes_in_flight = 0
+                if self._probes_in_flight < self.half_open_max_calls:
+                    self._probes_in_flight += 1
+                    self._probe_started_at = now
+                    return True
+
+            self.rejected += 1
+            return False
+
+    def record_success(self) -> None:
+        with self._lock:
+            if self._state == CircuitState.HALF_OPEN:
+                self._close()
+                return
+            self._outcomes.append(True)
+
+    def record_failure(self) -> None:
+        with self._lock:
+            if self._state == CircuitState.HALF_OPEN:
+                self._open()
+                return
+
+            self._outcomes.append(False)
+            if len(self._outcomes) >= self.min_requests:
+                failures = self._outcomes.count(False)
+                if failures / len(self._outcomes) >= self.failure_threshold:
+                    self._open()
+
+    def release(self) -> None:
+        """Give back a call slot without recording an outcome."""
+        with self._lock:
+            if self._state == CircuitState.HALF_OPEN and self._probes_in_flight:
+                self._probes_in_flight -= 1
+
+    def stats(self) -> dict:
+        with self._lock:
+            self._maybe_half_open()
+            failures = self._outcomes.count(False)
+            return {
+                "name": self.name,
+                "state": self._state,
+                "failure_rate": (
+                    failures / len(self._outcomes) if self._outcomes else 0.0
+                ),
+                "rejected": self.rejected,
+                "times_opened": self.times_opened,
+            }
+
+    def _maybe_half_open(self) -> None:
+        if (
+            self._state == CircuitState.OPEN
+            and time.monotonic() - self._opened_at >= self.recovery_timeout
+        ):
+            self._state = CircuitState.HALF_OPEN
+            self._probes_in_flight = 0
+
+    def _open(self) -> None:
+        self._state = CircuitState.OPEN
+        self._opened_at = time.monotonic()
+        self._probes_in_flight = 0
+        self.times_opened += 1
+
+    def _close(self) -> None:
+        self._state = CircuitState.CLOSED
+        self._outcomes.clear()
+        self._probes_in_flight = 0
@@ -0,0 +1,517 @@
+"""
+Deterministic offline stand-in for the OpenAI chat completions API.
+
+`FakeOpenAIClient` is a drop-in `OpenAIClient` whose SDK calls are served by
+a `FakeBackend`, so caching, rate limiting, retries and circuit breaking all
+run unchanged. `serve_fake_openai` exposes the same backend as an
+OpenAI-compatible HTTP endpoint for tools that talk to a base URL.
+
+Run the HTTP stub with:
+    python -m src.clients.fake --port 8089
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import re
+import threading
+import time
+from collections.abc import Iterator
+from dataclasses import dataclass, field
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from types import SimpleNamespace
+from typing import Any
+
+import httpx
+import openai
+from openai.types.chat import ChatCompletion, ChatCompletionChunk
+
+from src.clients.openai import OpenAIClient, OpenAIConfig
+from src.infra.logger import get_logger
+
+FAKE_API_URL = "http://fake-openai.local/v1/chat/completions"
+
+
+@dataclass
+class LatencyProfile:
+    """Latency distribution in seconds: constant, uniform, normal or lognormal."""
+
+    distribution: str = "constant"
+    mean: float = 0.0
+    stddev: float = 0.0
+    min: float = 0.0
+    max: float = 30.0
+    # Extra delay between streamed chunks
+    per_chunk: float = 0.0
+
+    def sample(self, rng: random.Random) -> float:
+        if self.distribution == "constant":
+            value = self.mean
+        elif self.distribution == "uniform":
+            value = rng.uniform(self.mean - self.stddev, self.mean + self.stddev)
+        elif self.distribution == "normal":
+            value = rng.gauss(self.mean, self.stddev)
+        elif self.distribution == "lognormal":
+            # mean is the median; stddev is the sigma of the underlying normal
+            value = self.mean * rng.lognormvariate(0, self.stddev)
+        else:
+            raise ValueError(f"Unknown latency distribution: {self.distribution}")
+        return min(self.max, max(self.min, value))
+
+
+@dataclass
+class FailureProfile:
+    """Probabilities of injected errors, checked in order per call."""
+
+    rate_limit: float = 0.0
+    server_error: float = 0.0
+    timeout: float = 0.0
+    retry_after: float | None = 1.0
+    # How long an injected timeout hangs before failing
+    timeout_after: float = 1.0
+
+
+@dataclass
+class FakeRule:
+    """
+    Scripted reply for requests whose last user message matches pattern.
+
+    Set `content` for a text answer or `function_call` (name and arguments
+    dict) for a function call; function calls only fire when the request
+    offers that function.
+    """
+
+    pattern: str
+    content: str | None = None
+    function_call: dict | None = None
+
+    def __post_init__(self):
+        self._regex = re.compile(self.pattern, re.IGNORECASE)
+
+    def matches(self, text: str) -> bool:
+        return bool(self._regex.search(text))
+
+
+@dataclass
+class FakePlan:
+    """What the backend decided to do with one call."""
+
+    latency: float
+    error: str | None = None
+    payload: dict | None = None
+
+
+@dataclass
+class FakeBackend:
+    """
+    Rule-based chat completion generator with seeded latency and failures.
+
+    Without a matching rule, requests that offer functions get a keyword
+    based weather/forex routing decision and everything else gets an echo.
+    """
+
+    rules: list[FakeRule] = field(default_factory=list)
+    latency: LatencyProfile = field(default_factory=LatencyProfile)
+    failures: FailureProfile = field(default_factory=FailureProfile)
+    seed: int = 0
+
+    def __post_init__(self):
+        self._rng = random.Random(self.seed)
+        self._lock = threading.Lock()
+        self._ids = 0
+        self.calls = 0
+        self.errors: dict[str, int] = {}
+
+    def plan(self, params: dict) -> FakePlan:
+        """Decide latency, injected error and payload for one API call."""
+        with self._lock:
+            self.calls += 1
+            self._ids += 1
+            call_id = self._ids
+            latency = self.latency.sample(self._rng)
+            roll = self._rng.random()
+
+        error = self._pick_error(roll)
+        if error:
+            with self._lock:
+                self.errors[error] = self.errors.get(error, 0) + 1
+            if error == "timeout":
+                latency = self.failures.timeout_after
+            return FakePlan(latency=latency, error=error)
+
+        # Honor the per-request timeout the client asked for
+        timeout = params.get("timeout")
+        if isinstance(timeout, (int, float)) and latency > timeout:
+            return FakePlan(latency=timeout, error="timeout")
+
+        return FakePlan(latency=latency, payload=self._completion(params, call_id))
+
+    def stream_chunks(self, payload: dict) -> Iterator[dict]:
+        """Split a completion payload into chat.completion.chunk payloads."""
+        message = payload["choices"][0]["message"]
+        base = {
+            "id": payload["id"],
+            "object": "chat.completion.chunk",
+            "created": payload["created"],
+            "model": payload["model"],
+        }
+
+        def chunk(delta: dict, finish_reason: str | None = None) -> dict:
+            return {
+                **base,
+                "choices": [
+                    {"index": 0, "delta": delta, "finish_reason": finish_reason}
+                ],
+            }
+
+        yield chunk({"role": "assistant"})
+        if message.get("content"):
+            for piece in re.findall(r"\S+\s*|\s+", message["content"]):
+                yield chunk({"content": piece})
+        if message.get("function_call"):
+            function_call = message["function_call"]
+            yield chunk(
+                {"function_call": {"name": function_call["name"], "arguments": ""}}
+            )
+            yield chunk({"function_call": {"arguments": function_call["arguments"]}})
+        for index, tool_call in enumerate(message.get("tool_calls") or []):
+            function = tool_call["function"]
+            opening = {
+                "index": index,
+                "id": tool_call["id"],
+                "type": "function",
+                "function": {"name": function["name"], "arguments": ""},
+            }
+            yield chunk({"tool_calls": [opening]})
+            arguments = {
+                "index": index,
+                "function": {"arguments": function["arguments"]},
+            }
+            yield chunk({"tool_calls": [arguments]})
+        yield chunk({}, payload["choices"][0]["finish_reason"])
+
+    def error_response(self, error: str) -> tuple[int, dict, dict]:
+        """Status code, headers and JSON body for an injected HTTP error."""
+        if error == "rate_limit":
+            headers = {}
+            if self.failures.retry_after is not None:
+                headers["retry-after"] = str(self.failures.retry_after)
+            body = {
+                "error": {
+                    "message": "Rate limit reached (fake)",
+                    "code": "rate_limit_exceeded",
+                }
+            }
+            return 429, headers, body
+        return (
+            500,
+            {},
+            {"error": {"message": "Internal server error (fake)", "code": None}},
+        )
+
+    def raise_error(self, error: str) -> None:
+        """Raise the SDK exception the real client would raise for an error."""
+        request = httpx.Request("POST", FAKE_API_URL)
+        if error == "timeout":
+            raise openai.APITimeoutError(request=request)
+
+        status_code, headers, body = self.error_response(error)
+        response = httpx.Response(
+            status_code, headers=headers, json=body, request=request
+        )
+        error_class = (
+            openai.RateLimitError if status_code == 429 else openai.InternalServerError
+        )
+        raise error_class(
+            body["error"]["message"], response=response, body=body["error"]
+        )
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"calls": self.calls, "errors": dict(self.errors)}
+
+    def _pick_error(self, roll: float) -> str | None:
+        threshold = 0.0
+        for error, rate in (
+            ("rate_limit", self.failures.rate_limit),
+            ("server_error", self.failures.server_error),
+            ("timeout", self.failures.timeout),
+        ):
+            threshold += rate
+            if roll < threshold:
+                return error
+        return None
+
+    def _completion(self, params: dict, call_id: int) -> dict:
+        messages = params.get("messages", [])
+        last_user = next(
+            (m["content"] for m in reversed(messages) if m["role"] == "user"), ""
+        )
+        tools = params.get("tools") or []
+        offered = {f["name"] for f in params.get("functions") or []} | {
+            tool["function"]["name"] for tool in tools
+        }
+
+        content, calls = self._respond(last_user, offered)
+        # Legacy function calling and non-parallel tools get one call at most
+        if not tools or params.get("parallel_tool_calls") is False:
+            calls = calls[:1]
+
+        message = {"role": "assistant", "content": content}
+        finish_reason = "stop"
+        if calls and tools:
+            message["tool_calls"] = [
+                {
+                    "id": f"call_fake_{call_id}_{index}",
+                    "type": "function",
+                    "function": {
+                        "name": call["name"],
+                        "arguments": json.dumps(call["arguments"]),
+                    },
+                }
+                for index, call in enumerate(calls)
+            ]
+            finish_reason = "tool_calls"
+        elif calls:
+            message["function_call"] = {
+                "name": calls[0]["name"],
+                "arguments": json.dumps(calls[0]["arguments"]),
+            }
+            finish_reason = "function_call"
+
+        prompt_tokens = sum(len(m["content"] or "") // 4 + 4 for m in messages)
+        arguments_length = sum(len(json.dumps(call["arguments"])) for call in calls)
+        completion_tokens = len(content or "") // 4 + arguments_length // 4 + 1
+        return {
+            "id": f"chatcmpl-fake-{call_id}",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": params.get("model", "fake"),
+            "choices": [
+                {
+                    "index": 0,
+                    "message": message,
+                    "finish_reason": finish_reason,
+                }
+            ],
+            "usage": {
+                "prompt_tokens": prompt_tokens,
+                "completion_tokens": completion_tokens,
+                "total_tokens": prompt_tokens + completion_tokens,
+            },
+        }
+
+    def _respond(self, text: str, offered: set[str]) -> tuple[str | None, list[dict]]:
+        for rule in self.rules:
+            if not rule.matches(text):
+                continue
+            if rule.function_call and rule.function_call["name"] in offered:
+                return None, [rule.function_call]
+            if rule.content is not None:
+                return rule.content, []
+
+        # Compound questions get one call per clause, like parallel tool calls
+        calls = []
+        for clause in re.split(r"\band\b|[;,]", text):
+            call = self._keyword_call(clause, offered)
+            if call and call not in calls:
+                calls.append(call)
+        if calls:
+            return None, calls
+
+        return f"Fake answer to: {text}", []
+
+    def _keyword_call(self, text: str, offered: set[str]) -> dict | None:
+        lowered = text.lower()
+        if "get_forex" in offered and re.search(
+            r"\b(usd|eur|gbp|jpy|rate|convert|exchange|currency)\b", lowered
+        ):
+            codes = re.findall(r"\b(usd|eur|gbp|jpy|cad|aud|chf|cny|rub)\b", lowered)
+            amount = re.search(r"\d+(?:\.\d+)?", text)
+            arguments = {
+                "action": "convert" if amount else "rate",
+                "from_currency": (codes[0] if codes else "usd").upper(),
+                "to_currency": (codes[1] if len(codes) > 1 else "eur").upper(),
+            }
+            if amount:
+                arguments["amount"] = float(amount.group())
+            return {"name": "get_forex", "arguments": arguments}
+
+        if "get_weather" in offered and re.search(
+            r"\b(weather|forecast|temperature)\b", lowered
+        ):
+            location = re.search(r"\bin ([a-z][a-z ]*?)(?:[?.!,]|\s*$)", lowered)
+            arguments = {
+                "location": location.group(1) if location else "new york",
+                "query_type": "forecast" if "forecast" in lowered else "current",
+            }
+            return {"name": "get_weather", "arguments": arguments}
+
+        return None
+
+
+class _FakeStream:
+    def __init__(self, chunks: Iterator[dict], per_chunk: float):
+        self._chunks = chunks
+        self._per_chunk = per_chunk
+        self.closed = False
+
+    def __iter__(self) -> Iterator[ChatCompletionChunk]:
+        for chunk in self._chunks:
+            if self.closed:
+                return
+            if self._per_chunk:
+                time.sleep(self._per_chunk)
+            yield ChatCompletionChunk.model_validate(chunk)
+
+    def close(self) -> None:
+        self.closed = True
+
+
+class _FakeCompletions:
+    def __init__(self, backend: FakeBackend):
+        self.backend = backend
+
+    def create(self, **params: Any) -> ChatCompletion | _FakeStream:
+        plan = self.backend.plan(params)
+        time.sleep(plan.latency)
+        if plan.error:
+            self.backend.raise_error(plan.error)
+
+        if params.get("stream"):
+            return _FakeStream(
+                self.backend.stream_chunks(plan.payload),
+                self.backend.latency.per_chunk,
+            )
+        return ChatCompletion.model_validate(plan.payload)
+
+
+class _AsyncFakeCompletions:
+    def __init__(self, backend: FakeBackend):
+        self.backend = backend
+
+    async def create(self, **params: Any) -> ChatCompletion:
+        plan = self.backend.plan(params)
+        await asyncio.sleep(plan.latency)
+        if plan.error:
+            self.backend.raise_error(plan.error)
+        return ChatCompletion.model_validate(plan.payload)
+
+
+class FakeOpenAIClient(OpenAIClient):
+    """
+    OpenAIClient whose upstream calls are served by a FakeBackend.
+    """
+
+    def __init__(
+        self,
+        config: OpenAIConfig | None = None,
+        backend: FakeBackend | None = None,
+        **kwargs: Any,
+    ):
+        super().__init__(
+            config or OpenAIConfig(api_key="fake", model="fake-model"), **kwargs
+        )
+        self.backend = backend or FakeBackend()
+        # Only the `chat.completions.create` surface of the SDK is used
+        self.client = SimpleNamespace(
+            chat=SimpleNamespace(completions=_FakeCompletions(self.backend))
+        )
+        self.async_client = SimpleNamespace(
+            chat=SimpleNamespace(completions=_AsyncFakeCompletions(self.backend))
+        )
+
+
+def serve_fake_openai(
+    backend: FakeBackend | None = None, host: str = "127.0.0.1", port: int = 8089
+) -> ThreadingHTTPServer:
+    """
+    Build an OpenAI-compatible HTTP server for the backend.
+
+    Point `OPENAI_BASE_URL` at `http://{host}:{port}/v1` and call
+    `serve_forever()` on the returned server (or run it in a thread).
+    """
+    backend = backend or FakeBackend()
+    logger = get_logger(__name__)
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_POST(self):
+            if not self.path.rstrip("/").endswith("/chat/completions"):
+                self._send_json(404, {"error": {"message": "Not found"}})
+                return
+
+            length = int(self.headers.get("content-length", 0))
+            params = json.loads(self.rfile.read(length) or b"{}")
+            plan = backend.plan(params)
+            time.sleep(plan.latency)
+
+            if plan.error == "timeout":
+                # Hang up without answering, like a stalled upstream
+                self.close_connection = True
+                return
+            if plan.error:
+                status_code, headers, body = backend.error_response(plan.error)
+                self._send_json(status_code, body, headers)
+                return
+
+            if params.get("stream"):
+                self._send_stream(backend.stream_chunks(plan.payload))
+            else:
+                self._send_json(200, plan.payload)
+
+        def _send_json(self, status_code: int, body: dict, headers: dict | None = None):
+            data = json.dumps(body).encode("utf-8")
+            self.send_response(status_code)
+            self.send_header("content-type", "application/json")
+            self.send_header("content-length", str(len(data)))
+            for name, value in (headers or {}).items():
+                self.send_header(name, value)
+            self.end_headers()
+            self.wfile.write(data)
+
+        def _send_stream(self, chunks: Iterator[dict]):
+            self.send_response(200)
+            self.send_header("content-type", "text/event-stream")
+            self.send_header("cache-control", "no-cache")
+            self.end_headers()
+            for chunk in chunks:
+                if backend.latency.per_chunk:
+                    time.sleep(backend.latency.per_chunk)
+                self.wfile.write(f"data: {json.dumps(chunk)}\n\n".encode())
+                self.wfile.flush()
+            self.wfile.write(b"data: [DONE]\n\n")
+            self.close_connection = True
+
+        def log_message(self, format: str, *args: Any) -> None:
+            logger.debug(format % args)
+
+    return ThreadingHTTPServer((host, port), Handler)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Fake OpenAI-compatible server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8089)
+    parser.add_argument("--latency", type=float, default=0.0, help="Median latency, s")
+    parser.add_argument("--sigma", type=float, default=0.0, help="Lognormal sigma")
+    parser.add_argument("--rate-limit", type=float, default=0.0, help="429 probability")
+    parser.add_argument(
+        "--server-error", type=float, default=0.0, help="500 probability"
+    )
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    server = serve_fake_openai(
+        FakeBackend(
+            latency=LatencyProfile("lognormal", mean=args.latency, stddev=args.sigma),
+            failures=FailureProfile(
+                rate_limit=args.rate_limit, server_error=args.server_error
+            ),
+            seed=args.seed,
+        ),
+        host=args.host,
+        port=args.port,
+    )
+    print(f"Fake OpenAI API listening on http://{args.host}:{args.port}/v1")
+    server.serve_forever()
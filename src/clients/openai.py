@@ -1,9 +1,27 @@
+import asyncio
+import hashlib
+import json
+import os
+import tempfile
+import threading
 import time
-from dataclasses import dataclass
-
-import openai
+from collections.abc import Awaitable, Callable, Iterator
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
 
+from src.clients.circuit import CircuitBreaker, CircuitOpenError
+from src.clients.ratelimit import RateLimiter
+from src.clients.retry import RetryPolicy, get_retry_after, is_retryable
+from src.clients.singleflight import AsyncSingleFlight, SingleFlight
+from src.clients.transport import get_async_http_client, get_http_client
+from src.domain.deadline import Deadline, DeadlineExceeded
+from src.infra.cache.memory import LRUCache
 from src.infra.logger import get_logger
+from src.infra.tracing import set_span_attributes, span, traced
+
+if TYPE_CHECKING:
+    import openai
 
 
 @dataclass
@@ -12,6 +30,34 @@ class OpenAIConfig:
     model: str
     temperature: float = 0.7
     max_tokens: int | None = None
+    # Point at an OpenAI-compatible server, e.g. the fake in src/clients/fake.py
+    base_url: str | None = None
+    max_retries: int = 3
+    # Token budget for the conversation history sent with each request
+    context_max_tokens: int = 8000
+    # Tried in order when the circuit for the requested model is open
+    fallback_models: list[str] = field(default_factory=list)
+    circuit_failure_threshold: float = 0.5
+    circuit_min_requests: int = 5
+    circuit_recovery_timeout: float = 30.0
+    requests_per_minute: int | None = None
+    tokens_per_minute: int | None = None
+    # Share one upstream call between concurrent identical requests
+    singleflight_enabled: bool = True
+    cache_enabled: bool = False
+    cache_max_size: int = 1024
+    cache_ttl: float | None = 3600.0
+    cache_dir: str | None = None
+    # Per-stage models; None uses `model`
+    routing_model: str | None = None
+    general_model: str | None = None
+    judge_model: str | None = None
+    # Retry routing answers from `routing_model` that fail validation with `model`
+    routing_cascade: bool = False
+
+    def model_for(self, stage: str) -> str:
+        """Return the model for a stage ("routing", "general" or "judge")."""
+        return getattr(self, f"{stage}_model") or self.model
 
 
 @dataclass
@@ -28,6 +74,12 @@ class OpenAIRequest:
     max_tokens: int | None = None
     functions: list[dict] | None = None
     function_call: str | dict | None = None
+    tools: list[dict] | None = None
+    tool_choice: str | dict | None = None
+    parallel_tool_calls: bool | None = None
+    deadline: Deadline | None = None
+    # None caches only deterministic (temperature 0) calls, True/False force it
+    cache: bool | None = None
 
 
 @dataclass
@@ -36,75 +88,764 @@ class OpenAIResponse:
     model: str
     usage: dict
     function_call: dict | None = None
+    # Each call is {"id": ..., "name": ..., "arguments": <JSON string>}
+    tool_calls: list[dict] | None = None
+
+
+@dataclass
+class OpenAIStreamChunk:
+    content: str = ""
+    function_call: dict | None = None
+    tool_calls: list[dict] | None = None
+
+
+class OpenAIResponseCache:
+    """
+    Exact-match cache for chat completions.
+
+    Responses are kept in a bounded in-memory LRU with TTL and, when a
+    directory is configured, mirrored to disk so they survive restarts.
+    """
+
+    def __init__(
+        self,
+        max_size: int = 1024,
+        ttl: float | None = 3600.0,
+        cache_dir: str | None = None,
+    ):
+        self.ttl = ttl
+        self.memory = LRUCache(max_size=max_size, ttl=ttl)
+        self.cache_dir = Path(cache_dir) if cache_dir else None
+        if self.cache_dir:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+
+        self.disk_hits = 0
+        self.disk_writes = 0
+
+    @staticmethod
+    def is_cacheable(request: OpenAIRequest) -> bool:
+        """Check whether the request opted in to caching."""
+        if request.cache is not None:
+            return request.cache
+        return request.temperature == 0
+
+    @staticmethod
+    def key_for(request: OpenAIRequest) -> str:
+        """Build a canonical hash of everything that shapes the completion."""
+        payload = {
+            "model": request.model,
+            "messages": [[msg.role, msg.content] for msg in request.messages],
+            "temperature": request.temperature,
+            "max_tokens": request.max_tokens,
+            "functions": request.functions,
+            "function_call": request.function_call,
+            "tools": request.tools,
+            "tool_choice": request.tool_choice,
+            "parallel_tool_calls": request.parallel_tool_calls,
+        }
+        canonical = json.dumps(payload, sort_keys=True, separators=(",", ":"))
+        return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> OpenAIResponse | None:
+        response = self.memory.get(key)
+        if response is not None:
+            return response
+
+        response = self._read_disk(key)
+        if response is not None:
+            self.disk_hits += 1
+            # Promote to the memory tier for subsequent lookups
+            self.memory.set(key, response)
+        return response
+
+    def set(self, key: str, response: OpenAIResponse) -> None:
+        self.memory.set(key, response)
+        self._write_disk(key, response)
+
+    def clear(self) -> None:
+        self.memory.clear()
+        if self.cache_dir:
+            for file_path in self.cache_dir.glob("*.json"):
+                file_path.unlink(missing_ok=True)
+
+    def stats(self) -> dict:
+        """Return memory tier counters together with disk tier counters."""
+        stats = self.memory.stats()
+        stats["disk_hits"] = self.disk_hits
+        stats["disk_writes"] = self.disk_writes
+        # A memory miss served from disk is still a cache hit overall
+        lookups = stats["hits"] + stats["misses"]
+        total_hits = stats["hits"] + self.disk_hits
+        stats["hit_ratio"] = total_hits / lookups if lookups else 0.0
+        return stats
+
+    def _read_disk(self, key: str) -> OpenAIResponse | None:
+        if not self.cache_dir:
+            return None
+
+        file_path = self.cache_dir / f"{key}.json"
+        try:
+            with open(file_path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (json.JSONDecodeError, FileNotFoundError):
+            return None
+
+        if self.ttl is not None and time.time() - data["created_at"] > self.ttl:
+            file_path.unlink(missing_ok=True)
+            return None
+
+        return OpenAIResponse(**data["response"])
+
+    def _write_disk(self, key: str, response: OpenAIResponse) -> None:
+        if not self.cache_dir:
+            return
+
+        data = {"created_at": time.time(), "response": asdict(response)}
+
+        # Write to a temp file first so readers never see a partial entry
+        fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(data, f, ensure_ascii=False)
+            os.replace(tmp_path, self.cache_dir / f"{key}.json")
+            self.disk_writes += 1
+        except OSError:
+            Path(tmp_path).unlink(missing_ok=True)
 
 
 class OpenAIClient:
     """
-    OpenAI client with retry mechanism.
+    OpenAI client with rate limiting, retry mechanism, circuit breaking with
+    model failover, request coalescing and response cache.
     """
 
-    MAX_RETRIES = 3
+    DEFAULT_COMPLETION_TOKENS = 512
 
-    def __init__(self, config: OpenAIConfig):
+    def __init__(self, config: OpenAIConfig, rate_limiter: RateLimiter | None = None):
         self.config = config
         self.logger = get_logger(__name__)
-        self.client = openai.OpenAI(api_key=config.api_key)
+        # The SDK clients are built on first use, see `client`
+        self._client: openai.OpenAI | None = None
+        self._async_client: openai.AsyncOpenAI | None = None
+        self._sdk_lock = threading.Lock()
+        self.retry_policy = RetryPolicy(max_attempts=config.max_retries)
+        self.circuit_breakers: dict[str, CircuitBreaker] = {}
+        self._breakers_lock = threading.Lock()
+        # Pass a shared limiter to enforce one quota across several clients
+        self.rate_limiter = rate_limiter or (
+            RateLimiter(config.requests_per_minute, config.tokens_per_minute)
+            if config.requests_per_minute or config.tokens_per_minute
+            else None
+        )
+        self.singleflight = SingleFlight() if config.singleflight_enabled else None
+        self.async_singleflight = (
+            AsyncSingleFlight() if config.singleflight_enabled else None
+        )
+        self.cache = (
+            OpenAIResponseCache(
+                max_size=config.cache_max_size,
+                ttl=config.cache_ttl,
+                cache_dir=config.cache_dir,
+            )
+            if config.cache_enabled
+            else None
+        )
         self.logger.info(f"Initialized OpenAI client with model: {config.model}")
 
+    @property
+    def client(self) -> "openai.OpenAI":
+        """
+        Sync SDK client, created on first use.
+
+        Importing the `openai` SDK takes most of a second, so it is deferred
+        until a request is actually sent.
+        """
+        if self._client is None:
+            with self._sdk_lock:
+                if self._client is None:
+                    import openai
+
+                    # All clients share one pooled transport so connections
+                    # are reused. SDK retries are disabled: the retry policy
+                    # is the only layer.
+                    self._client = openai.OpenAI(
+                        api_key=self.config.api_key,
+                        base_url=self.config.base_url,
+                        http_client=get_http_client(),
+                        max_retries=0,
+                    )
+        return self._client
+
+    @client.setter
+    def client(self, client: Any) -> None:
+        self._client = client
+
+    @property
+    def async_client(self) -> "openai.AsyncOpenAI":
+        """Async SDK client, created on first use like `client`."""
+        if self._async_client is None:
+            with self._sdk_lock:
+                if self._async_client is None:
+                    import openai
+
+                    self._async_client = openai.AsyncOpenAI(
+                        api_key=self.config.api_key,
+                        base_url=self.config.base_url,
+                        http_client=get_async_http_client(),
+                        max_retries=0,
+                    )
+        return self._async_client
+
+    @async_client.setter
+    def async_client(self, client: Any) -> None:
+        self._async_client = client
+
+    @traced("openai.chat_completion")
     def chat_completion(self, request: OpenAIRequest) -> OpenAIResponse:
-        messages = [
-            {"role": msg.role, "content": msg.content} for msg in request.messages
-        ]
+        set_span_attributes(model=request.model, messages=len(request.messages))
+        cache_key = self._cache_key(request)
+        if cache_key:
+            cached = self.cache.get(cache_key)
+            set_span_attributes(cache_hit=cached is not None)
+            if cached is not None:
+                self.logger.info("Serving chat completion from cache")
+                return cached
+
+        deadline = request.deadline
+        if deadline:
+            deadline.check("chat completion")
+
+        if self.singleflight is None:
+            return self._complete(request, cache_key)
+
+        # Concurrent identical requests share one upstream call
+        flight_key = cache_key or OpenAIResponseCache.key_for(request)
+        led = []
+
+        def lead() -> OpenAIResponse:
+            led.append(True)
+            return self._complete(request, cache_key)
+
+        try:
+            response = self.singleflight.do(
+                flight_key, lead, timeout=deadline.remaining() if deadline else None
+            )
+            set_span_attributes(shared_call=not led)
+            return response
+        except DeadlineExceeded:
+            # The shared call may have run under a tighter deadline than ours
+            if not led and (deadline is None or not deadline.expired):
+                return self._complete(request, cache_key)
+            raise
+        except TimeoutError as e:
+            raise DeadlineExceeded(
+                "Deadline exceeded waiting for in-flight call"
+            ) from e
+
+    @traced("openai.chat_completion")
+    async def achat_completion(self, request: OpenAIRequest) -> OpenAIResponse:
+        """Async variant of `chat_completion` built on `openai.AsyncOpenAI`."""
+        set_span_attributes(model=request.model, messages=len(request.messages))
+        cache_key = self._cache_key(request)
+        if cache_key:
+            cached = self.cache.get(cache_key)
+            set_span_attributes(cache_hit=cached is not None)
+            if cached is not None:
+                self.logger.info("Serving chat completion from cache")
+                return cached
+
+        deadline = request.deadline
+        if deadline:
+            deadline.check("chat completion")
+
+        if self.async_singleflight is None:
+            return await self._acomplete(request, cache_key)
+
+        flight_key = cache_key or OpenAIResponseCache.key_for(request)
+        led = []
+
+        def lead() -> Awaitable[OpenAIResponse]:
+            led.append(True)
+            return self._acomplete(request, cache_key)
+
+        try:
+            response = await self.async_singleflight.do(
+                flight_key, lead, timeout=deadline.remaining() if deadline else None
+            )
+            set_span_attributes(shared_call=not led)
+            return response
+        except DeadlineExceeded:
+            if not led and (deadline is None or not deadline.expired):
+                return await self._acomplete(request, cache_key)
+            raise
+        except TimeoutError as e:
+            raise DeadlineExceeded(
+                "Deadline exceeded waiting for in-flight call"
+            ) from e
+
+    def singleflight_stats(self) -> dict:
+        """Return request coalescing counters for the sync and async paths."""
+        return {
+            "sync": self.singleflight.stats() if self.singleflight else {},
+            "async": self.async_singleflight.stats() if self.async_singleflight else {},
+        }
+
+    def _complete(
+        self, request: OpenAIRequest, cache_key: str | None
+    ) -> OpenAIResponse:
+        self.logger.info(
+            f"Starting chat completion request with {len(request.messages)} messages"
+        )
+
+        estimated_tokens = self._estimate_tokens(request)
+        response, model = self._call_with_failover(
+            request,
+            estimated_tokens,
+            lambda params: self.client.chat.completions.create(**params),
+        )
+
+        openai_response = self._parse_response(response)
+        self._record_usage(estimated_tokens, openai_response.usage)
+        self._trace_usage(openai_response)
+        # Fallback answers must not be served later for the primary model
+        if cache_key and model == request.model:
+            self.cache.set(cache_key, openai_response)
+        return openai_response
+
+    async def _acomplete(
+        self, request: OpenAIRequest, cache_key: str | None
+    ) -> OpenAIResponse:
+        self.logger.info(
+            "Starting async chat completion request with "
+            f"{len(request.messages)} messages"
+        )
+
+        estimated_tokens = self._estimate_tokens(request)
+        response, model = await self._acall_with_failover(
+            request,
+            estimated_tokens,
+            lambda params: self.async_client.chat.completions.create(**params),
+        )
+
+        openai_response = self._parse_response(response)
+        self._record_usage(estimated_tokens, openai_response.usage)
+        self._trace_usage(openai_response)
+        if cache_key and model == request.model:
+            self.cache.set(cache_key, openai_response)
+        return openai_response
+
+    @traced("openai.chat_completion_stream")
+    def chat_completion_stream(
+        self, request: OpenAIRequest
+    ) -> Iterator[OpenAIStreamChunk]:
+        """Stream a chat completion as it is generated.
+
+        Content deltas are yielded as soon as they arrive. Function and tool
+        call deltas are accumulated and yielded as a single final chunk once
+        the stream ends. Only opening the stream is retried. Cached responses
+        are replayed as a single chunk.
+        """
+        set_span_attributes(model=request.model, messages=len(request.messages))
+        cache_key = self._cache_key(request)
+        if cache_key:
+            cached = self.cache.get(cache_key)
+            set_span_attributes(cache_hit=cached is not None)
+            if cached is not None:
+                self.logger.info("Serving streaming chat completion from cache")
+                if cached.content:
+                    yield OpenAIStreamChunk(content=cached.content)
+                if cached.function_call:
+                    yield OpenAIStreamChunk(function_call=cached.function_call)
+                if cached.tool_calls:
+                    yield OpenAIStreamChunk(tool_calls=cached.tool_calls)
+                return
 
         self.logger.info(
-            f"Starting chat completion request with {len(messages)} messages"
+            "Starting streaming chat completion request with "
+            f"{len(request.messages)} messages"
         )
 
-        for attempt in range(self.MAX_RETRIES):
+        stream, model = self._call_with_failover(
+            request,
+            self._estimate_tokens(request),
+            lambda params: self.client.chat.completions.create(**params, stream=True),
+        )
+        if model != request.model:
+            cache_key = None
+
+        content_parts = []
+        function_name = ""
+        function_arguments = []
+        # Tool call deltas arrive interleaved, keyed by their index
+        tool_call_parts: dict[int, dict] = {}
+
+        for event in stream:
+            if request.deadline and request.deadline.expired:
+                stream.close()
+                raise DeadlineExceeded("Deadline exceeded while streaming")
+
+            model = getattr(event, "model", None) or model
+            if not event.choices:
+                continue
+
+            delta = event.choices[0].delta
+            if delta.content:
+                content_parts.append(delta.content)
+                yield OpenAIStreamChunk(content=delta.content)
+            if delta.function_call:
+                function_name += delta.function_call.name or ""
+                function_arguments.append(delta.function_call.arguments or "")
+            for tool_delta in delta.tool_calls or []:
+                part = tool_call_parts.setdefault(
+                    tool_delta.index, {"id": "", "name": "", "arguments": []}
+                )
+                part["id"] += tool_delta.id or ""
+                if tool_delta.function:
+                    part["name"] += tool_delta.function.name or ""
+                    part["arguments"].append(tool_delta.function.arguments or "")
+
+        content = "".join(content_parts)
+        function_call = None
+        if function_name:
+            function_call = {
+                "name": function_name,
+                "arguments": "".join(function_arguments),
+            }
+            self.logger.info(f"Function call detected in stream: {function_name}")
+            yield OpenAIStreamChunk(function_call=function_call)
+
+        tool_calls = None
+        if tool_call_parts:
+            tool_calls = [
+                {
+                    "id": part["id"],
+                    "name": part["name"],
+                    "arguments": "".join(part["arguments"]),
+                }
+                for _, part in sorted(tool_call_parts.items())
+            ]
+            self.logger.info(
+                "Tool calls detected in stream: "
+                f"{[call['name'] for call in tool_calls]}"
+            )
+            yield OpenAIStreamChunk(tool_calls=tool_calls)
+
+        if not content and function_call is None and tool_calls is None:
+            self.logger.error("OpenAI stream has no content or function call")
+            raise ValueError("OpenAI stream has no content or function call")
+
+        self.logger.info(f"Streamed content length: {len(content)} characters")
+
+        if cache_key:
+            self.cache.set(
+                cache_key,
+                OpenAIResponse(
+                    content=content,
+                    model=model,
+                    usage={},
+                    function_call=function_call,
+                    tool_calls=tool_calls,
+                ),
+            )
+
+    def _cache_key(self, request: OpenAIRequest) -> str | None:
+        """Return the cache key for the request, or None if it bypasses the cache."""
+        if self.cache is None or not OpenAIResponseCache.is_cacheable(request):
+            return None
+        return OpenAIResponseCache.key_for(request)
+
+    def _call_with_failover(
+        self,
+        request: OpenAIRequest,
+        estimated_tokens: int,
+        create: Callable[[dict], Any],
+    ) -> tuple[Any, str]:
+        """Call the API with the first model whose circuit accepts requests.
+
+        Returns:
+            The raw SDK result and the model that produced it
+        """
+        for model in self._candidate_models(request):
+            if model != request.model:
+                self.logger.warning(f"Falling back to model: {model}")
+                set_span_attributes(fallback_model=model)
+            request_params = self._build_request_params(request, model)
+            breaker = self._get_circuit_breaker(model)
+            try:
+                response = self._call_with_retries(
+                    request_params, estimated_tokens, breaker, create, request.deadline
+                )
+                return response, model
+            except CircuitOpenError as e:
+                self.logger.warning(str(e))
+
+        raise CircuitOpenError(
+            f"Circuits are open for all models: {self._candidate_models(request)}"
+        )
+
+    async def _acall_with_failover(
+        self,
+        request: OpenAIRequest,
+        estimated_tokens: int,
+        create: Callable[[dict], Awaitable[Any]],
+    ) -> tuple[Any, str]:
+        """Async variant of `_call_with_failover`."""
+        for model in self._candidate_models(request):
+            if model != request.model:
+                self.logger.warning(f"Falling back to model: {model}")
+                set_span_attributes(fallback_model=model)
+            request_params = self._build_request_params(request, model)
+            breaker = self._get_circuit_breaker(model)
+            try:
+                response = await self._acall_with_retries(
+                    request_params, estimated_tokens, breaker, create, request.deadline
+                )
+                return response, model
+            except CircuitOpenError as e:
+                self.logger.warning(str(e))
+
+        raise CircuitOpenError(
+            f"Circuits are open for all models: {self._candidate_models(request)}"
+        )
+
+    def _call_with_retries(
+        self,
+        request_params: dict,
+        estimated_tokens: int,
+        breaker: CircuitBreaker,
+        create: Callable[[dict], Any],
+        deadline: Deadline | None = None,
+    ) -> Any:
+        max_attempts = self.retry_policy.max_attempts
+
+        for attempt in range(max_attempts):
+            # An open circuit fails over to the next model without using quota
+            if not breaker.allow_request():
+                raise CircuitOpenError(f"Circuit is open for model: {breaker.name}")
+            try:
+                if self.rate_limiter:
+                    self.rate_limiter.acquire(estimated_tokens)
+                attempt_params = self._apply_deadline(request_params, deadline, attempt)
+            except DeadlineExceeded:
+                breaker.release()
+                raise
+
             try:
                 self.logger.info(
-                    f"Attempt {attempt + 1}/{self.MAX_RETRIES} to call OpenAI API"
+                    f"Attempt {attempt + 1}/{max_attempts} to call OpenAI API "
+                    f"with model: {breaker.name}"
                 )
+                with span("openai.attempt", model=breaker.name, attempt=attempt + 1):
+                    response = create(attempt_params)
+            except Exception as e:
+                sleep_time = self._handle_failed_attempt(attempt, e, breaker, deadline)
+                if sleep_time is None:
+                    # Every attempt failed; surface the last error
+                    raise
+                time.sleep(sleep_time)
+                continue
 
-                # Prepare request parameters
-                request_params = {
-                    "model": request.model,
-                    "messages": messages,  # type: ignore
-                    "temperature": request.temperature,
-                }
+            breaker.record_success()
+            self.logger.info(
+                f"Successfully received response from OpenAI on attempt {attempt + 1}"
+            )
+            return response
 
-                if request.max_tokens:
-                    request_params["max_tokens"] = request.max_tokens
-                if request.functions:
-                    request_params["functions"] = request.functions
-                if request.function_call:
-                    request_params["function_call"] = request.function_call
+    async def _acall_with_retries(
+        self,
+        request_params: dict,
+        estimated_tokens: int,
+        breaker: CircuitBreaker,
+        create: Callable[[dict], Awaitable[Any]],
+        deadline: Deadline | None = None,
+    ) -> Any:
+        max_attempts = self.retry_policy.max_attempts
 
-                response = self.client.chat.completions.create(**request_params)
+        for attempt in range(max_attempts):
+            # An open circuit fails over to the next model without using quota
+            if not breaker.allow_request():
+                raise CircuitOpenError(f"Circuit is open for model: {breaker.name}")
+            try:
+                if self.rate_limiter:
+                    await self.rate_limiter.aacquire(estimated_tokens)
+                attempt_params = self._apply_deadline(request_params, deadline, attempt)
+            except DeadlineExceeded:
+                breaker.release()
+                raise
 
+            try:
                 self.logger.info(
-                    f"Successfully received response from OpenAI on attempt {attempt + 1}"
+                    f"Attempt {attempt + 1}/{max_attempts} to call OpenAI API "
+                    f"with model: {breaker.name} (async)"
                 )
-                break
+                with span("openai.attempt", model=breaker.name, attempt=attempt + 1):
+                    response = await create(attempt_params)
             except Exception as e:
-                self.logger.warning(f"Attempt {attempt + 1} failed: {e}")
-                if attempt < self.MAX_RETRIES - 1:
-                    sleep_time = 1.5 * (attempt + 1)
-                    self.logger.info(f"Retrying in {sleep_time} seconds...")
-                    time.sleep(sleep_time)
-                else:
-                    self.logger.error(
-                        f"All {self.MAX_RETRIES} attempts failed. Last error: {e}"
-                    )
+                sleep_time = self._handle_failed_attempt(attempt, e, breaker, deadline)
+                if sleep_time is None:
+                    # Every attempt failed; surface the last error
                     raise
+                await asyncio.sleep(sleep_time)
+                continue
+
+            breaker.record_success()
+            self.logger.info(
+                f"Successfully received response from OpenAI on attempt {attempt + 1}"
+            )
+            return response
 
+    def _candidate_models(self, request: OpenAIRequest) -> list[str]:
+        """The requested model followed by the configured fallbacks."""
+        models = [request.model]
+        for model in self.config.fallback_models:
+            if model not in models:
+                models.append(model)
+        return models
+
+    def _get_circuit_breaker(self, model: str) -> CircuitBreaker:
+        with self._breakers_lock:
+            breaker = self.circuit_breakers.get(model)
+            if breaker is None:
+                breaker = CircuitBreaker(
+                    name=model,
+                    failure_threshold=self.config.circuit_failure_threshold,
+                    min_requests=self.config.circuit_min_requests,
+                    recovery_timeout=self.config.circuit_recovery_timeout,
+                )
+                self.circuit_breakers[model] = breaker
+            return breaker
+
+    def _apply_deadline(
+        self, request_params: dict, deadline: Deadline | None, attempt: int
+    ) -> dict:
+        """Fail fast once the deadline has passed, else cap the attempt timeout."""
+        if deadline is None:
+            return request_params
+
+        deadline.check(f"attempt {attempt + 1}")
+        remaining = deadline.remaining()
+        if remaining is None:
+            return request_params
+        return {**request_params, "timeout": remaining}
+
+    def _record_failure(self, breaker: CircuitBreaker, error: Exception) -> None:
+        if is_retryable(error):
+            breaker.record_failure()
+        else:
+            # The upstream answered; a rejected request says nothing about its health
+            breaker.record_success()
+
+    def _build_request_params(
+        self, request: OpenAIRequest, model: str | None = None
+    ) -> dict:
+        """Convert an OpenAIRequest into keyword arguments for the SDK."""
+        messages = [
+            {"role": msg.role, "content": msg.content} for msg in request.messages
+        ]
+
+        request_params = {
+            "model": model or request.model,
+            "messages": messages,  # type: ignore
+            "temperature": request.temperature,
+        }
+
+        if request.max_tokens:
+            request_params["max_tokens"] = request.max_tokens
+        if request.functions:
+            request_params["functions"] = request.functions
+        if request.function_call:
+            request_params["function_call"] = request.function_call
+        if request.tools:
+            request_params["tools"] = request.tools
+        if request.tool_choice:
+            request_params["tool_choice"] = request.tool_choice
+        if request.parallel_tool_calls is not None:
+            request_params["parallel_tool_calls"] = request.parallel_tool_calls
+
+        return request_params
+
+    def _estimate_tokens(self, request: OpenAIRequest) -> int:
+        """Roughly estimate prompt plus completion tokens for rate limiting."""
+        # ~4 characters per token, plus per-message formatting overhead
+        prompt_tokens = sum(len(msg.content) // 4 + 4 for msg in request.messages)
+        if request.functions:
+            prompt_tokens += len(json.dumps(request.functions)) // 4
+        if request.tools:
+            prompt_tokens += len(json.dumps(request.tools)) // 4
+        return prompt_tokens + (request.max_tokens or self.DEFAULT_COMPLETION_TOKENS)
+
+    def _record_usage(self, estimated_tokens: int, usage: dict) -> None:
+        """Reconcile the rate limiter with the actual token usage."""
+        if self.rate_limiter and usage.get("total_tokens"):
+            self.rate_limiter.adjust_tokens(estimated_tokens, usage["total_tokens"])
+
+    def _trace_usage(self, openai_response: OpenAIResponse) -> None:
+        usage = openai_response.usage
+        set_span_attributes(
+            response_model=openai_response.model,
+            prompt_tokens=usage.get("prompt_tokens"),
+            completion_tokens=usage.get("completion_tokens"),
+        )
+
+    def _handle_failed_attempt(
+        self,
+        attempt: int,
+        error: Exception,
+        breaker: CircuitBreaker,
+        deadline: Deadline | None = None,
+    ) -> float | None:
+        """Log a failed attempt and return the delay before the next one.
+
+        Returns None once all attempts are exhausted. Re-raises the error
+        when it is not retryable, and raises DeadlineExceeded when the
+        request has no time left for another attempt.
+        """
+        max_attempts = self.retry_policy.max_attempts
+        self.logger.warning(f"Attempt {attempt + 1} failed: {error}")
+
+        if deadline and deadline.expired:
+            # Timeouts we imposed ourselves say nothing about upstream health
+            breaker.release()
+            raise DeadlineExceeded(
+                f"Deadline exceeded during attempt {attempt + 1}"
+            ) from error
+
+        self._record_failure(breaker, error)
+
+        if not is_retryable(error):
+            self.logger.error(f"Non-retryable error from OpenAI API: {error}")
+            raise error
+
+        if attempt < max_attempts - 1:
+            sleep_time = self.retry_policy.backoff(attempt, get_retry_after(error))
+            remaining = deadline.remaining() if deadline else None
+            if remaining is not None and sleep_time >= remaining:
+                raise DeadlineExceeded(
+                    f"No time left to retry after attempt {attempt + 1}"
+                ) from error
+            self.logger.info(f"Retrying in {sleep_time:.2f} seconds...")
+            return sleep_time
+
+        self.logger.error(f"All {max_attempts} attempts failed. Last error: {error}")
+        return None
+
+    def _parse_response(self, response) -> OpenAIResponse:
+        """Convert an SDK chat completion into an OpenAIResponse."""
         message = response.choices[0].message
         content = message.content
         function_call = (
             message.function_call.model_dump() if message.function_call else None
         )
+        tool_calls = [
+            {
+                "id": tool_call.id,
+                "name": tool_call.function.name,
+                "arguments": tool_call.function.arguments,
+            }
+            for tool_call in message.tool_calls or []
+        ] or None
 
-        if content is None and function_call is None:
+        if content is None and function_call is None and tool_calls is None:
             self.logger.error("OpenAI response has no content or function call")
             raise ValueError("OpenAI response has no content or function call")
 
@@ -114,10 +855,15 @@ class OpenAIClient:
             self.logger.info(
                 f"Function call detected: {function_call.get('name', 'unknown')}"
             )
+        if tool_calls:
+            self.logger.info(
+                f"Tool calls detected: {[call['name'] for call in tool_calls]}"
+            )
 
         return OpenAIResponse(
             content=content or "",
             model=response.model,
             usage=response.usage.model_dump() if response.usage else {},
             function_call=function_call,
+            tool_calls=tool_calls,
         )
@@ -0,0 +1,89 @@
+import random
+import sys
+import time
+from dataclasses import dataclass
+from email.utils import parsedate_to_datetime
+
+# Status codes worth retrying: timeouts, conflicts, throttling and server errors
+RETRYABLE_STATUS_CODES = {408, 409, 429, 500, 502, 503, 504}
+
+
+@dataclass
+class RetryPolicy:
+    max_attempts: int = 3
+    base_delay: float = 0.5
+    max_delay: float = 20.0
+
+    def __post_init__(self):
+        # A request is always sent at least once, even with retries turned off
+        self.max_attempts = max(self.max_attempts, 1)
+
+    def backoff(self, attempt: int, retry_after: float | None = None) -> float:
+        """
+        Return the delay before the next attempt.
+
+        Uses exponential backoff with full jitter; a server-provided
+        Retry-After always wins when it asks for a longer pause.
+
+        Args:
+            attempt: Zero-based index of the attempt that just failed
+            retry_after: Delay requested by the server, if any
+
+        Returns:
+            Seconds to sleep before retrying
+        """
+        ceiling = min(self.max_delay, self.base_delay * 2**attempt)
+        delay = random.uniform(0, ceiling)
+        if retry_after is not None:
+            delay = max(delay, retry_after)
+        return delay
+
+
+def is_retryable(error: Exception) -> bool:
+    """Classify an error raised while calling the API as retryable or fatal."""
+    # The SDK is imported lazily; if it isn't loaded it can't have raised
+    openai = sys.modules.get("openai")
+    if openai and isinstance(
+        error, (openai.APITimeoutError, openai.APIConnectionError)
+    ):
+        return True
+    if isinstance(error, (TimeoutError, ConnectionError)):
+        return True
+
+    status_code = getattr(error, "status_code", None)
+    if status_code is None:
+        return False
+    if status_code == 429 and getattr(error, "code", None) == "insufficient_quota":
+        # Out of credits: waiting won't help
+        return False
+    return status_code in RETRYABLE_STATUS_CODES
+
+
+def get_retry_after(error: Exception) -> float | None:
+    """Extract the Retry-After delay in seconds from an API error, if present."""
+    response = getattr(error, "response", None)
+    headers = getattr(response, "headers", None) or getattr(error, "headers", None)
+    if not headers:
+        return None
+
+    retry_after_ms = headers.get("retry-after-ms")
+    if retry_after_ms:
+        try:
+            return float(retry_after_ms) / 1000
+        except ValueError:
+            pass
+
+    retry_after = headers.get("retry-after")
+    if not retry_after:
+        return None
+    try:
+        return float(retry_after)
+    except ValueError:
+        pass
+
+    # Retry-After may also be an HTTP date
+    try:
+        retry_at = parsedate_to_datetime(retry_after)
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, retry_at.timestamp() - time.time())
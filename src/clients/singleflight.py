@@ -0,0 +1,134 @@
+import asyncio
+import threading
+from collections.abc import Awaitable, Callable, Hashable
+from typing import Any
+
+
+class _Flight:
+    def __init__(self):
+        self.done = threading.Event()
+        self.waiters = 0
+        self.result: Any = None
+        self.error: BaseException | None = None
+
+
+class _FlightStats:
+    def __init__(self):
+        self.calls = 0
+        self.executions = 0
+        self.coalesced = 0
+        self.max_waiters = 0
+
+    def as_dict(self, in_flight: int) -> dict:
+        return {
+            "calls": self.calls,
+            "executions": self.executions,
+            "coalesced": self.coalesced,
+            "coalescing_rate": self.coalesced / self.calls if self.calls else 0.0,
+            "max_waiters": self.max_waiters,
+            "in_flight": in_flight,
+        }
+
+
+class SingleFlight:
+    """
+    Collapses concurrent identical calls made from different threads.
+
+    The first caller for a key runs the function; callers arriving while it
+    is in flight wait for it and share its result or exception.
+    """
+
+    def __init__(self):
+        self._flights: dict[Hashable, _Flight] = {}
+        self._lock = threading.Lock()
+        self._stats = _FlightStats()
+
+    def do(
+        self, key: Hashable, fn: Callable[[], Any], timeout: float | None = None
+    ) -> Any:
+        """Run fn once per in-flight key; waiters give up after timeout seconds."""
+        with self._lock:
+            self._stats.calls += 1
+            flight = self._flights.get(key)
+            is_leader = flight is None
+            if is_leader:
+                flight = _Flight()
+                self._flights[key] = flight
+                self._stats.executions += 1
+            else:
+                flight.waiters += 1
+                self._stats.coalesced += 1
+                self._stats.max_waiters = max(self._stats.max_waiters, flight.waiters)
+
+        if not is_leader:
+            if not flight.done.wait(timeout):
+                raise TimeoutError(f"Timed out waiting for in-flight call: {key}")
+            if flight.error is not None:
+                raise flight.error
+            return flight.result
+
+        try:
+            flight.result = fn()
+            return flight.result
+        except BaseException as e:
+            flight.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._flights[key]
+            flight.done.set()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return self._stats.as_dict(len(self._flights))
+
+
+class AsyncSingleFlight:
+    """
+    Collapses concurrent identical coroutine calls on an event loop.
+
+    The shared call runs in its own task, so a cancelled caller does not
+    cancel the result the other callers are waiting for.
+    """
+
+    def __init__(self):
+        self._tasks: dict[tuple[int, Hashable], asyncio.Task] = {}
+        self._waiters: dict[tuple[int, Hashable], int] = {}
+        self._stats = _FlightStats()
+
+    async def do(
+        self,
+        key: Hashable,
+        fn: Callable[[], Awaitable[Any]],
+        timeout: float | None = None,
+    ) -> Any:
+        """Run fn once per in-flight key; callers give up after timeout seconds."""
+        # Tasks are bound to their loop, so flights are too
+        flight_key = (id(asyncio.get_running_loop()), key)
+
+        self._stats.calls += 1
+        task = self._tasks.get(flight_key)
+        if task is not None:
+            self._waiters[flight_key] += 1
+            self._stats.coalesced += 1
+            self._stats.max_waiters = max(
+                self._stats.max_waiters, self._waiters[flight_key]
+            )
+        else:
+            task = asyncio.ensure_future(fn())
+            self._tasks[flight_key] = task
+            self._waiters[flight_key] = 0
+            self._stats.executions += 1
+            task.add_done_callback(lambda t: self._finish(flight_key, t))
+
+        return await asyncio.wait_for(asyncio.shield(task), timeout)
+
+    def stats(self) -> dict:
+        return self._stats.as_dict(len(self._tasks))
+
+    def _finish(self, flight_key: tuple[int, Hashable], task: asyncio.Task) -> None:
+        self._tasks.pop(flight_key, None)
+        self._waiters.pop(flight_key, None)
+        # Mark the exception as retrieved in case every caller was cancelled
+        if not task.cancelled():
+            task.exception()
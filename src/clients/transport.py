@@ -0,0 +1,117 @@
+import importlib.util
+import threading
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+
+from src.infra.logger import get_logger
+
+# httpx and the openai SDK are imported when the first client is built
+if TYPE_CHECKING:
+    import httpx
+
+logger = get_logger(__name__)
+
+
+@dataclass(frozen=True)
+class HTTPTransportConfig:
+    max_connections: int = 100
+    max_keepalive_connections: int = 20
+    keepalive_expiry: float = 30.0
+    http2: bool = False
+    connect_timeout: float = 5.0
+    timeout: float = 600.0
+
+
+_lock = threading.Lock()
+_config = HTTPTransportConfig()
+_http_client: "httpx.Client | None" = None
+_async_http_client: "httpx.AsyncClient | None" = None
+
+
+def configure_http_transport(config: HTTPTransportConfig) -> None:
+    """
+    Set the configuration used to build the shared HTTP clients.
+
+    Must be called before the first client is requested; later calls with a
+    different configuration are ignored so that every caller keeps sharing
+    the same connection pool.
+
+    Args:
+        config: Pool size, keep-alive and HTTP/2 settings
+    """
+    global _config
+
+    with _lock:
+        if config == _config:
+            return
+        if _http_client is not None or _async_http_client is not None:
+            logger.warning("HTTP transport already in use, ignoring new configuration")
+            return
+        _config = config
+
+
+def get_http_client() -> "httpx.Client":
+    """Return the process-wide pooled sync HTTP client, creating it on first use."""
+    global _http_client
+
+    if _http_client is None:
+        with _lock:
+            if _http_client is None:
+                import openai
+
+                _http_client = openai.DefaultHttpxClient(**_client_kwargs(_config))
+                logger.info(f"Initialized shared HTTP transport: {_config}")
+    return _http_client
+
+
+def get_async_http_client() -> "httpx.AsyncClient":
+    """
+    Return the process-wide pooled async HTTP client, creating it on first use.
+
+    Pooled connections are bound to the event loop that opened them, so the
+    shared async client is meant for a single long-running loop.
+    """
+    global _async_http_client
+
+    if _async_http_client is None:
+        with _lock:
+            if _async_http_client is None:
+                import openai
+
+                _async_http_client = openai.DefaultAsyncHttpxClient(
+                    **_client_kwargs(_config)
+                )
+                logger.info(f"Initialized shared async HTTP transport: {_config}")
+    return _async_http_client
+
+
+def close_http_transport() -> None:
+    """Close the shared sync client; the async one is dropped for the GC."""
+    global _http_client, _async_http_client
+
+    with _lock:
+        if _http_client is not None:
+            _http_client.close()
+        _http_client = None
+        _async_http_client = None
+
+
+def _client_kwargs(config: HTTPTransportConfig) -> dict:
+    import httpx
+
+    http2 = config.http2
+    if http2 and importlib.util.find_spec("h2") is None:
+        logger.warning(
+            "HTTP/2 requested but the 'h2' package is missing, using HTTP/1.1"
+        )
+        http2 = False
+
+    return {
+        "limits": httpx.Limits(
+            max_connections=config.max_connections,
+            max_keepalive_connections=config.max_keepalive_connections,
+            keepalive_expiry=config.keepalive_expiry,
+        ),
+        "timeout": httpx.Timeout(config.timeout, connect=config.connect_timeout),
+        "http2": http2,
+    }
@@ -9,3 +9,7 @@ class Agent(abc.ABC):
     @abc.abstractmethod
     def chat(self, request: ChatRequest) -> ChatResponse:
         raise NotImplementedError
+
+    @abc.abstractmethod
+    async def achat(self, request: ChatRequest) -> ChatResponse:
+        raise NotImplementedError
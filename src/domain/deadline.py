@@ -0,0 +1,53 @@
+import threading
+import time
+
+
+class DeadlineExceeded(TimeoutError):
+    """Raised when a request runs out of time or is cancelled."""
+
+
+class Deadline:
+    """
+    Time budget for a request that can also be cancelled early.
+
+    A deadline without an expiry only acts as a cancellation token.
+    """
+
+    def __init__(self, expires_at: float | None = None):
+        # Monotonic clock timestamp, or None for no time limit
+        self.expires_at = expires_at
+        self._cancelled = threading.Event()
+
+    @classmethod
+    def after(cls, seconds: float) -> "Deadline":
+        """Create a deadline that expires the given number of seconds from now."""
+        return cls(time.monotonic() + seconds)
+
+    def cancel(self) -> None:
+        """Abandon the request; every later check fails immediately."""
+        self._cancelled.set()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancelled.is_set()
+
+    @property
+    def expired(self) -> bool:
+        return self.cancelled or (
+            self.expires_at is not None and time.monotonic() >= self.expires_at
+        )
+
+    def remaining(self) -> float | None:
+        """Seconds left, 0 once expired or cancelled, None if unbounded."""
+        if self.cancelled:
+            return 0.0
+        if self.expires_at is None:
+            return None
+        return max(0.0, self.expires_at - time.monotonic())
+
+    def check(self, stage: str = "request") -> None:
+        """Raise DeadlineExceeded if there is no budget left for the given stage."""
+        if self.cancelled:
+            raise DeadlineExceeded(f"{stage} cancelled")
+        if self.expired:
+            raise DeadlineExceeded(f"Deadline exceeded before {stage}")
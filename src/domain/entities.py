@@ -1,4 +1,6 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, field
+
+from src.domain.deadline import Deadline
 
 
 class Role:
@@ -12,11 +14,19 @@ class Message:
     role: str
     text: str
     agent: str | None = None
+    # Memoized by the context builder; not part of the message identity
+    token_count: int | None = field(default=None, repr=False, compare=False)
 
 
 @dataclass
 class ChatRequest:
     messages: list[Message]
+    deadline: Deadline | None = None
+    # Set by the first agent that handles the request, or by the caller to
+    # join an existing trace
+    trace_id: str | None = None
+    # Record a sampling profile of this request (see src/infra/profiling.py)
+    profile: bool = False
 
 
 @dataclass
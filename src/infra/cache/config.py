@@ -0,0 +1,18 @@
+"""
+Cache settings that can be read without importing the caches.
+
+The semantic cache pulls in numpy, so its settings live here and the app
+only pays for the import when the cache is enabled.
+"""
+
+from dataclasses import dataclass
+
+
+@dataclass(frozen=True)
+class SemanticCacheConfig:
+    enabled: bool = False
+    # Entries kept per namespace
+    max_size: int = 1024
+    # Minimum cosine similarity for a hit
+    threshold: float = 0.85
+    ttl: float | None = 3600.0
@@ -0,0 +1,314 @@
+import threading
+import time
+from collections.abc import Callable, Hashable
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any
+
+from src.infra.cache.memory import LRUCache
+from src.infra.logger import get_logger
+from src.infra.tracing import set_span_attributes
+
+
+@dataclass(frozen=True)
+class CachePolicy:
+    """
+    Caching rules for one provider method.
+
+    A result is fresh for `ttl` seconds and may then be served stale for
+    another `stale_ttl` seconds while it is refreshed in the background.
+    Results flagged by `is_negative`, and errors of `negative_errors`, are
+    remembered for `negative_ttl` seconds instead. A batch policy only
+    names its single-item method; the TTLs of that method apply.
+    """
+
+    ttl: float = 0.0
+    stale_ttl: float = 0.0
+    negative_ttl: float = 0.0
+    is_negative: Callable[[Any], bool] | None = None
+    negative_errors: tuple[type[Exception], ...] = ()
+    # For a batch method whose first argument is a list: the single-item
+    # method whose cache entries and policy each item shares
+    batch_of: str | None = None
+
+
+@dataclass
+class _Entry:
+    value: Any
+    fresh_until: float
+    stale_until: float
+    error: Exception | None = None
+
+
+class _MethodStats:
+    def __init__(self):
+        self.hits = 0
+        self.stale_hits = 0
+        self.negative_hits = 0
+        self.misses = 0
+        self.refreshes = 0
+        self.refresh_failures = 0
+
+    def as_dict(self) -> dict:
+        lookups = self.hits + self.stale_hits + self.negative_hits + self.misses
+        served = self.hits + self.stale_hits + self.negative_hits
+        return {
+            "hits": self.hits,
+            "stale_hits": self.stale_hits,
+            "negative_hits": self.negative_hits,
+            "misses": self.misses,
+            "refreshes": self.refreshes,
+            "refresh_failures": self.refresh_failures,
+            "hit_ratio": served / lookups if lookups else 0.0,
+        }
+
+
+class CachedProvider:
+    """
+    Caching proxy for a data provider such as WeatherClient or ForexClient.
+
+    Methods with a CachePolicy are cached per arguments; every other
+    attribute is passed through to the wrapped provider unchanged. String
+    arguments are compared case-insensitively, matching how the providers
+    look them up. Batch methods are served item by item from the cache,
+    and only the missing items are passed on to the provider.
+    """
+
+    def __init__(
+        self,
+        provider: Any,
+        policies: dict[str, CachePolicy],
+        max_size: int = 1024,
+    ):
+        self.provider = provider
+        self.policies = policies
+        self.logger = get_logger(__name__)
+
+        # Batch methods share their single-item method's entries and counters
+        self._entries = {
+            name: LRUCache(max_size=max_size)
+            for name, policy in policies.items()
+            if not policy.batch_of
+        }
+        self._refreshing: set[Hashable] = set()
+        self._lock = threading.Lock()
+        # Bumped by `invalidate`, so loads that started before it aren't stored
+        self._generation = 0
+        self._stats = {name: _MethodStats() for name in self._entries}
+        # Created lazily by the executor, so idle providers cost no threads
+        self._refresh_executor = ThreadPoolExecutor(
+            max_workers=2, thread_name_prefix="provider-refresh"
+        )
+
+    def __getattr__(self, name: str) -> Any:
+        # Only called for attributes not found on the proxy itself
+        if name == "provider":
+            raise AttributeError(name)
+        attribute = getattr(self.provider, name)
+        policy = self.policies.get(name)
+        if policy is None or not callable(attribute):
+            return attribute
+
+        def cached_method(*args, **kwargs):
+            return self._call(name, policy, attribute, args, kwargs)
+
+        return cached_method
+
+    def stats(self) -> dict:
+        """Return per-method counters plus the totals over all methods."""
+        with self._lock:
+            methods = {name: stats.as_dict() for name, stats in self._stats.items()}
+
+        total = _MethodStats()
+        for counters in methods.values():
+            for counter in vars(total):
+                setattr(total, counter, getattr(total, counter) + counters[counter])
+        return {
+            "methods": methods,
+            "total": total.as_dict(),
+            "size": sum(len(entries) for entries in self._entries.values()),
+        }
+
+    def invalidate(self, method: str | None = None) -> None:
+        """Drop cached results for one method, or for all of them."""
+        with self._lock:
+            self._generation += 1
+        for name, entries in self._entries.items():
+            if method is None or name == method:
+                entries.clear()
+
+    def _call(
+        self,
+        name: str,
+        policy: CachePolicy,
+        method: Callable,
+        args: tuple,
+        kwargs: dict,
+    ) -> Any:
+        if policy.batch_of:
+            return self._call_batch(policy.batch_of, method, args, kwargs)
+
+        key = self._key(name, args, kwargs)
+        found, value = self._lookup(key, policy, method, args, kwargs)
+        set_span_attributes(**{f"{name}.cache_hit": found})
+        if found:
+            return value
+        return self._load(key, policy, method, args, kwargs)
+
+    def _call_batch(
+        self, item_name: str, method: Callable, args: tuple, kwargs: dict
+    ) -> list:
+        """Serve a batch from per-item entries and fetch only the missing items."""
+        items, rest = args[0], args[1:]
+        item_policy = self.policies[item_name]
+        item_method = getattr(self.provider, item_name)
+
+        values: dict[Hashable, Any] = {}
+        missing: dict[Hashable, Any] = {}
+        for item in items:
+            key = self._key(item_name, (item, *rest), kwargs)
+            if key in values or key in missing:
+                continue
+            try:
+                found, value = self._lookup(
+                    key, item_policy, item_method, (item, *rest), kwargs
+                )
+            except item_policy.negative_errors:
+                # A cached error only applies to a single-item call
+                found, value = False, None
+            if found:
+                values[key] = value
+            else:
+                missing[key] = item
+
+        set_span_attributes(
+            **{f"{item_name}.cached": len(values), f"{item_name}.fetched": len(missing)}
+        )
+        if missing:
+            generation = self._generation
+            fetched = method(list(missing.values()), *rest, **kwargs)
+            for key, value in zip(missing, fetched):
+                self._store(key, item_policy, value, generation=generation)
+                values[key] = value
+
+        return [values[self._key(item_name, (item, *rest), kwargs)] for item in items]
+
+    def _lookup(
+        self,
+        key: Hashable,
+        policy: CachePolicy,
+        method: Callable,
+        args: tuple,
+        kwargs: dict,
+    ) -> tuple[bool, Any]:
+        """Return (True, value) for a usable entry, or (False, None) on a miss."""
+        name = key[0]
+        entry = self._entries[name].get(key)
+        now = time.monotonic()
+        stats = self._stats[name]
+
+        if entry is not None and now < entry.stale_until:
+            with self._lock:
+                if entry.error is not None or self._is_negative(policy, entry.value):
+                    stats.negative_hits += 1
+                elif now < entry.fresh_until:
+                    stats.hits += 1
+                else:
+                    stats.stale_hits += 1
+            if now >= entry.fresh_until:
+                self._refresh_in_background(key, policy, method, args, kwargs)
+            if entry.error is not None:
+                raise entry.error
+            return True, entry.value
+
+        with self._lock:
+            stats.misses += 1
+        return False, None
+
+    def _load(
+        self,
+        key: Hashable,
+        policy: CachePolicy,
+        method: Callable,
+        args: tuple,
+        kwargs: dict,
+    ) -> Any:
+        generation = self._generation
+        try:
+            value = method(*args, **kwargs)
+        except policy.negative_errors as e:
+            if policy.negative_ttl:
+                self._store(key, policy, None, error=e, generation=generation)
+            raise
+
+        self._store(key, policy, value, generation=generation)
+        return value
+
+    def _store(
+        self,
+        key: Hashable,
+        policy: CachePolicy,
+        value: Any,
+        error: Exception | None = None,
+        generation: int | None = None,
+    ) -> None:
+        if generation is not None and generation != self._generation:
+            # Loaded from data that was invalidated meanwhile
+            return
+        now = time.monotonic()
+        if error is not None or self._is_negative(policy, value):
+            if not policy.negative_ttl:
+                return
+            # Negative results are never served stale
+            expires_at = now + policy.negative_ttl
+            self._entries[key[0]].set(key, _Entry(value, expires_at, expires_at, error))
+            return
+
+        fresh_until = now + policy.ttl
+        self._entries[key[0]].set(
+            key, _Entry(value, fresh_until, fresh_until + policy.stale_ttl)
+        )
+
+    def _refresh_in_background(
+        self,
+        key: Hashable,
+        policy: CachePolicy,
+        method: Callable,
+        args: tuple,
+        kwargs: dict,
+    ) -> None:
+        with self._lock:
+            if key in self._refreshing:
+                return
+            self._refreshing.add(key)
+
+        def refresh() -> None:
+            try:
+                self._load(key, policy, method, args, kwargs)
+                with self._lock:
+                    self._stats[key[0]].refreshes += 1
+            except Exception as e:
+                # Keep serving the stale value until it runs out
+                self.logger.warning(
+                    f"Background refresh of {key[0]} failed: {e}", exc_info=True
+                )
+                with self._lock:
+                    self._stats[key[0]].refresh_failures += 1
+            finally:
+                with self._lock:
+                    self._refreshing.discard(key)
+
+        self._refresh_executor.submit(refresh)
+
+    def _is_negative(self, policy: CachePolicy, value: Any) -> bool:
+        return policy.is_negative is not None and policy.is_negative(value)
+
+    def _key(self, name: str, args: tuple, kwargs: dict) -> Hashable:
+        def normalize(value: Any) -> Any:
+            return value.strip().lower() if isinstance(value, str) else value
+
+        return (
+            name,
+            tuple(normalize(arg) for arg in args),
+            tuple(sorted((k, normalize(v)) for k, v in kwargs.items())),
+        )
@@ -0,0 +1,337 @@
+import re
+import threading
+import time
+import zlib
+from collections import OrderedDict
+from collections.abc import Hashable
+from dataclasses import dataclass
+from typing import Any
+
+import numpy as np
+
+# Function words carry no meaning for matching questions against each other
+STOP_WORDS = frozenset(
+    {
+        "a",
+        "an",
+        "the",
+        "is",
+        "are",
+        "was",
+        "were",
+        "be",
+        "been",
+        "am",
+        "do",
+        "does",
+        "did",
+        "can",
+        "could",
+        "would",
+        "will",
+        "should",
+        "what",
+        "whats",
+        "how",
+        "hows",
+        "which",
+        "who",
+        "where",
+        "when",
+        "i",
+        "me",
+        "my",
+        "you",
+        "your",
+        "we",
+        "our",
+        "it",
+        "its",
+        "this",
+        "that",
+        "there",
+        "here",
+        "to",
+        "of",
+        "for",
+        "in",
+        "on",
+        "at",
+        "from",
+        "by",
+        "with",
+        "about",
+        "please",
+        "tell",
+        "give",
+        "show",
+        "like",
+        "current",
+        "currently",
+        "now",
+        "today",
+        "right",
+        "just",
+    }
+)
+
+# Sentence punctuation; a period or comma inside a number is kept
+PUNCTUATION_PATTERN = re.compile(r"[!?;:\"()\[\]{}]|[.,](?!\d)")
+
+# Operators and symbols such as + * = % $ change what a question asks, so
+# they are kept as words of their own
+SYMBOL_PATTERN = re.compile(r"[^\w\s.,!?;:'\"()\[\]{}]")
+
+# Numbers and symbols, which must be equal for two questions to match
+LITERAL_PATTERN = re.compile(rf"\d+(?:[.,]\d+)*|{SYMBOL_PATTERN.pattern}")
+
+
+@dataclass
+class SemanticMatch:
+    value: Any
+    similarity: float
+    text: str
+
+
+class HashedNgramEmbedder:
+    """
+    Dependency-free text embedding from hashed character n-grams and words.
+
+    Features are hashed into a fixed number of signed buckets and the
+    vector is L2-normalized, so a dot product is the cosine similarity.
+    """
+
+    def __init__(
+        self,
+        dim: int = 1024,
+        ngram_sizes: tuple[int, ...] = (3, 4, 5),
+        word_weight: float = 2.0,
+    ):
+        self.dim = dim
+        self.ngram_sizes = ngram_sizes
+        self.word_weight = word_weight
+
+    def normalize(self, text: str) -> str:
+        """Lowercase, strip punctuation, split off symbols and drop stop words."""
+        text = PUNCTUATION_PATTERN.sub(" ", text.lower().replace("'", ""))
+        words = SYMBOL_PATTERN.sub(r" \g<0> ", text).split()
+        content_words = [word for word in words if word not in STOP_WORDS]
+        # A question made only of stop words is still worth matching on
+        return " ".join(content_words or words)
+
+    def literals(self, text: str) -> tuple[str, ...]:
+        """Numbers and symbols in the text, in order of appearance."""
+        return tuple(LITERAL_PATTERN.findall(text))
+
+    def embed(self, text: str) -> np.ndarray:
+        normalized = self.normalize(text)
+        padded = f" {normalized} "
+
+        vector = np.zeros(self.dim, dtype=np.float32)
+        for size in self.ngram_sizes:
+            for i in range(len(padded) - size + 1):
+                self._add(vector, padded[i : i + size], 1.0)
+        for word in normalized.split():
+            self._add(vector, f"w:{word}", self.word_weight)
+
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
+
+    def _add(self, vector: np.ndarray, feature: str, weight: float) -> None:
+        # crc32 is stable across processes, unlike the built-in hash()
+        bucket = zlib.crc32(feature.encode("utf-8"))
+        sign = 1.0 if bucket & 0x80000000 else -1.0
+        vector[bucket % self.dim] += sign * weight
+
+
+class _Namespace:
+    """Fixed-capacity vector index with LRU slot reuse."""
+
+    def __init__(self, capacity: int, dim: int):
+        self.vectors = np.zeros((capacity, dim), dtype=np.float32)
+        self.expires_at = np.full(capacity, np.inf)
+        self.guard_ids = np.full(capacity, -1, dtype=np.int64)
+        self.texts: list[str | None] = [None] * capacity
+        self.values: list[Any] = [None] * capacity
+        self.guards: dict[Hashable, int] = {}
+        # Occupied slots from least to most recently used
+        self.lru: OrderedDict[int, None] = OrderedDict()
+        self.slot_by_key: dict[tuple[str, int], int] = {}
+        self.free = list(range(capacity - 1, -1, -1))
+
+    def guard_id(self, guard: Hashable, create: bool = False) -> int | None:
+        guard_id = self.guards.get(guard)
+        if guard_id is None and create:
+            guard_id = len(self.guards)
+            self.guards[guard] = guard_id
+        return guard_id
+
+    def release(self, slot: int) -> None:
+        key = (self.texts[slot], int(self.guard_ids[slot]))
+        self.slot_by_key.pop(key, None)
+        self.lru.pop(slot, None)
+        self.guard_ids[slot] = -1
+        self.texts[slot] = None
+        self.values[slot] = None
+        self.free.append(slot)
+
+
+class SemanticCache:
+    """
+    Near-duplicate cache keyed by text similarity instead of exact text.
+
+    Entries live in per-namespace vector indexes (one per agent), are
+    evicted least recently used first and expire after their TTL. A lookup
+    scores every entry with one matrix-vector product and returns the
+    closest entry above `threshold`. Entries only match lookups with an
+    equal `guard`, which callers use for facts that must match exactly,
+    such as amounts or currency pairs, and with the same numbers and
+    symbols, so "2 + 2" never serves "2 * 2".
+    """
+
+    def __init__(
+        self,
+        max_size: int = 1024,
+        threshold: float = 0.85,
+        ttl: float | None = 3600.0,
+        embedder: HashedNgramEmbedder | None = None,
+    ):
+        self.max_size = max_size
+        self.threshold = threshold
+        self.ttl = ttl
+        self.embedder = embedder or HashedNgramEmbedder()
+        self._namespaces: dict[str, _Namespace] = {}
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def get(self, namespace: str, text: str, guard: Hashable = None) -> Any:
+        """Return the value of the most similar entry, or None on a miss."""
+        matches = self.search(namespace, text, k=1, guard=guard)
+        return matches[0].value if matches else None
+
+    def search(
+        self, namespace: str, text: str, k: int = 3, guard: Hashable = None
+    ) -> list[SemanticMatch]:
+        """
+        Find the entries most similar to text.
+
+        Args:
+            namespace: Index to search, usually the agent name
+            text: Query text
+            k: Maximum number of matches
+            guard: Only entries stored with an equal guard can match
+
+        Returns:
+            Up to k matches above the threshold, most similar first
+        """
+        vector = self.embedder.embed(text)
+        guard = (guard, self.embedder.literals(text))
+
+        with self._lock:
+            index = self._namespaces.get(namespace)
+            guard_id = index.guard_id(guard) if index else None
+            if index is None or guard_id is None or not index.lru:
+                self.misses += 1
+                return []
+
+            self._expire(index)
+            similarities = index.vectors @ vector
+            candidates = np.flatnonzero(
+                (index.guard_ids == guard_id) & (similarities >= self.threshold)
+            )
+            if len(candidates) > k:
+                top = np.argpartition(similarities[candidates], -k)[-k:]
+                candidates = candidates[top]
+            candidates = candidates[np.argsort(similarities[candidates])[::-1]]
+
+            if not len(candidates):
+                self.misses += 1
+                return []
+
+            self.hits += 1
+            index.lru.move_to_end(int(candidates[0]))
+            return [
+                SemanticMatch(
+                    value=index.values[slot],
+                    similarity=float(similarities[slot]),
+                    text=index.texts[slot],
+                )
+                for slot in candidates
+            ]
+
+    def set(
+        self,
+        namespace: str,
+        text: str,
+        value: Any,
+        guard: Hashable = None,
+        ttl: float | None = None,
+    ) -> None:
+        """Store value for text; ttl overrides the cache default for this entry."""
+        vector = self.embedder.embed(text)
+        normalized = self.embedder.normalize(text)
+        guard = (guard, self.embedder.literals(text))
+        ttl = self.ttl if ttl is None else ttl
+
+        with self._lock:
+            index = self._namespaces.get(namespace)
+            if index is None:
+                index = _Namespace(self.max_size, self.embedder.dim)
+                self._namespaces[namespace] = index
+
+            guard_id = index.guard_id(guard, create=True)
+            slot = index.slot_by_key.get((normalized, guard_id))
+            if slot is None:
+                slot = self._allocate(index)
+
+            index.vectors[slot] = vector
+            index.expires_at[slot] = time.monotonic() + ttl if ttl else np.inf
+            index.guard_ids[slot] = guard_id
+            index.texts[slot] = normalized
+            index.values[slot] = value
+            index.slot_by_key[(normalized, guard_id)] = slot
+            index.lru[slot] = None
+            index.lru.move_to_end(slot)
+
+    def clear(self, namespace: str | None = None) -> None:
+        with self._lock:
+            if namespace is None:
+                self._namespaces.clear()
+            else:
+                self._namespaces.pop(namespace, None)
+
+    def stats(self) -> dict:
+        """Return hit/miss/eviction counters and the size of each namespace."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "namespaces": {
+                    name: len(index.lru) for name, index in self._namespaces.items()
+                },
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "hit_ratio": self.hits / lookups if lookups else 0.0,
+            }
+
+    def _allocate(self, index: _Namespace) -> int:
+        if not index.free:
+            self._expire(index)
+        if not index.free:
+            oldest = next(iter(index.lru))
+            index.release(oldest)
+            self.evictions += 1
+        return index.free.pop()
+
+    def _expire(self, index: _Namespace) -> None:
+        expired = np.flatnonzero(index.expires_at <= time.monotonic())
+        for slot in expired:
+            if int(slot) in index.lru:
+                index.release(int(slot))
+                self.expirations += 1
+            index.expires_at[slot] = np.inf
@@ -0,0 +1,251 @@
+"""
+On-demand sampling profiler for agent requests.
+
+Tracing shows which stage of a request was slow, but not where the CPU
+time inside a stage went (formatting, extraction, JSON handling). A
+profiled request gets a background thread that samples the request
+thread's stack every few milliseconds. Only frames below the agent's entry
+point are kept, so a profile shows the request and nothing the caller or
+other tasks on the same event loop did.
+
+Each profile is written as collapsed stacks (`root;caller;callee count`),
+which flamegraph.pl, speedscope and inferno read directly, plus a text
+summary of the top functions by self and total time.
+
+A request is profiled when `ChatRequest.profile` is set, when the
+configured sample rate picks it, or for every request while profiling is
+enabled. Otherwise the entry point checks two attributes and calls
+through.
+"""
+
+import contextvars
+import random
+import sys
+import threading
+import time
+from collections import Counter
+from dataclasses import dataclass
+from pathlib import Path
+from types import CodeType, FrameType
+
+from src.infra.logger import get_logger
+
+
+@dataclass
+class ProfilingConfig:
+    # Profile every request
+    enabled: bool = False
+    # Fraction of requests to profile when not enabled for all of them
+    sample_rate: float = 0.0
+    output_dir: str = "profiles"
+    # Time between stack samples. The sampler needs the GIL, so a busy
+    # request thread is sampled at most once per switch interval (5 ms)
+    interval: float = 0.005
+    # Functions listed in the text summary
+    top_n: int = 25
+
+
+# The session of the request being profiled, so nested agents don't start
+# their own
+_active_session: contextvars.ContextVar["ProfileSession | None"] = (
+    contextvars.ContextVar("active_profile_session", default=None)
+)
+
+
+class ProfileSession:
+    """
+    Samples one thread's stack below a root frame.
+
+    Samples are only taken while the session is resumed, so a streamed
+    reply is not charged for the time the caller spends between chunks.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        root_frame: FrameType,
+        interval: float,
+        trace_id: str | None = None,
+    ):
+        self.name = name
+        self.trace_id = trace_id
+        self.interval = interval
+        self.root_frame = root_frame
+        self.thread_id = threading.get_ident()
+        self.started_at = time.time()
+
+        self.stacks: Counter[tuple[str, ...]] = Counter()
+        # Samples taken while the request's frames were not on the stack,
+        # e.g. while another task ran on the event loop
+        self.outside = 0
+        self.active_seconds = 0.0
+
+        self._labels: dict[CodeType, str] = {}
+        self._running = False
+        self._resumed_at = 0.0
+        self._token: contextvars.Token | None = None
+        self._stopped = threading.Event()
+        self._thread = threading.Thread(
+            target=self._run, name=f"profiler-{name}", daemon=True
+        )
+        self._thread.start()
+
+    @property
+    def samples(self) -> int:
+        return sum(self.stacks.values())
+
+    def resume(self) -> None:
+        self._token = _active_session.set(self)
+        self._resumed_at = time.perf_counter()
+        self._running = True
+
+    def pause(self) -> None:
+        self._running = False
+        self.active_seconds += time.perf_counter() - self._resumed_at
+        if self._token is not None:
+            _active_session.reset(self._token)
+            self._token = None
+
+    def stop(self) -> None:
+        if self._running:
+            self.pause()
+        self._stopped.set()
+        self._thread.join()
+
+    def _run(self) -> None:
+        while not self._stopped.wait(self.interval):
+            if self._running:
+                self._sample()
+
+    def _sample(self) -> None:
+        frame = sys._current_frames().get(self.thread_id)
+        stack = []
+        while frame is not None and frame is not self.root_frame:
+            stack.append(self._label(frame))
+            frame = frame.f_back
+        if frame is None:
+            self.outside += 1
+            return
+        stack.append(self.name)
+        self.stacks[tuple(reversed(stack))] += 1
+
+    def _label(self, frame: FrameType) -> str:
+        code = frame.f_code
+        label = self._labels.get(code)
+        if label is None:
+            module = frame.f_globals.get("__name__", "?")
+            label = self._labels[code] = f"{module}:{code.co_qualname}"
+        return label
+
+    def collapsed(self) -> str:
+        """Render the samples in the collapsed stack format of flamegraph.pl."""
+        return "".join(
+            f"{';'.join(stack)} {count}\n"
+            for stack, count in sorted(self.stacks.items())
+        )
+
+    def summary(self, top_n: int) -> str:
+        """Render the functions with the most self and total samples."""
+        samples = self.samples
+        self_counts: Counter[str] = Counter()
+        total_counts: Counter[str] = Counter()
+        for stack, count in self.stacks.items():
+            self_counts[stack[-1]] += count
+            for label in set(stack):
+                total_counts[label] += count
+
+        started = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(self.started_at))
+        lines = [
+            f"{self.name} at {started}, trace {self.trace_id or '-'}",
+            f"{samples} samples every {self.interval * 1000:.1f} ms "
+            f"over {self.active_seconds * 1000:.1f} ms"
+            + (f" ({self.outside} outside the request)" if self.outside else ""),
+        ]
+        for title, counts in (("self", self_counts), ("total", total_counts)):
+            lines += ["", f"Top {top_n} by {title} time", "  samples      %  function"]
+            for label, count in counts.most_common(top_n):
+                share = 100 * count / samples if samples else 0.0
+                lines.append(f"  {count:7d} {share:6.1f}  {label}")
+        return "\n".join(lines) + "\n"
+
+
+class Profiler:
+    """Decides which requests to profile and writes their profiles."""
+
+    def __init__(self, config: ProfilingConfig | None = None):
+        self.config = config or ProfilingConfig()
+        self.sample_rate = 1.0 if self.config.enabled else self.config.sample_rate
+        self.logger = get_logger(__name__)
+        self.profiled = 0
+
+    def wants(self, requested: bool) -> bool:
+        """
+        Whether to profile a request.
+
+        Args:
+            requested: Whether the request asked to be profiled
+
+        Returns:
+            True unless profiling is off for it, or an enclosing agent
+            request is already being profiled
+        """
+        if not requested and not self.sample_rate:
+            return False
+        if _active_session.get() is not None:
+            return False
+        return requested or random.random() < self.sample_rate
+
+    def start(self, name: str, trace_id: str | None = None) -> ProfileSession:
+        """
+        Start sampling the caller's thread below the caller's frame.
+
+        The session is paused; call `resume` before running the request.
+        """
+        return ProfileSession(
+            name, sys._getframe(1), self.config.interval, trace_id=trace_id
+        )
+
+    def finish(self, session: ProfileSession) -> Path | None:
+        """
+        Stop a session and write its profile.
+
+        Returns:
+            Path of the collapsed stacks file, or None if it couldn't be
+            written
+        """
+        session.stop()
+        stamp = time.strftime("%Y%m%d-%H%M%S", time.localtime(session.started_at))
+        suffix = (session.trace_id or f"{random.getrandbits(32):08x}")[:8]
+        output_dir = Path(self.config.output_dir)
+        base = f"{stamp}-{session.name}-{suffix}"
+        collapsed = output_dir / f"{base}.collapsed"
+        try:
+            output_dir.mkdir(parents=True, exist_ok=True)
+            collapsed.write_text(session.collapsed(), encoding="utf-8")
+            (output_dir / f"{base}.txt").write_text(
+                session.summary(self.config.top_n), encoding="utf-8"
+            )
+        except OSError as e:
+            self.logger.warning(f"Failed to write profile of {session.name}: {e}")
+            return None
+
+        self.profiled += 1
+        self.logger.info(
+            f"Profiled {session.name}: {session.samples} samples "
+            f"in {session.active_seconds * 1000:.1f} ms, written to {collapsed}"
+        )
+        return collapsed
+
+
+_profiler = Profiler()
+
+
+def configure_profiling(config: ProfilingConfig) -> Profiler:
+    """Install the process-wide profiler described by the config."""
+    global _profiler
+    _profiler = Profiler(config)
+    return _profiler
+
+
+def get_profiler() -> Profiler:
+    return _profiler
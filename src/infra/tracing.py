@@ -0,0 +1,510 @@
+"""
+Lightweight request tracing.
+
+A trace is a tree of spans: one per agent entry point, routing stage,
+sub-agent call and upstream attempt. Each span records its timing and
+attributes such as the model, token counts, attempt number or cache hit.
+The current span lives in a context variable, so spans nest across
+function calls and `asyncio` tasks. Work handed to a thread pool keeps its
+parent when submitted through `bind_context`.
+
+Finished spans go to exporters: a local JSONL file, an OTLP/HTTP JSON
+collector or memory. Tracing is off until `configure_tracing` enables it,
+and disabled spans cost one attribute check.
+"""
+
+import contextvars
+import functools
+import inspect
+import json
+import os
+import queue
+import threading
+import time
+from collections.abc import Callable, Iterator
+from dataclasses import dataclass, field
+from pathlib import Path
+from types import TracebackType
+from typing import Any, Self, TypeVar
+
+from src.infra.logger import get_logger
+
+T = TypeVar("T")
+
+
+@dataclass
+class TracingConfig:
+    enabled: bool = False
+    # Append finished spans to this file, one JSON object per line
+    jsonl_path: str | None = None
+    # OTLP/HTTP traces endpoint, e.g. http://localhost:4318/v1/traces
+    otlp_endpoint: str | None = None
+    service_name: str = "ai-agents"
+
+
+@dataclass
+class Span:
+    name: str
+    trace_id: str
+    span_id: str
+    parent_id: str | None = None
+    # Wall-clock start for exporters, monotonic clock for the duration
+    start_time: float = field(default_factory=time.time)
+    start_ns: int = field(default_factory=time.perf_counter_ns, repr=False)
+    duration_ms: float | None = None
+    attributes: dict[str, Any] = field(default_factory=dict)
+    error: str | None = None
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        self.attributes[key] = value
+
+    def set_attributes(self, **attributes: Any) -> None:
+        self.attributes.update(attributes)
+
+    def record_error(self, error: BaseException) -> None:
+        self.error = f"{type(error).__name__}: {error}"
+
+    def to_dict(self) -> dict:
+        return {
+            "name": self.name,
+            "trace_id": self.trace_id,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "start_time": self.start_time,
+            "duration_ms": self.duration_ms,
+            "attributes": self.attributes,
+            "error": self.error,
+        }
+
+
+class _NoopSpan:
+    """Stands in for a span while tracing is off, so callers never branch."""
+
+    name = ""
+    trace_id = None
+    span_id = None
+    error = None
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        pass
+
+    def set_attributes(self, **attributes: Any) -> None:
+        pass
+
+    def record_error(self, error: BaseException) -> None:
+        pass
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        pass
+
+
+NOOP_SPAN = _NoopSpan()
+
+_current_span: contextvars.ContextVar[Span | None] = contextvars.ContextVar(
+    "current_span", default=None
+)
+
+
+class SpanExporter:
+    def export(self, spans: list[Span]) -> None:
+        raise NotImplementedError
+
+    def shutdown(self) -> None:
+        pass
+
+
+class InMemoryExporter(SpanExporter):
+    """Keeps finished spans in a list, for inspection in a shell or benchmark."""
+
+    def __init__(self):
+        self.spans: list[Span] = []
+        self._lock = threading.Lock()
+
+    def export(self, spans: list[Span]) -> None:
+        with self._lock:
+            self.spans.extend(spans)
+
+    def trace(self, trace_id: str) -> list[Span]:
+        with self._lock:
+            return [span for span in self.spans if span.trace_id == trace_id]
+
+    def clear(self) -> None:
+        with self._lock:
+            self.spans.clear()
+
+
+class JSONLExporter(SpanExporter):
+    """Appends each finished span to a file as one JSON line."""
+
+    def __init__(self, path: str | Path):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+
+    def export(self, spans: list[Span]) -> None:
+        lines = "".join(
+            json.dumps(span.to_dict(), default=str) + "\n" for span in spans
+        )
+        with self._lock, open(self.path, "a", encoding="utf-8") as f:
+            f.write(lines)
+
+
+class OTLPExporter(SpanExporter):
+    """
+    Sends spans to an OTLP/HTTP collector in the JSON encoding.
+
+    Spans are queued and posted in batches from a background thread, so a
+    slow or absent collector never delays a request. When the queue is
+    full, new spans are dropped and counted.
+    """
+
+    def __init__(
+        self,
+        endpoint: str,
+        service_name: str = "ai-agents",
+        batch_size: int = 256,
+        flush_interval: float = 2.0,
+        max_queue_size: int = 4096,
+        timeout: float = 5.0,
+    ):
+        self.endpoint = endpoint
+        self.service_name = service_name
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.timeout = timeout
+        self.logger = get_logger(__name__)
+        self.dropped = 0
+        self.sent = 0
+
+        self._queue: queue.Queue[Span | None] = queue.Queue(maxsize=max_queue_size)
+        self._worker = threading.Thread(
+            target=self._run, name="otlp-exporter", daemon=True
+        )
+        self._worker.start()
+
+    def export(self, spans: list[Span]) -> None:
+        for span in spans:
+            try:
+                self._queue.put_nowait(span)
+            except queue.Full:
+                self.dropped += 1
+
+    def shutdown(self) -> None:
+        """Flush queued spans and stop the worker."""
+        self._queue.put(None)
+        self._worker.join(timeout=self.timeout)
+
+    def _run(self) -> None:
+        batch: list[Span] = []
+        stopping = False
+        while not stopping:
+            deadline = time.monotonic() + self.flush_interval
+            while len(batch) < self.batch_size:
+                try:
+                    span = self._queue.get(timeout=max(0, deadline - time.monotonic()))
+                except queue.Empty:
+                    break
+                if span is None:
+                    stopping = True
+                    break
+                batch.append(span)
+            if batch:
+                self._post(batch)
+                batch = []
+
+    def _post(self, spans: list[Span]) -> None:
+        import httpx
+
+        try:
+            response = httpx.post(
+                self.endpoint, json=self.encode(spans), timeout=self.timeout
+            )
+            response.raise_for_status()
+            self.sent += len(spans)
+        except (httpx.HTTPError, OSError, TypeError, ValueError) as e:
+            self.dropped += len(spans)
+            self.logger.warning(f"Failed to export {len(spans)} spans: {e}")
+
+    def encode(self, spans: list[Span]) -> dict:
+        """Build an OTLP `ExportTraceServiceRequest` body in its JSON mapping."""
+        return {
+            "resourceSpans": [
+                {
+                    "resource": {
+                        "attributes": [
+                            _otlp_attribute("service.name", self.service_name)
+                        ]
+                    },
+                    "scopeSpans": [
+                        {
+                            "scope": {"name": __name__},
+                            "spans": [_otlp_span(span) for span in spans],
+                        }
+                    ],
+                }
+            ]
+        }
+
+
+def _otlp_span(span: Span) -> dict:
+    start_ns = int(span.start_time * 1e9)
+    end_ns = start_ns + int((span.duration_ms or 0.0) * 1e6)
+    encoded = {
+        "traceId": span.trace_id,
+        "spanId": span.span_id,
+        "name": span.name,
+        # SPAN_KIND_INTERNAL
+        "kind": 1,
+        "startTimeUnixNano": str(start_ns),
+        "endTimeUnixNano": str(end_ns),
+        "attributes": [
+            _otlp_attribute(key, value) for key, value in span.attributes.items()
+        ],
+        # STATUS_CODE_OK or STATUS_CODE_ERROR
+        "status": {"code": 2, "message": span.error} if span.error else {"code": 1},
+    }
+    if span.parent_id:
+        encoded["parentSpanId"] = span.parent_id
+    return encoded
+
+
+def _otlp_attribute(key: str, value: Any) -> dict:
+    if isinstance(value, bool):
+        encoded = {"boolValue": value}
+    elif isinstance(value, int):
+        encoded = {"intValue": str(value)}
+    elif isinstance(value, float):
+        encoded = {"doubleValue": value}
+    else:
+        encoded = {"stringValue": str(value)}
+    return {"key": key, "value": encoded}
+
+
+class Tracer:
+    """
+    Creates spans and hands finished ones to the exporters.
+
+    A span started while another is current becomes its child. A span
+    started with no current span begins a trace, under the given trace ID
+    or a new one.
+    """
+
+    def __init__(self, exporters: list[SpanExporter] | None = None):
+        self.exporters = list(exporters or [])
+        self.enabled = bool(self.exporters)
+        self.logger = get_logger(__name__)
+
+    def start_span(
+        self, name: str, trace_id: str | None = None, **attributes: Any
+    ) -> Span:
+        parent = _current_span.get()
+        if parent is not None:
+            trace_id, parent_id = parent.trace_id, parent.span_id
+        else:
+            trace_id, parent_id = trace_id or new_trace_id(), None
+        return Span(
+            name=name,
+            trace_id=trace_id,
+            span_id=os.urandom(8).hex(),
+            parent_id=parent_id,
+            attributes=attributes,
+        )
+
+    def end_span(self, span: Span) -> None:
+        span.duration_ms = (time.perf_counter_ns() - span.start_ns) / 1e6
+        for exporter in self.exporters:
+            try:
+                exporter.export([span])
+            except (OSError, TypeError, ValueError) as e:
+                self.logger.warning(
+                    f"{exporter.__class__.__name__} failed to export a span: {e}"
+                )
+
+    def shutdown(self) -> None:
+        for exporter in self.exporters:
+            exporter.shutdown()
+
+
+_tracer = Tracer()
+
+
+def configure_tracing(config: TracingConfig) -> Tracer:
+    """Install the process-wide tracer described by the config."""
+    exporters: list[SpanExporter] = []
+    if config.enabled:
+        if config.jsonl_path:
+            exporters.append(JSONLExporter(config.jsonl_path))
+        if config.otlp_endpoint:
+            exporters.append(OTLPExporter(config.otlp_endpoint, config.service_name))
+    set_tracer(Tracer(exporters))
+    return _tracer
+
+
+def set_tracer(tracer: Tracer) -> None:
+    """Replace the process-wide tracer, shutting the previous one down."""
+    global _tracer
+    previous, _tracer = _tracer, tracer
+    previous.shutdown()
+
+
+def get_tracer() -> Tracer:
+    return _tracer
+
+
+def new_trace_id() -> str:
+    return os.urandom(16).hex()
+
+
+def current_span() -> Span | None:
+    return _current_span.get()
+
+
+def set_span_attributes(**attributes: Any) -> None:
+    """Add attributes to the current span, if there is one."""
+    span = _current_span.get()
+    if span is not None:
+        span.attributes.update(attributes)
+
+
+class _ActiveSpan:
+    """Makes a started span current for the duration of a `with` block."""
+
+    __slots__ = ("span", "token", "tracer")
+
+    def __init__(self, tracer: Tracer, span: Span):
+        self.tracer = tracer
+        self.span = span
+        self.token = None
+
+    def __enter__(self) -> Span:
+        self.token = _current_span.set(self.span)
+        return self.span
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        tb: TracebackType | None,
+    ) -> None:
+        if exc is not None:
+            self.span.record_error(exc)
+        _current_span.reset(self.token)
+        self.tracer.end_span(self.span)
+
+
+def span(name: str, trace_id: str | None = None, **attributes: Any) -> Any:
+    """
+    Run a `with` block inside a new span.
+
+    Args:
+        name: Span name, e.g. "supporter.route"
+        trace_id: Trace to join when no span is current
+        **attributes: Initial span attributes
+
+    Returns:
+        A context manager yielding the span, or a no-op stand-in while
+        tracing is off
+    """
+    tracer = _tracer
+    if not tracer.enabled:
+        return NOOP_SPAN
+    return _ActiveSpan(tracer, tracer.start_span(name, trace_id, **attributes))
+
+
+def trace_iterator(
+    name: str,
+    iterator: Iterator[T],
+    trace_id: str | None = None,
+    **attributes: Any,
+) -> Iterator[T]:
+    """
+    Trace a generator from its first step until it is exhausted or closed.
+
+    The span is only current while the generator runs, so work the caller
+    does between items is not attributed to it.
+    """
+    tracer = _tracer
+    if not tracer.enabled:
+        yield from iterator
+        return
+
+    current = tracer.start_span(name, trace_id, **attributes)
+    items = 0
+    try:
+        while True:
+            token = _current_span.set(current)
+            try:
+                item = next(iterator)
+            except StopIteration:
+                return
+            finally:
+                _current_span.reset(token)
+            items += 1
+            yield item
+    except GeneratorExit:
+        current.set_attribute("closed_early", True)
+        raise
+    except BaseException as e:
+        current.record_error(e)
+        raise
+    finally:
+        close = getattr(iterator, "close", None)
+        if close:
+            # Cleanup in the generator still belongs to the span
+            token = _current_span.set(current)
+            try:
+                close()
+            finally:
+                _current_span.reset(token)
+        current.set_attribute("items", items)
+        tracer.end_span(current)
+
+
+def traced(name: str, **attributes: Any) -> Callable[[Callable], Callable]:
+    """Decorate a function, coroutine function or generator function with a span."""
+
+    def decorator(function: Callable) -> Callable:
+        if inspect.iscoroutinefunction(function):
+
+            @functools.wraps(function)
+            async def async_wrapper(*args: Any, **kwargs: Any) -> Any:
+                if not _tracer.enabled:
+                    return await function(*args, **kwargs)
+                with span(name, **attributes):
+                    return await function(*args, **kwargs)
+
+            return async_wrapper
+
+        if inspect.isgeneratorfunction(function):
+
+            @functools.wraps(function)
+            def generator_wrapper(*args: Any, **kwargs: Any) -> Iterator[Any]:
+                if not _tracer.enabled:
+                    return function(*args, **kwargs)
+                return trace_iterator(name, function(*args, **kwargs), **attributes)
+
+            return generator_wrapper
+
+        @functools.wraps(function)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            if not _tracer.enabled:
+                return function(*args, **kwargs)
+            with span(name, **attributes):
+                return function(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+def bind_context(function: Callable[..., T]) -> Callable[..., T]:
+    """
+    Bind a callable to a copy of the current context.
+
+    Thread pools don't carry context variables over, so submit
+    `bind_context(fn)` instead of `fn` to keep spans under their parent.
+    """
+    return functools.partial(contextvars.copy_context().run, function)
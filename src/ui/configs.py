@@ -4,6 +4,10 @@ from pathlib import Path
 from dotenv import load_dotenv
 
 from src.clients.openai import OpenAIConfig
+from src.clients.transport import HTTPTransportConfig
+from src.infra.cache.config import SemanticCacheConfig
+from src.infra.profiling import ProfilingConfig
+from src.infra.tracing import TracingConfig
 
 DEFAULT_OPENAI_MODEL = "gpt-4.1-2025-04-14"
 
@@ -48,6 +52,28 @@ def get_openai_config() -> OpenAIConfig:
     - OPENAI_MODEL: Model to use (default: gpt-3.5-turbo)
     - OPENAI_TEMPERATURE: Temperature for generation (default: 0.7)
     - OPENAI_MAX_TOKENS: Maximum tokens for response (default: None)
+    - OPENAI_BASE_URL: OpenAI-compatible API base URL (default: None, the OpenAI API)
+    - OPENAI_CONTEXT_MAX_TOKENS: Token budget for the dialog history (default: 8000)
+    - OPENAI_MAX_RETRIES: Attempts per request for retryable errors (default: 3)
+    - OPENAI_FALLBACK_MODELS: Comma-separated models for when the primary circuit
+      is open (default: None)
+    - OPENAI_CIRCUIT_FAILURE_THRESHOLD: Error rate that opens a model circuit
+      (default: 0.5)
+    - OPENAI_CIRCUIT_RECOVERY_TIMEOUT: Seconds before an open circuit is probed
+      (default: 30)
+    - OPENAI_REQUESTS_PER_MINUTE: Client-side request rate limit (default: None)
+    - OPENAI_TOKENS_PER_MINUTE: Client-side token rate limit (default: None)
+    - OPENAI_SINGLEFLIGHT_ENABLED: Coalesce concurrent identical requests
+      (default: True)
+    - OPENAI_CACHE_ENABLED: Enable the response cache (default: False)
+    - OPENAI_CACHE_MAX_SIZE: Max responses kept in memory (default: 1024)
+    - OPENAI_CACHE_TTL: Cached response lifetime in seconds (default: 3600)
+    - OPENAI_CACHE_DIR: Directory for the on-disk cache tier (default: None)
+    - OPENAI_ROUTING_MODEL: Model that picks the Supporter tool (default: OPENAI_MODEL)
+    - OPENAI_GENERAL_MODEL: Model for open-ended answers (default: OPENAI_MODEL)
+    - OPENAI_JUDGE_MODEL: Model for grading answers (default: OPENAI_MODEL)
+    - OPENAI_ROUTING_CASCADE: Retry failed routing answers with OPENAI_MODEL
+      (default: False)
 
     Returns:
         OpenAIConfig: Configured OpenAI settings
@@ -56,12 +82,151 @@ def get_openai_config() -> OpenAIConfig:
         api_key=os.getenv("OPENAI_API_KEY", ""),
         model=os.getenv("OPENAI_MODEL", DEFAULT_OPENAI_MODEL),
         temperature=float(os.getenv("OPENAI_TEMPERATURE", "0.7")),
-        max_tokens=int(os.getenv("OPENAI_MAX_TOKENS"))
-        if os.getenv("OPENAI_MAX_TOKENS")
-        else None,
+        max_tokens=(
+            int(os.getenv("OPENAI_MAX_TOKENS"))
+            if os.getenv("OPENAI_MAX_TOKENS")
+            else None
+        ),
+        base_url=os.getenv("OPENAI_BASE_URL") or None,
+        max_retries=int(os.getenv("OPENAI_MAX_RETRIES", "3")),
+        context_max_tokens=int(os.getenv("OPENAI_CONTEXT_MAX_TOKENS", "8000")),
+        fallback_models=[
+            model.strip()
+            for model in os.getenv("OPENAI_FALLBACK_MODELS", "").split(",")
+            if model.strip()
+        ],
+        circuit_failure_threshold=float(
+            os.getenv("OPENAI_CIRCUIT_FAILURE_THRESHOLD", "0.5")
+        ),
+        circuit_recovery_timeout=float(
+            os.getenv("OPENAI_CIRCUIT_RECOVERY_TIMEOUT", "30")
+        ),
+        requests_per_minute=(
+            int(os.getenv("OPENAI_REQUESTS_PER_MINUTE"))
+            if os.getenv("OPENAI_REQUESTS_PER_MINUTE")
+            else None
+        ),
+        tokens_per_minute=(
+            int(os.getenv("OPENAI_TOKENS_PER_MINUTE"))
+            if os.getenv("OPENAI_TOKENS_PER_MINUTE")
+            else None
+        ),
+        singleflight_enabled=os.getenv("OPENAI_SINGLEFLIGHT_ENABLED", "true").lower()
+        == "true",
+        cache_enabled=os.getenv("OPENAI_CACHE_ENABLED", "false").lower() == "true",
+        cache_max_size=int(os.getenv("OPENAI_CACHE_MAX_SIZE", "1024")),
+        cache_ttl=float(os.getenv("OPENAI_CACHE_TTL", "3600")),
+        cache_dir=os.getenv("OPENAI_CACHE_DIR") or None,
+        routing_model=os.getenv("OPENAI_ROUTING_MODEL") or None,
+        general_model=os.getenv("OPENAI_GENERAL_MODEL") or None,
+        judge_model=os.getenv("OPENAI_JUDGE_MODEL") or None,
+        routing_cascade=os.getenv("OPENAI_ROUTING_CASCADE", "false").lower() == "true",
     )
 
 
+def get_http_transport_config() -> HTTPTransportConfig:
+    """
+    Initialize the shared HTTP transport configuration from environment variables.
+
+    Environment variables:
+    - HTTP_MAX_CONNECTIONS: Maximum open connections in the pool (default: 100)
+    - HTTP_MAX_KEEPALIVE: Maximum idle keep-alive connections (default: 20)
+    - HTTP_KEEPALIVE_EXPIRY: Idle connection lifetime in seconds (default: 30)
+    - HTTP_HTTP2: Enable HTTP/2, requires the h2 package (default: False)
+
+    Returns:
+        HTTPTransportConfig: Configured transport settings
+    """
+    return HTTPTransportConfig(
+        max_connections=int(os.getenv("HTTP_MAX_CONNECTIONS", "100")),
+        max_keepalive_connections=int(os.getenv("HTTP_MAX_KEEPALIVE", "20")),
+        keepalive_expiry=float(os.getenv("HTTP_KEEPALIVE_EXPIRY", "30")),
+        http2=os.getenv("HTTP_HTTP2", "false").lower() == "true",
+    )
+
+
+def get_semantic_cache_config() -> SemanticCacheConfig:
+    """
+    Initialize the semantic response cache configuration from environment variables.
+
+    Environment variables:
+    - SEMANTIC_CACHE_ENABLED: Answer paraphrased opening questions from cache
+      (default: False)
+    - SEMANTIC_CACHE_MAX_SIZE: Entries kept per agent (default: 1024)
+    - SEMANTIC_CACHE_THRESHOLD: Minimum cosine similarity for a hit (default: 0.85)
+    - SEMANTIC_CACHE_TTL: Cached reply lifetime in seconds (default: 3600)
+
+    Returns:
+        SemanticCacheConfig: Configured semantic cache settings
+    """
+    return SemanticCacheConfig(
+        enabled=os.getenv("SEMANTIC_CACHE_ENABLED", "false").lower() == "true",
+        max_size=int(os.getenv("SEMANTIC_CACHE_MAX_SIZE", "1024")),
+        threshold=float(os.getenv("SEMANTIC_CACHE_THRESHOLD", "0.85")),
+        ttl=float(os.getenv("SEMANTIC_CACHE_TTL", "3600")),
+    )
+
+
+def get_tracing_config() -> TracingConfig:
+    """
+    Initialize request tracing configuration from environment variables.
+
+    Environment variables:
+    - TRACING_ENABLED: Record spans for every agent request (default: False)
+    - TRACING_JSONL_PATH: File that finished spans are appended to (default: None)
+    - TRACING_OTLP_ENDPOINT: OTLP/HTTP traces endpoint of a collector (default: None)
+    - TRACING_SERVICE_NAME: Service name reported to the collector (default: ai-agents)
+
+    Returns:
+        TracingConfig: Configured tracing settings
+    """
+    return TracingConfig(
+        enabled=os.getenv("TRACING_ENABLED", "false").lower() == "true",
+        jsonl_path=os.getenv("TRACING_JSONL_PATH") or None,
+        otlp_endpoint=os.getenv("TRACING_OTLP_ENDPOINT") or None,
+        service_name=os.getenv("TRACING_SERVICE_NAME", "ai-agents"),
+    )
+
+
+def get_profiling_config() -> ProfilingConfig:
+    """
+    Initialize request profiling configuration from environment variables.
+
+    Environment variables:
+    - PROFILING_ENABLED: Profile every agent request (default: False)
+    - PROFILING_SAMPLE_RATE: Fraction of requests to profile (default: 0.0)
+    - PROFILING_DIR: Directory profiles are written to (default: profiles)
+    - PROFILING_INTERVAL_MS: Time between stack samples in milliseconds (default: 5)
+    - PROFILING_TOP_N: Functions listed in each profile summary (default: 25)
+
+    Returns:
+        ProfilingConfig: Configured profiling settings
+    """
+    return ProfilingConfig(
+        enabled=os.getenv("PROFILING_ENABLED", "false").lower() == "true",
+        sample_rate=float(os.getenv("PROFILING_SAMPLE_RATE", "0.0")),
+        output_dir=os.getenv("PROFILING_DIR", "profiles"),
+        interval=float(os.getenv("PROFILING_INTERVAL_MS", "5")) / 1000,
+        top_n=int(os.getenv("PROFILING_TOP_N", "25")),
+    )
+
+
+def get_supporter_config() -> dict:
+    """
+    Initialize Supporter agent options from environment variables.
+
+    Environment variables:
+    - SUPPORTER_SPECULATIVE: Start the likely sub-agent during the routing call
+      (default: False)
+
+    Returns:
+        dict: Keyword arguments for Supporter
+    """
+    return {
+        "speculative": os.getenv("SUPPORTER_SPECULATIVE", "false").lower() == "true",
+    }
+
+
 def get_streamlit_config() -> dict:
     """
     Initialize Streamlit configuration from environment variables.
@@ -110,6 +275,11 @@ def get_all_configs() -> dict:
     """
     return {
         "openai": get_openai_config(),
+        "http_transport": get_http_transport_config(),
+        "semantic_cache": get_semantic_cache_config(),
+        "supporter": get_supporter_config(),
+        "tracing": get_tracing_config(),
+        "profiling": get_profiling_config(),
         "streamlit": get_streamlit_config(),
         "app": get_app_config(),
     }
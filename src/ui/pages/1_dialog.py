@@ -1,13 +1,27 @@
-import time
+from typing import TYPE_CHECKING
 
 import streamlit as st
 
-from src.agents.chat.agent import SimpleChat
-from src.agents.supporter.orchestrator.agent import Supporter
+from src.agents.cached import SemanticCacheAgent
+from src.agents.registry import AgentRegistry
 from src.clients.openai import OpenAIClient
+from src.clients.transport import configure_http_transport
 from src.domain.entities import ChatRequest, Message, Role
 from src.infra.cache.dialogs import DialogCache
-from src.ui.configs import get_openai_config, get_streamlit_config
+from src.infra.profiling import configure_profiling
+from src.infra.tracing import configure_tracing
+from src.ui.configs import (
+    get_http_transport_config,
+    get_openai_config,
+    get_profiling_config,
+    get_semantic_cache_config,
+    get_streamlit_config,
+    get_supporter_config,
+    get_tracing_config,
+)
+
+if TYPE_CHECKING:
+    from src.infra.cache.semantic import SemanticCache
 
 # ----------------------------
 # Streamlit App Configuration
@@ -20,32 +34,67 @@ st.set_page_config(
 )
 st.subheader("Dialog")
 
+
+@st.cache_resource
+def get_openai_client() -> OpenAIClient:
+    """One client per process, shared by every browser session."""
+    configure_http_transport(get_http_transport_config())
+    configure_tracing(get_tracing_config())
+    configure_profiling(get_profiling_config())
+    return OpenAIClient(get_openai_config())
+
+
+@st.cache_resource
+def get_semantic_cache() -> "SemanticCache | None":
+    """One semantic cache per process, so paraphrases hit across sessions."""
+    config = get_semantic_cache_config()
+    if not config.enabled:
+        return None
+
+    from src.infra.cache.semantic import SemanticCache
+
+    return SemanticCache(
+        max_size=config.max_size, threshold=config.threshold, ttl=config.ttl
+    )
+
+
 # Initialize dialog cache
 dialog_cache = DialogCache()
 
 # Initialize session state
 if "messages" not in st.session_state:
     st.session_state.messages = []
-if "is_openai_client_initialized" not in st.session_state:
-    openai_client = OpenAIClient(get_openai_config())
-    st.session_state.is_openai_client_initialized = True
 if "current_dialog_id" not in st.session_state:
     st.session_state.current_dialog_id = None
 if "selected_dialog_from_dropdown" not in st.session_state:
     st.session_state.selected_dialog_from_dropdown = ""
 
-# Initialize agents in session state to avoid recreating them
-if "agents_mapping" not in st.session_state:
-    st.session_state.agents_mapping = {
-        "Supporter": Supporter(openai_client),
-        "SimpleChat": SimpleChat(openai_client),
-    }
+# Register agents in session state; each is imported and built when first selected
+if "agents" not in st.session_state:
+    openai_client = get_openai_client()
+    semantic_cache = get_semantic_cache()
+    st.session_state.agents = AgentRegistry(
+        wrap=(
+            (lambda agent: SemanticCacheAgent(agent, semantic_cache))
+            if semantic_cache
+            else None
+        )
+    )
+    st.session_state.agents.register(
+        "Supporter",
+        "src.agents.supporter.orchestrator.agent:Supporter",
+        openai_client,
+        **get_supporter_config(),
+    )
+    st.session_state.agents.register(
+        "SimpleChat", "src.agents.chat.agent:SimpleChat", openai_client
+    )
 
 # Agent selection
 selected_agent_name = st.sidebar.selectbox(
-    "Choose an agent:", options=list(st.session_state.agents_mapping.keys()), index=0
+    "Choose an agent:", options=st.session_state.agents.names(), index=0
 )
-agent = st.session_state.agents_mapping[selected_agent_name]
+agent = st.session_state.agents.get(selected_agent_name)
 
 # Dialog management sidebar
 st.sidebar.markdown("---")
@@ -161,36 +210,36 @@ if prompt := st.chat_input("Type your message..."):
     with st.chat_message("user"):
         st.write(user_msg.text)
 
-    # Get agent response
+    # Stream agent response, rendering chunks as they arrive
     chat_request = ChatRequest(messages=st.session_state.messages)
-    chat_response = agent.chat(chat_request)
 
-    # Display new assistant messages with animation
-    new_msgs = chat_response.messages[len(st.session_state.messages) :]
-    for msg in new_msgs:
-        st.session_state.messages.append(msg)
+    with st.chat_message("assistant"):
+        badge_placeholder = st.empty()
+        text_placeholder = st.empty()
 
-        with st.chat_message("assistant"):
-            if getattr(msg, "agent", None):
-                st.markdown(
+        reply_agent = None
+        reply_chunks = []
+        for chunk in agent.chat_stream(chat_request):
+            if reply_agent is None and getattr(chunk, "agent", None):
+                reply_agent = chunk.agent
+                badge_placeholder.markdown(
                     f"""
                     <span style='display:inline-block; background:#e0e7ff; color:#3730a3; border-radius:12px; padding:2px 10px; font-size:0.85em; font-weight:600; margin-bottom:4px;'>
-                        {msg.agent}
+                        {reply_agent}
                     </span>
                     """,
                     unsafe_allow_html=True,
                 )
-            placeholder = st.empty()
+            reply_chunks.append(chunk.text)
+            text_placeholder.write("".join(reply_chunks) + "▋")
 
-            # Typing animation
-            typing_text = ""
-            for char in msg.text:
-                typing_text += char
-                placeholder.write(typing_text + "▋")
-                time.sleep(0.001)
+        # Final text
+        reply_text = "".join(reply_chunks)
+        text_placeholder.write(reply_text)
 
-            # Final text
-            placeholder.write(msg.text)
+    st.session_state.messages.append(
+        Message(role=Role.ASSISTANT, text=reply_text, agent=reply_agent)
+    )
 
     # Auto-save dialog after each message exchange
     if st.session_state.messages:
@@ -0,0 +1,39 @@
+from dataclasses import dataclass
+
+from src.clients.fake import FakeBackend, FakeOpenAIClient, FakePlan
+from src.clients.openai import OpenAIConfig, OpenAIMessage, OpenAIRequest
+from src.clients.retry import RetryPolicy
+
+
+@dataclass
+class FlakyBackend(FakeBackend):
+    """FakeBackend whose first `fail_first` calls fail with a server error."""
+
+    fail_first: int = 0
+
+    def plan(self, params: dict) -> FakePlan:
+        plan = super().plan(params)
+        if self.calls <= self.fail_first:
+            return FakePlan(latency=0.0, error="server_error")
+        return plan
+
+
+def make_client(
+    backend: FakeBackend | None = None, **config: object
+) -> FakeOpenAIClient:
+    """A fake client that retries without sleeping."""
+    client = FakeOpenAIClient(
+        OpenAIConfig(api_key="fake", model="fake-model", **config), backend=backend
+    )
+    client.retry_policy = RetryPolicy(
+        max_attempts=client.retry_policy.max_attempts, base_delay=0.0
+    )
+    return client
+
+
+def make_request(text: str = "hello", **kwargs: object) -> OpenAIRequest:
+    return OpenAIRequest(
+        model="fake-model",
+        messages=[OpenAIMessage(role="user", content=text)],
+        **kwargs,
+    )
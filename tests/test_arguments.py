@@ -0,0 +1,100 @@
+import pytest
+
+from src.agents.supporter.orchestrator.arguments import (
+    ArgumentParseError,
+    ArgumentParser,
+)
+
+
+@pytest.fixture
+def parser() -> ArgumentParser:
+    return ArgumentParser()
+
+
+def test_valid_arguments_need_no_fixes(parser: ArgumentParser):
+    parsed = parser.parse(
+        "get_weather", '{"location": "Tokyo", "query_type": "current"}'
+    )
+    assert parsed.arguments == {"location": "Tokyo", "query_type": "current"}
+    assert not parsed.repaired
+    assert parser.stats()["valid"] == 1
+
+
+@pytest.mark.parametrize(
+    "arguments, expected, fix",
+    [
+        ('```json\n{"location": "Paris"}\n```', {"location": "Paris"}, "extracted"),
+        ("{location: 'Paris'}", {"location": "Paris"}, "unquoted_keys"),
+        ('{"location": "Paris",}', {"location": "Paris"}, "trailing_comma"),
+        (
+            '{"location": "Paris", "query_type": "fore',
+            {"location": "Paris"},
+            "truncated",
+        ),
+        ("{'location': 'Paris'}", {"location": "Paris"}, "single_quotes"),
+        ("{'location': \"St. John's\"}", {"location": "St. John's"}, "single_quotes"),
+        ("{'location': 'St. John\\'s'}", {"location": "St. John's"}, "single_quotes"),
+    ],
+)
+def test_malformed_json_is_repaired(
+    parser: ArgumentParser, arguments: str, expected: dict, fix: str
+):
+    parsed = parser.parse("get_weather", arguments)
+    assert parsed.arguments == expected
+    assert fix in parsed.fixes
+
+
+@pytest.mark.parametrize(
+    "amount, expected",
+    [
+        ("100 USD", 100.0),
+        ("$1,000.50", 1000.5),
+        ("1e3", 1000.0),
+        ("2.5E-1", 0.25),
+        (42, 42.0),
+    ],
+)
+def test_amounts_are_coerced_to_numbers(
+    parser: ArgumentParser, amount: object, expected: float
+):
+    arguments = {
+        "action": "convert",
+        "from_currency": "USD",
+        "to_currency": "EUR",
+        "amount": amount,
+    }
+    assert parser.parse("get_forex", arguments).arguments["amount"] == expected
+
+
+@pytest.mark.parametrize(
+    "query_type, expected",
+    [
+        ("Forecast", "forecast"),
+        ("forcast", "forecast"),
+        ("now", "current"),
+        ("c", None),
+        ("current weather", None),
+        ("weekly", None),
+    ],
+)
+def test_enum_values_match_only_when_unambiguous(
+    parser: ArgumentParser, query_type: str, expected: str | None
+):
+    arguments = {"location": "Tokyo", "query_type": query_type}
+    parsed = parser.parse("get_weather", arguments)
+    assert parsed.arguments.get("query_type") == expected
+
+
+@pytest.mark.parametrize("action", ["c", "r", "conv"])
+def test_required_enum_prefixes_are_rejected(parser: ArgumentParser, action: str):
+    arguments = {"action": action, "from_currency": "USD", "to_currency": "EUR"}
+    with pytest.raises(ArgumentParseError):
+        parser.parse("get_forex", arguments)
+    assert parser.stats()["failed"] == 1
+
+
+def test_unrepairable_arguments_fail(parser: ArgumentParser):
+    with pytest.raises(ArgumentParseError):
+        parser.parse("get_weather", "no arguments here")
+    with pytest.raises(ArgumentParseError):
+        parser.parse("get_forex", '{"action": "rate"}')
@@ -0,0 +1,69 @@
+import time
+
+import pytest
+
+from src.clients.circuit import CircuitBreaker, CircuitOpenError, CircuitState
+from src.clients.ratelimit import RateLimiter
+from tests.fakes import make_client, make_request
+
+
+def open_circuit(breaker: CircuitBreaker) -> None:
+    for _ in range(breaker.min_requests):
+        breaker.record_failure()
+
+
+def test_circuit_opens_at_the_failure_threshold():
+    breaker = CircuitBreaker("model", failure_threshold=0.5, min_requests=4)
+    breaker.record_success()
+    breaker.record_success()
+    breaker.record_failure()
+    assert breaker.state == CircuitState.CLOSED
+
+    breaker.record_failure()
+    assert breaker.state == CircuitState.OPEN
+    assert not breaker.allow_request()
+    assert breaker.stats()["rejected"] == 1
+
+
+def test_half_open_circuit_lets_one_probe_through():
+    breaker = CircuitBreaker("model", min_requests=2, recovery_timeout=0.01)
+    open_circuit(breaker)
+    time.sleep(0.02)
+
+    assert breaker.state == CircuitState.HALF_OPEN
+    assert breaker.allow_request()
+    assert not breaker.allow_request()
+
+    breaker.record_success()
+    assert breaker.state == CircuitState.CLOSED
+
+
+def test_failed_probe_opens_the_circuit_again():
+    breaker = CircuitBreaker("model", min_requests=2, recovery_timeout=0.01)
+    open_circuit(breaker)
+    time.sleep(0.02)
+
+    assert breaker.allow_request()
+    breaker.record_failure()
+    assert breaker.state == CircuitState.OPEN
+    assert breaker.stats()["times_opened"] == 2
+
+
+def test_open_circuit_falls_back_without_using_quota():
+    client = make_client(fallback_models=["backup-model"])
+    client.rate_limiter = RateLimiter(requests_per_minute=60)
+    open_circuit(client._get_circuit_breaker("fake-model"))
+
+    response = client.chat_completion(make_request())
+    assert response.model == "backup-model"
+    # Only the call to the fallback model took a request from the limiter
+    assert client.rate_limiter.stats()["acquired"] == 1
+
+
+def test_all_circuits_open_raises():
+    client = make_client(fallback_models=["backup-model"])
+    open_circuit(client._get_circuit_breaker("fake-model"))
+    open_circuit(client._get_circuit_breaker("backup-model"))
+
+    with pytest.raises(CircuitOpenError):
+        client.chat_completion(make_request())
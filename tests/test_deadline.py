@@ -0,0 +1,61 @@
+import time
+
+import pytest
+
+from src.clients.fake import FakeBackend, LatencyProfile
+from src.domain.deadline import Deadline, DeadlineExceeded
+from tests.fakes import FlakyBackend, make_client, make_request
+
+
+def test_deadline_counts_down_and_expires():
+    deadline = Deadline.after(0.05)
+    assert 0 < deadline.remaining() <= 0.05
+    deadline.check()
+
+    time.sleep(0.06)
+    assert deadline.expired
+    assert deadline.remaining() == 0.0
+    with pytest.raises(DeadlineExceeded, match="before routing"):
+        deadline.check("routing")
+
+
+def test_cancelled_deadline_fails_every_check():
+    deadline = Deadline()
+    assert deadline.remaining() is None
+    deadline.check()
+
+    deadline.cancel()
+    assert deadline.expired
+    with pytest.raises(DeadlineExceeded, match="cancelled"):
+        deadline.check("tool call")
+
+
+def test_expired_request_is_never_sent():
+    backend = FakeBackend()
+    client = make_client(backend)
+    deadline = Deadline()
+    deadline.cancel()
+
+    with pytest.raises(DeadlineExceeded):
+        client.chat_completion(make_request(deadline=deadline))
+    assert backend.calls == 0
+
+
+def test_attempt_timeout_is_capped_by_the_deadline():
+    backend = FakeBackend(latency=LatencyProfile(mean=1.0))
+    client = make_client(backend)
+
+    started = time.monotonic()
+    with pytest.raises(DeadlineExceeded):
+        client.chat_completion(make_request(deadline=Deadline.after(0.05)))
+    assert time.monotonic() - started < 0.5
+
+
+def test_no_retry_is_started_without_time_for_it():
+    backend = FlakyBackend(fail_first=1)
+    client = make_client(backend)
+    client.retry_policy.backoff = lambda attempt, retry_after=None: 10.0
+
+    with pytest.raises(DeadlineExceeded):
+        client.chat_completion(make_request(deadline=Deadline.after(0.5)))
+    assert backend.calls == 1
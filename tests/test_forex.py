@@ -0,0 +1,74 @@
+import numpy as np
+import pytest
+
+from src.agents.supporter.forex.mocks import ForexClient, RateSnapshot
+
+
+@pytest.fixture
+def client() -> ForexClient:
+    return ForexClient()
+
+
+def test_quoted_rates_are_used_as_given(client: ForexClient):
+    assert client.snapshot.rate("USD", "EUR") == 0.85
+    assert client.snapshot.rate("EUR", "USD") == 1.18
+    assert client.snapshot.rate("USD", "USD") == 1.0
+
+
+def test_missing_pairs_use_the_inverse_quote(client: ForexClient):
+    assert client.snapshot.rate("CAD", "USD") == pytest.approx(1 / 1.25)
+
+
+def test_missing_pairs_are_triangulated_through_the_first_pivot(
+    client: ForexClient,
+):
+    assert client.snapshot.rate("CAD", "AUD") == pytest.approx(1.35 / 1.25)
+
+
+def test_later_pivots_fill_what_earlier_ones_cannot():
+    quotes = {"EUR": {"GBP": 0.86, "SEK": 11.0}, "USD": {"EUR": 0.85}}
+    snapshot = RateSnapshot.build(quotes, "now", pivots=("USD", "EUR"))
+    assert snapshot.rate("GBP", "SEK") == pytest.approx(11.0 / 0.86)
+    assert snapshot.rate("USD", "SEK") == pytest.approx(0.85 * 11.0)
+
+
+def test_unknown_currencies_have_no_rate(client: ForexClient):
+    assert client.get_exchange_rate("USD", "XYZ")["rate"] is None
+    assert client.convert_amount(100, "USD", "XYZ")["converted_amount"] is None
+    assert client.snapshot.pairs("XYZ") == []
+
+
+def test_convert_amount_applies_the_pair_rate(client: ForexClient):
+    result = client.convert_amount(100, "usd", "eur")
+    assert result["converted_amount"] == 85.0
+    assert (result["original_currency"], result["target_currency"]) == ("USD", "EUR")
+
+
+def test_convert_many_matches_single_conversions(client: ForexClient):
+    amounts = [100.0, 250.0, 10.0]
+    sources = ["USD", "GBP", "JPY"]
+    converted = client.convert_many(amounts, sources, "EUR")
+
+    expected = [
+        amount * client.snapshot.rate(source, "EUR")
+        for amount, source in zip(amounts, sources)
+    ]
+    np.testing.assert_allclose(converted, expected)
+
+
+def test_convert_many_rejects_unknown_currencies(client: ForexClient):
+    with pytest.raises(ValueError, match="XYZ"):
+        client.convert_many([1.0, 2.0], ["USD", "XYZ"], "EUR")
+
+
+def test_update_rates_swaps_the_snapshot_and_notifies(client: ForexClient):
+    updates = []
+    client.on_update(lambda: updates.append(True))
+    old = client.snapshot
+
+    client.update_rates({"USD": {"EUR": 0.9}}, timestamp="later")
+    assert client.snapshot is not old
+    assert client.get_exchange_rate("USD", "EUR")["rate"] == 0.9
+    assert client.get_exchange_rate("USD", "GBP")["rate"] is None
+    assert old.rate("USD", "EUR") == 0.85
+    assert updates == [True]
@@ -0,0 +1,75 @@
+import pytest
+
+from src.agents.supporter.text import edit_distance
+from src.agents.supporter.weather.locations import (
+    LocationIndex,
+    Place,
+    get_location_index,
+)
+
+
+@pytest.fixture(scope="module")
+def index() -> LocationIndex:
+    return get_location_index()
+
+
+@pytest.mark.parametrize(
+    "text, name",
+    [
+        ("London", "London"),
+        ("NYC", "New York"),
+        ("bombay", "Mumbai"),
+        ("Paris, France", "Paris"),
+        ("São Paulo", "Sao Paulo"),
+    ],
+)
+def test_names_and_aliases_match_exactly(index: LocationIndex, text: str, name: str):
+    match = index.lookup(text)
+    assert match is not None
+    assert (match.place.name, match.confidence) == (name, 1.0)
+
+
+@pytest.mark.parametrize(
+    "text, name",
+    [("Lodnon", "London"), ("Tokio", "Tokyo"), ("Sydny", "Sydney")],
+)
+def test_misspellings_match_with_lower_confidence(
+    index: LocationIndex, text: str, name: str
+):
+    match = index.lookup(text)
+    assert match is not None
+    assert match.place.name == name
+    assert 0.8 <= match.confidence < 1.0
+
+
+@pytest.mark.parametrize("text", ["Qwertyuiop", "abc", ""])
+def test_unknown_places_have_no_match(index: LocationIndex, text: str):
+    assert index.lookup(text) is None
+
+
+def test_find_looks_for_misspellings_after_a_preposition(index: LocationIndex):
+    assert index.find("What's the weather in Lodnon?").place.name == "London"
+    assert index.find("Will it rain in New York tomorrow?").place.name == "New York"
+    assert index.find("lodnon weather") is None
+
+
+def test_first_place_keeps_a_shared_name():
+    index = LocationIndex(
+        [(Place("Portland", "US"), ["pdx"]), (Place("Portland", "AU"), ["pdx"])]
+    )
+    assert index.lookup("pdx").place == Place("Portland", "US")
+
+
+@pytest.mark.parametrize(
+    "a, b, distance",
+    [
+        ("london", "london", 0),
+        ("london", "lodnon", 1),
+        ("tokyo", "tokio", 1),
+        ("kitten", "sitting", 3),
+        ("", "abc", 3),
+    ],
+)
+def test_edit_distance_counts_swaps_as_one_edit(a: str, b: str, distance: int):
+    assert edit_distance(a, b) == distance
+    assert edit_distance(b, a) == distance
@@ -0,0 +1,54 @@
+import asyncio
+
+import pytest
+
+from src.clients.ratelimit import RateLimiter, TokenBucket
+from tests.fakes import FlakyBackend, make_client, make_request
+
+
+def test_bucket_allows_a_burst_up_to_capacity():
+    bucket = TokenBucket(capacity=3, refill_per_second=1)
+    assert [bucket.reserve(1) for _ in range(3)] == [0.0, 0.0, 0.0]
+    assert bucket.reserve(1) == pytest.approx(1.0, abs=0.01)
+
+
+def test_waiting_callers_queue_in_order():
+    bucket = TokenBucket(capacity=1, refill_per_second=10)
+    bucket.reserve(1)
+    assert bucket.reserve(1) == pytest.approx(0.1, abs=0.01)
+    assert bucket.reserve(1) == pytest.approx(0.2, abs=0.01)
+
+
+def test_oversized_request_still_goes_through():
+    bucket = TokenBucket(capacity=100, refill_per_second=100)
+    assert bucket.reserve(1000) == 0.0
+    assert bucket.reserve(1) > 0
+
+
+def test_limiter_throttles_requests_per_minute():
+    limiter = RateLimiter(requests_per_minute=600)
+    for _ in range(600):
+        assert limiter.acquire() == 0.0
+
+    assert limiter.acquire() == pytest.approx(0.1, abs=0.01)
+    stats = limiter.stats()
+    assert (stats["acquired"], stats["throttled"]) == (601, 1)
+
+
+def test_limiter_throttles_tokens_per_minute():
+    limiter = RateLimiter(tokens_per_minute=6000)
+    assert limiter.acquire(tokens=6000) == 0.0
+    assert asyncio.run(limiter.aacquire(tokens=10)) == pytest.approx(0.1, abs=0.01)
+
+
+def test_actual_usage_refunds_overestimated_tokens():
+    limiter = RateLimiter(tokens_per_minute=6000)
+    limiter.acquire(tokens=6000)
+    limiter.adjust_tokens(estimated=6000, actual=1000)
+    assert limiter.acquire(tokens=5000) == 0.0
+
+
+def test_client_takes_quota_for_every_attempt():
+    client = make_client(FlakyBackend(fail_first=1), requests_per_minute=60)
+    client.chat_completion(make_request())
+    assert client.rate_limiter.stats()["acquired"] == 2
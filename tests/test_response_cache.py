@@ -0,0 +1,114 @@
+import asyncio
+import threading
+import time
+
+from src.clients.fake import FakeBackend, LatencyProfile
+from src.clients.openai import OpenAIResponse, OpenAIResponseCache
+from src.clients.singleflight import SingleFlight
+from src.infra.cache.memory import LRUCache
+from tests.fakes import make_client, make_request
+
+
+def response(content: str) -> OpenAIResponse:
+    return OpenAIResponse(content=content, model="fake-model", usage={})
+
+
+def test_deterministic_requests_are_served_from_cache():
+    backend = FakeBackend()
+    client = make_client(backend, cache_enabled=True)
+
+    first = client.chat_completion(make_request(temperature=0))
+    second = client.chat_completion(make_request(temperature=0))
+    assert second == first
+    assert backend.calls == 1
+    assert client.cache.stats()["hits"] == 1
+
+
+def test_sampled_and_different_requests_miss():
+    backend = FakeBackend()
+    client = make_client(backend, cache_enabled=True)
+
+    client.chat_completion(make_request())
+    client.chat_completion(make_request())
+    client.chat_completion(make_request("hello", temperature=0))
+    client.chat_completion(make_request("goodbye", temperature=0))
+    assert backend.calls == 4
+
+
+def test_expired_entries_miss():
+    cache = LRUCache(max_size=2, ttl=0.01)
+    cache.set("key", "value")
+    assert cache.get("key") == "value"
+    time.sleep(0.02)
+    assert cache.get("key") is None
+
+
+def test_least_recently_used_entry_is_evicted():
+    cache = LRUCache(max_size=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1
+
+    cache.set("c", 3)
+    assert cache.get("b") is None
+    assert (cache.get("a"), cache.get("c")) == (1, 3)
+
+
+def test_disk_tier_survives_a_restart(tmp_path):
+    key = OpenAIResponseCache.key_for(make_request(temperature=0))
+    OpenAIResponseCache(cache_dir=str(tmp_path)).set(key, response("saved"))
+
+    restarted = OpenAIResponseCache(cache_dir=str(tmp_path))
+    assert restarted.get(key) == response("saved")
+    assert restarted.stats()["disk_hits"] == 1
+
+
+def test_expired_disk_entries_miss(tmp_path):
+    key = OpenAIResponseCache.key_for(make_request(temperature=0))
+    OpenAIResponseCache(ttl=0.01, cache_dir=str(tmp_path)).set(key, response("old"))
+    time.sleep(0.02)
+
+    assert OpenAIResponseCache(ttl=0.01, cache_dir=str(tmp_path)).get(key) is None
+    assert not list(tmp_path.glob("*.json"))
+
+
+def test_singleflight_runs_concurrent_calls_once():
+    flight = SingleFlight()
+    release = threading.Event()
+    calls = []
+
+    def slow() -> str:
+        calls.append(True)
+        release.wait(1)
+        return "shared"
+
+    results = []
+    threads = [
+        threading.Thread(target=lambda: results.append(flight.do("key", slow)))
+        for _ in range(5)
+    ]
+    for thread in threads:
+        thread.start()
+    while flight.stats()["coalesced"] < 4:
+        time.sleep(0.001)
+    release.set()
+    for thread in threads:
+        thread.join()
+
+    assert results == ["shared"] * 5
+    assert len(calls) == 1
+
+
+def test_concurrent_identical_completions_share_one_call():
+    backend = FakeBackend(latency=LatencyProfile(mean=0.05))
+    client = make_client(backend)
+
+    async def ask_five_times():
+        return await asyncio.gather(
+            *(client.achat_completion(make_request()) for _ in range(5))
+        )
+
+    responses = asyncio.run(ask_five_times())
+    assert len({r.content for r in responses}) == 1
+    assert backend.calls == 1
+    assert client.singleflight_stats()["async"]["coalesced"] == 4
@@ -0,0 +1,58 @@
+import asyncio
+
+import openai
+import pytest
+
+from src.clients.retry import RetryPolicy, is_retryable
+from tests.fakes import FlakyBackend, make_client, make_request
+
+
+def test_zero_attempts_still_sends_the_request():
+    assert RetryPolicy(max_attempts=0).max_attempts == 1
+
+    backend = FlakyBackend()
+    client = make_client(backend, max_retries=0)
+    assert client.chat_completion(make_request()).content
+    assert backend.calls == 1
+
+
+def test_zero_retries_raise_the_first_error():
+    backend = FlakyBackend(fail_first=1)
+    client = make_client(backend, max_retries=0)
+    with pytest.raises(openai.InternalServerError):
+        client.chat_completion(make_request())
+    assert backend.calls == 1
+
+
+def test_retries_until_an_attempt_succeeds():
+    backend = FlakyBackend(fail_first=2)
+    client = make_client(backend, max_retries=3)
+    assert client.chat_completion(make_request()).content
+    assert backend.calls == 3
+
+
+def test_raises_the_last_error_when_every_attempt_fails():
+    backend = FlakyBackend(fail_first=3)
+    client = make_client(backend, max_retries=3)
+    with pytest.raises(openai.InternalServerError):
+        client.chat_completion(make_request())
+    assert backend.calls == 3
+
+
+def test_async_retries_until_an_attempt_succeeds():
+    backend = FlakyBackend(fail_first=1)
+    client = make_client(backend, max_retries=2)
+    assert asyncio.run(client.achat_completion(make_request())).content
+    assert backend.calls == 2
+
+
+def test_non_retryable_errors_are_not_retried():
+    assert not is_retryable(ValueError("bad request"))
+    assert is_retryable(TimeoutError())
+
+
+def test_backoff_grows_and_honors_retry_after():
+    policy = RetryPolicy(base_delay=1.0, max_delay=4.0)
+    for attempt in range(5):
+        assert 0.0 <= policy.backoff(attempt) <= min(4.0, 2**attempt)
+    assert policy.backoff(0, retry_after=10.0) == 10.0
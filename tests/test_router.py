@@ -0,0 +1,76 @@
+import pytest
+
+from src.agents.supporter.orchestrator.router import IntentRouter
+
+
+@pytest.fixture
+def router() -> IntentRouter:
+    return IntentRouter()
+
+
+@pytest.mark.parametrize(
+    "text",
+    [
+        "best hot dog in New York",
+        "cold brew coffee shops in London",
+        "warm soup recipes from Paris",
+        "How much do Canadian and Australian teachers earn?",
+        "How much is a Chinese visa for a Russian citizen?",
+        "Swiss and Chinese food in Berlin",
+        "Convert 1,00 USD to EUR",
+        "Convert 1.000,50 EUR to USD",
+    ],
+)
+def test_ordinary_questions_go_to_the_llm(router: IntentRouter, text: str):
+    assert router.route(text) is None
+    assert router.score(text).confidence < 0.6
+
+
+@pytest.mark.parametrize(
+    "text, location, query_type",
+    [
+        ("Weather in Tokyo", "tokyo", "current"),
+        ("What's the forecast for London", "london", "forecast"),
+        ("How hot is it in Sydney?", "sydney", "current"),
+        ("Is it raining in London?", "london", "current"),
+        ("Will it be cold in Tokyo tomorrow?", "tokyo", "forecast"),
+    ],
+)
+def test_weather_phrases_take_the_fast_path(
+    router: IntentRouter, text: str, location: str, query_type: str
+):
+    decision = router.route(text)
+    assert decision is not None
+    assert decision.function_call == {
+        "name": "get_weather",
+        "arguments": {"location": location, "query_type": query_type},
+    }
+
+
+@pytest.mark.parametrize(
+    "text, from_currency, to_currency, amount",
+    [
+        ("Convert 100 USD to EUR", "USD", "EUR", 100.0),
+        ("How much is 50 EUR in USD?", "EUR", "USD", 50.0),
+        ("What's the USD to GBP rate?", "USD", "GBP", None),
+        ("Convert 100 Canadian dollars to euros", "CAD", "EUR", 100.0),
+        ("Convert 1,000 USD to EUR", "USD", "EUR", 1000.0),
+        ("Convert 12,500.75 USD to EUR", "USD", "EUR", 12500.75),
+    ],
+)
+def test_currency_lookups_take_the_fast_path(
+    router: IntentRouter,
+    text: str,
+    from_currency: str,
+    to_currency: str,
+    amount: float | None,
+):
+    decision = router.route(text)
+    assert decision is not None
+    assert decision.function_call["name"] == "get_forex"
+    arguments = decision.function_call["arguments"]
+    assert (arguments["from_currency"], arguments["to_currency"]) == (
+        from_currency,
+        to_currency,
+    )
+    assert arguments["amount"] == amount
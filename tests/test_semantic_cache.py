@@ -0,0 +1,78 @@
+import pytest
+
+from src.agents.base import BaseAgent
+from src.agents.cached import SemanticCacheAgent
+from src.domain.entities import ChatRequest, ChatResponse, Message, Role
+from src.infra.cache.semantic import SemanticCache
+
+
+class CountingAgent(BaseAgent):
+    """Answers every question with the number of questions it has answered."""
+
+    def __init__(self):
+        super().__init__()
+        self.calls = 0
+
+    def chat(self, request: ChatRequest) -> ChatResponse:
+        self.calls += 1
+        reply = Message(role=Role.ASSISTANT, text=f"reply {self.calls}", agent="forex")
+        return ChatResponse(messages=request.messages + [reply])
+
+    async def achat(self, request: ChatRequest) -> ChatResponse:
+        return self.chat(request)
+
+
+@pytest.fixture
+def agent() -> SemanticCacheAgent:
+    return SemanticCacheAgent(CountingAgent(), SemanticCache())
+
+
+def ask(agent: SemanticCacheAgent, text: str) -> str:
+    request = ChatRequest(messages=[Message(role=Role.USER, text=text)])
+    return agent.chat(request).messages[-1].text
+
+
+@pytest.mark.parametrize(
+    "question, paraphrase",
+    [
+        ("usd to eur?", "dollar euro rate"),
+        ("usd to eur?", "What's the exchange rate for USD to EUR?"),
+        ("Convert 100 USD to EUR", "100 dollars in euros"),
+    ],
+)
+def test_paraphrases_hit(agent: SemanticCacheAgent, question: str, paraphrase: str):
+    assert ask(agent, question) == ask(agent, paraphrase)
+    assert agent.agent.calls == 1
+
+
+@pytest.mark.parametrize(
+    "question, other",
+    [
+        ("What is 2 + 2?", "What is 2 * 2?"),
+        ("What is 2 + 2?", "What is 2 + 3?"),
+        ("Convert 100 USD to EUR", "Convert 200 USD to EUR"),
+        ("Convert 100 USD to EUR", "Convert 100 USD to GBP"),
+    ],
+)
+def test_different_facts_miss(agent: SemanticCacheAgent, question: str, other: str):
+    assert ask(agent, question) != ask(agent, other)
+    assert agent.agent.calls == 2
+
+
+def test_expired_entries_miss():
+    cache = SemanticCache(ttl=None)
+    cache.set("forex", "usd to eur", "old", ttl=-1)
+    assert cache.get("forex", "usd to eur") is None
+    assert cache.stats()["expirations"] == 1
+
+
+def test_least_recently_used_entry_is_evicted():
+    cache = SemanticCache(max_size=2)
+    cache.set("weather", "weather in tokyo", "tokyo")
+    cache.set("weather", "weather in paris", "paris")
+    assert cache.get("weather", "weather in tokyo") == "tokyo"
+
+    cache.set("weather", "weather in berlin", "berlin")
+    assert cache.get("weather", "weather in paris") is None
+    assert cache.get("weather", "weather in tokyo") == "tokyo"
+    assert cache.stats()["evictions"] == 1